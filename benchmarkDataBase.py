@@ -0,0 +1,288 @@
+"""
+Módulo: benchmarkDataBase.py
+Descripción: Banco de pruebas de rendimiento para las funciones de funcionesDataBase.
+Genera catálogos sintéticos (reproducibles a partir de una semilla) en una base de datos temporal, mide la latencia
+(promedio y percentiles) y el rendimiento de cada operación, compara distintas configuraciones (conexión por llamada
+o pool, con o sin índices, journal WAL o rollback, y backends de almacenamiento: archivo SQLite, SQLite en memoria o
+diccionarios de Python) y guarda un reporte JSON que puede compararse entre versiones.
+La base de datos real (inventario.db) nunca se modifica.
+
+Uso:
+    python benchmarkDataBase.py --tamanios 10000 100000 --salida reporte.json
+    python benchmarkDataBase.py --tamanios 1000000 --configuraciones pool_wal por_llamada
+    python benchmarkDataBase.py --tamanios 100000 --configuraciones pool_wal memoria diccionario
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import funcionesDataBase
+from funcionesDataBase import (
+    db_cerrar_conexiones,
+    db_conexion,
+    db_crear_tabla_productos,
+    db_get_producto_by_id,
+    db_get_productos,
+    db_get_productos_by_condicion,
+    db_insertar_producto,
+    db_iter_productos,
+    db_actualizar_producto,
+    db_producto_existe,
+    db_descartar_memoria,
+    db_usar_backend,
+)
+from funcionesDiccionario import diccionario_almacen
+
+# Configuraciones a comparar: backend de almacenamiento, uso del pool, índices sobre 'productos' y journal WAL
+# (pool, índices y WAL no aplican al backend "diccionario").
+BENCHMARK_CONFIGURACIONES = {
+    "pool_wal": {"backend": "disco", "pool": True, "indices": True, "wal": True},
+    "por_llamada": {"backend": "disco", "pool": False, "indices": True, "wal": False},
+    "pool_sin_indices": {"backend": "disco", "pool": True, "indices": False, "wal": True},
+    "pool_rollback": {"backend": "disco", "pool": True, "indices": True, "wal": False},
+    "memoria": {"backend": "memoria", "pool": True, "indices": True, "wal": False},
+    "diccionario": {"backend": "diccionario", "pool": False, "indices": True, "wal": False},
+}
+
+CATEGORIAS = ["Almacen", "Bebidas", "Limpieza", "Perfumeria", "Congelados", "Lacteos", "Panaderia", "Verduleria"]
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def benchmark_generar_catalogo(tamanio, semilla=42, tamanio_lote=10000):
+    """
+    Carga un catálogo sintético de productos en la base de datos configurada en funcionesDataBase.DB_PATH.
+
+    Args:
+        tamanio (int): Cantidad de productos a generar.
+        semilla (int): Semilla del generador aleatorio (el mismo valor produce el mismo catálogo).
+        tamanio_lote (int): Filas por transacción.
+
+    Returns:
+        float: Segundos que demoró la carga.
+    """
+    generador = random.Random(semilla)
+    inicio = time.perf_counter()
+    lotes = (
+        [(f"Producto {i:08d}", f"Descripción del producto {i}", generador.choice(CATEGORIAS),
+          generador.randint(0, 500), round(generador.uniform(10, 50000), 2))
+         for i in range(desde, min(desde + tamanio_lote, tamanio))]
+        for desde in range(0, tamanio, tamanio_lote)
+    )
+    if funcionesDataBase.DB_BACKEND == "diccionario":
+        almacen = diccionario_almacen(funcionesDataBase.DB_PATH)
+        for lote in lotes:
+            almacen.cargar_filas(lote)
+        return time.perf_counter() - inicio
+
+    with db_conexion() as conexion:
+        for lote in lotes:
+            with conexion:
+                conexion.executemany(
+                    "INSERT INTO productos (nombre, descripcion, categoria, cantidad, precio) VALUES (?, ?, ?, ?, ?)",
+                    lote,
+                )
+    return time.perf_counter() - inicio
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def benchmark_medir(funcion, argumentos):
+    """
+    Ejecuta una función una vez por cada juego de argumentos y mide cada llamada.
+
+    Args:
+        funcion (callable): Función a medir.
+        argumentos (list): Lista de tuplas de argumentos.
+
+    Returns:
+        dict: Estadísticas: llamadas, total_s, ops_por_s, promedio_ms, p50_ms, p95_ms, p99_ms y max_ms.
+    """
+    tiempos = []
+    for args in argumentos:
+        inicio = time.perf_counter()
+        funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+    return benchmark_estadisticas(tiempos)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def benchmark_estadisticas(tiempos):
+    """
+    Calcula las estadísticas de una lista de tiempos (en segundos).
+
+    Args:
+        tiempos (list): Duración de cada llamada en segundos.
+
+    Returns:
+        dict: llamadas, total_s, ops_por_s, promedio_ms, p50_ms, p95_ms, p99_ms y max_ms.
+    """
+    total = sum(tiempos)
+    if len(tiempos) > 1:
+        percentiles = statistics.quantiles(tiempos, n=100, method="inclusive")
+    else:
+        percentiles = tiempos * 99
+    return {
+        "llamadas": len(tiempos),
+        "total_s": round(total, 6),
+        "ops_por_s": round(len(tiempos) / total, 1) if total else None,
+        "promedio_ms": round(total / len(tiempos) * 1000, 4),
+        "p50_ms": round(percentiles[49] * 1000, 4),
+        "p95_ms": round(percentiles[94] * 1000, 4),
+        "p99_ms": round(percentiles[98] * 1000, 4),
+        "max_ms": round(max(tiempos) * 1000, 4),
+    }
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _benchmark_aplicar_configuracion(configuracion):
+    """
+    Ajusta las variables de funcionesDataBase según la configuración a medir.
+    """
+    funcionesDataBase.DB_USAR_POOL = configuracion["pool"]
+    funcionesDataBase.DB_MODO_WAL = configuracion["wal"]
+    # La caché se desactiva para medir el acceso real a la base de datos.
+    funcionesDataBase.DB_USAR_CACHE = False
+    db_usar_backend(configuracion["backend"])
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def benchmark_ejecutar_configuracion(nombre, configuracion, tamanio, muestras, semilla, directorio):
+    """
+    Crea una base temporal con la configuración indicada, carga el catálogo y mide cada operación.
+
+    Args:
+        nombre (str): Nombre de la configuración.
+        configuracion (dict): Claves backend, pool, indices y wal.
+        tamanio (int): Cantidad de productos del catálogo.
+        muestras (int): Cantidad de llamadas por operación puntual.
+        semilla (int): Semilla para el catálogo y las consultas.
+        directorio (str): Directorio temporal donde crear la base.
+
+    Returns:
+        dict: Resultado con la carga del catálogo y las estadísticas de cada operación.
+    """
+    funcionesDataBase.DB_PATH = os.path.join(directorio, f"bench_{nombre}_{tamanio}.db")
+    _benchmark_aplicar_configuracion(configuracion)
+    generador = random.Random(semilla + 1)
+    resultado = {"configuracion": nombre, **configuracion, "tamanio": tamanio, "operaciones": {}}
+    operaciones = resultado["operaciones"]
+
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        db_crear_tabla_productos()
+        if not configuracion["indices"] and configuracion["backend"] != "diccionario":
+            with db_conexion() as conexion:
+                for indice in ("idx_productos_nombre", "idx_productos_categoria_valor", "idx_productos_cantidad",
+                               "idx_productos_valor"):
+                    conexion.execute(f"DROP INDEX IF EXISTS {indice}")
+                conexion.commit()
+        resultado["carga_catalogo_s"] = round(benchmark_generar_catalogo(tamanio, semilla), 3)
+
+        ids = [(generador.randint(1, tamanio),) for _ in range(muestras)]
+        nombres = [(f"Producto {generador.randrange(tamanio):08d}",) for _ in range(muestras)]
+        umbrales = [(generador.randint(1, 20),) for _ in range(min(muestras, 50))]
+        actualizaciones = [(generador.randint(1, tamanio), generador.randint(0, 500)) for _ in range(muestras)]
+        nuevos = [({"nombre": f"Nuevo {i:08d}", "descripcion": "", "categoria": generador.choice(CATEGORIAS),
+                    "cantidad": 1, "precio": 1.0},) for i in range(muestras)]
+        repeticiones_completas = [()] * (3 if tamanio <= 100000 else 1)
+
+        operaciones["db_get_producto_by_id"] = benchmark_medir(db_get_producto_by_id, ids)
+        operaciones["db_producto_existe"] = benchmark_medir(db_producto_existe, nombres)
+        operaciones["db_get_productos_by_condicion"] = benchmark_medir(db_get_productos_by_condicion, umbrales)
+        operaciones["db_actualizar_producto"] = benchmark_medir(db_actualizar_producto, actualizaciones)
+        operaciones["db_insertar_producto"] = benchmark_medir(db_insertar_producto, nuevos)
+        operaciones["db_get_productos"] = benchmark_medir(db_get_productos, repeticiones_completas)
+        operaciones["db_iter_productos"] = benchmark_medir(lambda: sum(1 for _ in db_iter_productos()),
+                                                           repeticiones_completas)
+    # Las bases en memoria se descartan para no acumularlas entre configuraciones.
+    db_descartar_memoria(funcionesDataBase.DB_PATH)
+    return resultado
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def benchmark_ejecutar(tamanios, configuraciones=None, muestras=1000, semilla=42):
+    """
+    Ejecuta el banco de pruebas completo.
+
+    Args:
+        tamanios (list): Tamaños de catálogo a medir (por ejemplo [10000, 100000, 1000000]).
+        configuraciones (list): Nombres de BENCHMARK_CONFIGURACIONES a comparar (por defecto, todas).
+        muestras (int): Llamadas por operación puntual.
+        semilla (int): Semilla para que los resultados sean reproducibles.
+
+    Returns:
+        dict: Reporte con los metadatos del entorno y los resultados de cada configuración y tamaño.
+    """
+    configuraciones = configuraciones or list(BENCHMARK_CONFIGURACIONES)
+    estado_original = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH, funcionesDataBase.DB_USAR_POOL,
+                       funcionesDataBase.DB_MODO_WAL, funcionesDataBase.DB_USAR_CACHE)
+    reporte = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "muestras": muestras,
+        "semilla": semilla,
+        "resultados": [],
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_inventario_") as directorio:
+            for tamanio in tamanios:
+                for nombre in configuraciones:
+                    print(f"Midiendo '{nombre}' con {tamanio} productos...")
+                    reporte["resultados"].append(benchmark_ejecutar_configuracion(
+                        nombre, BENCHMARK_CONFIGURACIONES[nombre], tamanio, muestras, semilla, directorio
+                    ))
+    finally:
+        (backend, funcionesDataBase.DB_PATH, funcionesDataBase.DB_USAR_POOL,
+         funcionesDataBase.DB_MODO_WAL, funcionesDataBase.DB_USAR_CACHE) = estado_original
+        db_usar_backend(backend)
+    return reporte
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def benchmark_mostrar_reporte(reporte):
+    """
+    Muestra en consola una tabla resumida (p50 / p95 en milisegundos) del reporte.
+
+    Args:
+        reporte (dict): Reporte retornado por benchmark_ejecutar().
+    """
+    for resultado in reporte["resultados"]:
+        print(f"\n{resultado['configuracion']} - {resultado['tamanio']} productos "
+              f"(carga: {resultado['carga_catalogo_s']} s)")
+        for operacion, estadisticas in resultado["operaciones"].items():
+            print(f"  {operacion:32} p50 {estadisticas['p50_ms']:>10.3f} ms   p95 {estadisticas['p95_ms']:>10.3f} ms"
+                  f"   {estadisticas['ops_por_s'] or 0:>10.1f} ops/s")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para ejecutar el banco de pruebas desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de funcionesDataBase.")
+    parser.add_argument("--tamanios", type=int, nargs="+", default=[10000], help="Tamaños de catálogo.")
+    parser.add_argument("--configuraciones", nargs="+", choices=list(BENCHMARK_CONFIGURACIONES),
+                        help="Configuraciones a comparar (por defecto, todas).")
+    parser.add_argument("--muestras", type=int, default=1000, help="Llamadas por operación puntual.")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark_reporte.json", help="Archivo JSON del reporte.")
+    args = parser.parse_args()
+
+    reporte = benchmark_ejecutar(args.tamanios, args.configuraciones, args.muestras, args.semilla)
+    benchmark_mostrar_reporte(reporte)
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+    print(f"\nReporte guardado en '{args.salida}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Módulo: benchmarkInicio.py
+Descripción: Mide el tiempo de arranque en frío de invocaciones de línea de comandos (un proceso nuevo por llamada,
+como en los scripts que ejecutan main.py cientos de veces por minuto). Compara:
+    - python_vacio: el intérprete sin hacer nada (piso de referencia).
+    - antes:        el arranque anterior, que importaba el menú y colorama y aplicaba las migraciones en cada inicio
+                    (se simula importando funcionesMenu y poniendo PRAGMA user_version en 0 antes de cada ejecución).
+    - despues:      el arranque actual (imports diferidos e inicialización omitida si el esquema está al día).
+    - referencia:   (opcional) el main.py de otra versión del repositorio (por ejemplo, un commit anterior),
+                    extraída con git archive.
+Cada variante ejecuta "main.py get 1" sobre una base temporal.
+
+Uso:
+    python benchmarkInicio.py --repeticiones 30 --salida inicio.json
+    python benchmarkInicio.py --referencia HEAD~1
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+from benchmarkDataBase import benchmark_estadisticas
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Arranque anterior: el menú (y colorama) se importaban siempre, antes de decidir el modo.
+_CODIGO_ANTES = "import sys, funcionesMenu; from funcionesCli import cli_main; sys.exit(cli_main(sys.argv[1:]))"
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _inicio_variantes(ruta_db, directorio_referencia=None):
+    """
+    Retorna {nombre: (comando, reiniciar_esquema)} para cada variante a medir.
+    """
+    argumentos = ["--db", ruta_db, "get", "1"]
+    variantes = {
+        "python_vacio": ([sys.executable, "-c", "pass"], False),
+        "antes": ([sys.executable, "-c", _CODIGO_ANTES] + argumentos, True),
+        "despues": ([sys.executable, os.path.join(DIRECTORIO, "main.py")] + argumentos, False),
+    }
+    if directorio_referencia:
+        variantes["referencia"] = ([sys.executable, os.path.join(directorio_referencia, "main.py")] + argumentos, False)
+    return variantes
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _inicio_extraer_referencia(referencia, destino):
+    """
+    Extrae los archivos de una versión del repositorio (commit, rama o etiqueta) en el directorio destino.
+    """
+    archivo = subprocess.run(["git", "-C", DIRECTORIO, "archive", "--format=tar", referencia],
+                             check=True, capture_output=True).stdout
+    ruta_tar = os.path.join(destino, "referencia.tar")
+    with open(ruta_tar, "wb") as salida:
+        salida.write(archivo)
+    with tarfile.open(ruta_tar) as tar:
+        tar.extractall(os.path.join(destino, "referencia"), filter="data")
+    return os.path.join(destino, "referencia")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def inicio_ejecutar(repeticiones=20, referencia=None):
+    """
+    Ejecuta las variantes alternadas (para repartir el ruido del sistema) y mide cada arranque.
+
+    Args:
+        repeticiones (int): Ejecuciones por variante.
+        referencia (str): Versión del repositorio (git) a medir además de las variantes fijas.
+
+    Returns:
+        dict: {variante: estadísticas (ms)} y la mejora de "despues" respecto de "antes" (mediana).
+    """
+    entorno = dict(os.environ, PYTHONPATH=DIRECTORIO + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    with tempfile.TemporaryDirectory(prefix="inicio_inventario_") as directorio:
+        ruta_db = os.path.join(directorio, "inventario.db")
+        subprocess.run([sys.executable, os.path.join(DIRECTORIO, "main.py"), "--db", ruta_db, "add",
+                        "--nombre", "Producto de prueba", "--categoria", "Prueba", "--cantidad", "1", "--precio", "1"],
+                       env=entorno, check=True, capture_output=True)
+        directorio_referencia = _inicio_extraer_referencia(referencia, directorio) if referencia else None
+        variantes = _inicio_variantes(ruta_db, directorio_referencia)
+        tiempos = {nombre: [] for nombre in variantes}
+
+        for repeticion in range(repeticiones + 1):
+            for nombre, (comando, reiniciar_esquema) in variantes.items():
+                if reiniciar_esquema:
+                    with sqlite3.connect(ruta_db) as conexion:
+                        conexion.execute("PRAGMA user_version = 0")
+                inicio = time.perf_counter()
+                subprocess.run(comando, env=entorno, check=True, capture_output=True, cwd=directorio)
+                if repeticion:  # La primera vuelta solo calienta cachés (disco, .pyc).
+                    tiempos[nombre].append(time.perf_counter() - inicio)
+
+    resultado = {nombre: benchmark_estadisticas(valores) for nombre, valores in tiempos.items()}
+    antes, despues = resultado["antes"]["p50_ms"], resultado["despues"]["p50_ms"]
+    resultado["mejora_p50"] = round(antes / despues, 2) if despues else None
+    return resultado
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para ejecutar la medición desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque en frío de main.py.")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--salida", help="Archivo JSON donde guardar el resultado.")
+    parser.add_argument("--referencia", help="Versión del repositorio (git) a comparar, por ejemplo HEAD~1.")
+    args = parser.parse_args()
+
+    resultado = inicio_ejecutar(args.repeticiones, args.referencia)
+    print(f"{'Variante':<14} {'p50 ms':>9} {'p95 ms':>9} {'prom ms':>9}")
+    for nombre in ("python_vacio", "antes", "despues", "referencia"):
+        if nombre not in resultado:
+            continue
+        estadisticas = resultado[nombre]
+        print(f"{nombre:<14} {estadisticas['p50_ms']:>9.1f} {estadisticas['p95_ms']:>9.1f} {estadisticas['promedio_ms']:>9.1f}")
+    print(f"Mejora (p50, antes / despues): {resultado['mejora_p50']}x")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Módulo: benchmarkValidacion.py
+Descripción: Mide el rendimiento de la validación de lotes de productos (sin base de datos). Compara:
+    - fila_por_fila: la validación anterior, un registro por vez con int()/float() dentro de try/except
+                     (se conserva en este módulo como referencia).
+    - columnas:      validacion_registros_a_columnas() + validacion_columnas_productos() (máscaras de errores),
+                     lo que usa el importador.
+    - lote:          validacion_lote_productos(), que además arma un diccionario (producto, error) por registro.
+Además mide la validación de registros individuales (como la de la API y la línea de comandos), en microsegundos por
+registro: la anterior, validacion_registro_producto() (validadores por valor) y un lote de un solo registro.
+Los registros simulan filas leídas de un CSV (todos los valores como texto), con una fracción configurable de
+filas inválidas. Antes de medir se comprueba que las variantes detectan los mismos errores, y antes de cada medición
+se ejecuta gc.collect() para que el costo del recolector no dependa de la variante medida antes.
+
+Uso:
+    python benchmarkValidacion.py --filas 1000000 --repeticiones 3 --salida validacion.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import time
+
+from benchmarkDataBase import benchmark_estadisticas
+from funcionesValidacion import (
+    validacion_columnas_productos,
+    validacion_lote_productos,
+    validacion_registro_producto,
+    validacion_registros_a_columnas,
+)
+
+# Registros validados de a uno en la medición de registros individuales.
+_REGISTROS_INDIVIDUALES = 20_000
+
+# Valores inválidos que se insertan en las filas erróneas, por campo.
+_VALORES_INVALIDOS = {
+    "nombre": ["", "   "],
+    "categoria": [""],
+    "cantidad": ["", "abc", "0", "-5", "2.5"],
+    "precio": ["", "gratis", "0", "-1.5", "nan"],
+}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _validacion_fila_referencia(registro):
+    """
+    Validación anterior de un registro (una fila por vez), usada como referencia de la medición.
+    """
+    nombre = str(registro.get("nombre") or "").strip()
+    if not nombre:
+        return None, "nombre: no se admite dato nulo"
+    categoria = str(registro.get("categoria") or "").strip()
+    if not categoria:
+        return None, "categoria: no se admite dato nulo"
+    try:
+        cantidad = int(str(registro.get("cantidad")).strip())
+    except ValueError:
+        return None, f"cantidad: tipo de dato no válido ({registro.get('cantidad')!r})"
+    if cantidad <= 0:
+        return None, "cantidad: debe ser un número entero mayor a 0"
+    try:
+        precio = float(str(registro.get("precio")).strip())
+    except ValueError:
+        return None, f"precio: tipo de dato no válido ({registro.get('precio')!r})"
+    if not precio > 0:
+        return None, "precio: debe ser un número mayor a 0"
+    producto = {"nombre": nombre, "descripcion": str(registro.get("descripcion") or "").strip(),
+                "categoria": categoria, "cantidad": cantidad, "precio": precio}
+    return producto, None
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_generar_registros(filas, fraccion_invalidos=0.01, semilla=42):
+    """
+    Genera registros sintéticos como los que produce csv.DictReader.
+
+    Args:
+        filas (int): Cantidad de registros.
+        fraccion_invalidos (float): Proporción de registros con algún campo inválido.
+        semilla (int): Semilla del generador aleatorio (para que las corridas sean comparables).
+
+    Returns:
+        list: Lista de diccionarios con valores de texto.
+    """
+    aleatorio = random.Random(semilla)
+    registros = []
+    for numero in range(filas):
+        registro = {
+            "nombre": f"Producto {numero}",
+            "descripcion": "Descripción de prueba" if numero % 3 else "",
+            "categoria": f"Categoria {numero % 50}",
+            "cantidad": str(aleatorio.randint(1, 500)),
+            "precio": f"{aleatorio.uniform(1, 1000):.2f}",
+        }
+        if aleatorio.random() < fraccion_invalidos:
+            campo = aleatorio.choice(list(_VALORES_INVALIDOS))
+            registro[campo] = aleatorio.choice(_VALORES_INVALIDOS[campo])
+        registros.append(registro)
+    return registros
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_benchmark(filas=1_000_000, repeticiones=3, fraccion_invalidos=0.01):
+    """
+    Ejecuta las tres variantes sobre los mismos registros y mide cada repetición.
+
+    Args:
+        filas (int): Cantidad de registros a validar por repetición.
+        repeticiones (int): Repeticiones por variante.
+        fraccion_invalidos (float): Proporción de registros con algún campo inválido.
+
+    Returns:
+        dict: {variante: estadísticas (ms por repetición) y filas_por_segundo}, la cantidad de filas inválidas,
+              la mejora de "columnas" respecto de "fila_por_fila" (mediana) y "registro_us" (microsegundos por
+              registro individual, mediana, por variante).
+    """
+    registros = validacion_generar_registros(filas, fraccion_invalidos)
+
+    # Las variantes deben coincidir en los resultados antes de comparar sus tiempos.
+    referencia = [_validacion_fila_referencia(registro) for registro in registros]
+    invalidos = validacion_columnas_productos(validacion_registros_a_columnas(registros))["invalidos"]
+    if validacion_lote_productos(registros) != referencia or \
+            [error is not None for _, error in referencia] != list(map(bool, invalidos)):
+        raise RuntimeError("Las variantes de validación no coinciden.")
+    errores = len(referencia) - invalidos.count(0)
+    del referencia
+
+    variantes = {
+        "fila_por_fila": lambda: [_validacion_fila_referencia(registro) for registro in registros],
+        "columnas": lambda: validacion_columnas_productos(validacion_registros_a_columnas(registros)),
+        "lote": lambda: validacion_lote_productos(registros),
+    }
+    individuales = registros[:_REGISTROS_INDIVIDUALES]
+    variantes_registro = {
+        "anterior": _validacion_fila_referencia,
+        "registro": validacion_registro_producto,
+        "lote_de_uno": lambda registro: validacion_lote_productos([registro])[0],
+    }
+    tiempos = {nombre: [] for nombre in variantes}
+    tiempos_registro = {nombre: [] for nombre in variantes_registro}
+    for _ in range(repeticiones):
+        for nombre, funcion in variantes.items():
+            gc.collect()
+            inicio = time.perf_counter()
+            funcion()
+            tiempos[nombre].append(time.perf_counter() - inicio)
+        for nombre, funcion in variantes_registro.items():
+            gc.collect()
+            inicio = time.perf_counter()
+            for registro in individuales:
+                funcion(registro)
+            tiempos_registro[nombre].append((time.perf_counter() - inicio) / len(individuales))
+
+    resultado = {"python": platform.python_version(), "filas": filas, "invalidos": errores}
+    for nombre, valores in tiempos.items():
+        estadisticas = benchmark_estadisticas(valores)
+        estadisticas["filas_por_segundo"] = round(filas / (estadisticas["p50_ms"] / 1000))
+        resultado[nombre] = estadisticas
+    resultado["mejora_p50"] = round(resultado["fila_por_fila"]["p50_ms"] / resultado["columnas"]["p50_ms"], 2)
+    resultado["registro_us"] = {nombre: round(statistics.median(valores) * 1e6, 2)
+                                for nombre, valores in tiempos_registro.items()}
+    return resultado
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para ejecutar la medición desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de la validación de lotes de productos.")
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--invalidos", type=float, default=0.01, help="Fracción de filas inválidas.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar el resultado.")
+    args = parser.parse_args()
+
+    resultado = validacion_benchmark(args.filas, args.repeticiones, args.invalidos)
+    print(f"Filas: {resultado['filas']} ({resultado['invalidos']} inválidas)")
+    print(f"{'Variante':<14} {'p50 ms':>10} {'filas/s':>12}")
+    for nombre in ("fila_por_fila", "columnas", "lote"):
+        estadisticas = resultado[nombre]
+        print(f"{nombre:<14} {estadisticas['p50_ms']:>10.1f} {estadisticas['filas_por_segundo']:>12}")
+    print(f"Mejora (p50, fila_por_fila / columnas): {resultado['mejora_p50']}x")
+    print("Registros individuales (p50, µs por registro): "
+          + ", ".join(f"{nombre} {valor}" for nombre, valor in resultado["registro_us"].items()))
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Módulo: cargaHttp.py
+Descripción: Prueba de carga para servidorHttp.py. Lanza varios hilos clientes que reutilizan su conexión HTTP
+(keep-alive) y realizan una mezcla de consultas (producto por id, páginas del listado, búsquedas, reporte de bajo
+stock y, opcionalmente, ajustes de stock) durante un tiempo fijo. Al terminar informa peticiones por segundo,
+latencias y la cantidad de respuestas por código de estado.
+
+Uso:
+    python servidorHttp.py --silencioso &
+    python cargaHttp.py --url http://127.0.0.1:8080 --clientes 16 --segundos 10 --escrituras 0.1
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from benchmarkDataBase import benchmark_estadisticas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _carga_cliente(host, puerto, segundos, proporcion_escrituras, max_id, semilla, resultados, lock):
+    """
+    Ejecuta peticiones durante la cantidad de segundos indicada y agrega sus tiempos a resultados.
+    """
+    generador = random.Random(semilla)
+    conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+    tiempos = []
+    estados = Counter()
+    etags = {}
+    fin = time.monotonic() + segundos
+    while time.monotonic() < fin:
+        encabezados = {}
+        cuerpo = None
+        if generador.random() < proporcion_escrituras:
+            metodo = "PATCH"
+            ruta = f"/productos/{generador.randint(1, max_id)}"
+            cuerpo = json.dumps({"variacion": generador.choice([-1, 1])})
+            encabezados["Content-Type"] = "application/json"
+        else:
+            metodo = "GET"
+            ruta = generador.choice([
+                f"/productos/{generador.randint(1, max_id)}",
+                f"/productos?despues_de={generador.randint(0, max_id)}&limite=50",
+                f"/buscar?q={generador.choice(['prod', 'desc', 'almacen', 'bebidas'])}&limite=20",
+                "/reportes/bajo-stock?minimo=1",
+            ])
+            if ruta in etags:
+                encabezados["If-None-Match"] = etags[ruta]
+
+        inicio = time.perf_counter()
+        try:
+            conexion.request(metodo, ruta, body=cuerpo, headers=encabezados)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+        except (OSError, http.client.HTTPException):
+            estados["error"] += 1
+            conexion.close()
+            time.sleep(0.01)
+            conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+            continue
+        tiempos.append(time.perf_counter() - inicio)
+        estados[respuesta.status] += 1
+        if metodo == "GET" and respuesta.getheader("ETag"):
+            etags[ruta] = respuesta.getheader("ETag")
+    conexion.close()
+    with lock:
+        resultados["tiempos"].extend(tiempos)
+        resultados["estados"].update(estados)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def carga_ejecutar(url, clientes=8, segundos=10, proporcion_escrituras=0.0, max_id=1000, semilla=42):
+    """
+    Ejecuta la prueba de carga contra un servidor en funcionamiento.
+
+    Args:
+        url (str): URL base del servidor (por ejemplo http://127.0.0.1:8080).
+        clientes (int): Cantidad de hilos clientes concurrentes.
+        segundos (float): Duración de la prueba.
+        proporcion_escrituras (float): Fracción de peticiones que son ajustes de stock (0 a 1).
+        max_id (int): Mayor id de producto a consultar.
+        semilla (int): Semilla para que la mezcla de peticiones sea reproducible.
+
+    Returns:
+        dict: peticiones, peticiones_por_s, estados (conteo por código) y latencia (estadísticas en ms).
+    """
+    partes = urlsplit(url)
+    resultados = {"tiempos": [], "estados": Counter()}
+    lock = threading.Lock()
+    hilos = [
+        threading.Thread(target=_carga_cliente, args=(partes.hostname, partes.port or 80, segundos,
+                                                      proporcion_escrituras, max_id, semilla + i, resultados, lock))
+        for i in range(clientes)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    return {
+        "peticiones": len(resultados["tiempos"]),
+        "peticiones_por_s": round(len(resultados["tiempos"]) / duracion, 1),
+        "estados": {str(estado): cantidad for estado, cantidad in resultados["estados"].items()},
+        "latencia": benchmark_estadisticas(resultados["tiempos"]) if resultados["tiempos"] else None,
+    }
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para ejecutar la prueba de carga desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor HTTP del inventario.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--escrituras", type=float, default=0.0, help="Fracción de peticiones de escritura (0 a 1).")
+    parser.add_argument("--max-id", type=int, default=1000, help="Mayor id de producto a consultar.")
+    args = parser.parse_args()
+
+    resultado = carga_ejecutar(args.url, args.clientes, args.segundos, args.escrituras, args.max_id)
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Módulo: estresEscrituras.py
+Descripción: Prueba de estrés de escrituras concurrentes desde varios procesos sobre la misma base de datos.
+Cada proceso suma +1 a la cantidad de productos elegidos al azar tantas veces como se indique y registra cuántas
+sumas se confirmaron. Al final se verifica que la cantidad de cada producto (y su historial de movimientos) coincida
+exactamente con las sumas confirmadas: cualquier diferencia es una actualización perdida.
+
+Modos:
+    - incremento: cada suma es un incremento atómico en una sola sentencia (db_incrementar_cantidad).
+    - lote:       cada suma es un lote de un ajuste (db_ajustar_stock_lote, con BEGIN IMMEDIATE).
+    - cas:        cada suma lee cantidad y versión y escribe con compare-and-set (db_actualizar_producto_version),
+                  volviendo a leer si hubo conflicto.
+    - inseguro:   cada suma lee la cantidad y luego escribe el valor absoluto (db_actualizar_producto). Sirve para
+                  comprobar que la prueba detecta las actualizaciones perdidas.
+
+Uso:
+    python estresEscrituras.py --procesos 8 --operaciones 500 --productos 5
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+import funcionesDataBase
+from funcionesDataBase import (
+    ErrorBaseDatos,
+    db_actualizar_producto,
+    db_actualizar_producto_version,
+    db_ajustar_stock_lote,
+    db_cerrar_conexiones,
+    db_conexion,
+    db_crear_tabla_productos,
+    db_get_producto_by_id,
+    db_incrementar_cantidad,
+)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _estres_configurar(ruta_db, busy_timeout, reintentos):
+    """
+    Configura funcionesDataBase en el proceso actual para usar la base de la prueba.
+    """
+    funcionesDataBase.DB_PATH = ruta_db
+    funcionesDataBase.DB_BUSY_TIMEOUT = busy_timeout
+    funcionesDataBase.DB_REINTENTOS = reintentos
+    funcionesDataBase.DB_LANZAR_ERRORES = True
+    funcionesDataBase.DB_USAR_CACHE = False
+    funcionesDataBase.DB_POOL_TAMANIO = 1
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _estres_escritor(parametros):
+    """
+    Proceso escritor: aplica las sumas y retorna cuántas se confirmaron por producto.
+
+    Args:
+        parametros (tuple): (semilla, ruta_db, modo, operaciones, productos, busy_timeout, reintentos, inicio).
+
+    Returns:
+        dict: confirmadas ({producto_id: sumas}), errores ({tipo: cantidad}), conflictos (modo cas) y segundos.
+    """
+    semilla, ruta_db, modo, operaciones, productos, busy_timeout, reintentos, inicio = parametros
+    _estres_configurar(ruta_db, busy_timeout, reintentos)
+    generador = random.Random(semilla)
+    confirmadas = Counter()
+    errores = Counter()
+    conflictos = 0
+
+    # Todos los procesos empiezan a escribir a la vez para maximizar la contención.
+    time.sleep(max(0.0, inicio - time.time()))
+    comienzo = time.perf_counter()
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        for _ in range(operaciones):
+            producto_id = generador.randint(1, productos)
+            try:
+                if modo == "incremento":
+                    ok = db_incrementar_cantidad(producto_id, 1)[0] == "actualizado"
+                elif modo == "lote":
+                    ok = db_ajustar_stock_lote([(producto_id, 1)])["aplicado"]
+                elif modo == "cas":
+                    while True:
+                        producto = db_get_producto_by_id(producto_id)
+                        resultado, _ = db_actualizar_producto_version(producto_id, producto.cantidad + 1,
+                                                                      producto.version)
+                        if resultado != "conflicto":
+                            break
+                        conflictos += 1
+                    ok = resultado == "actualizado"
+                else:
+                    cantidad = db_get_producto_by_id(producto_id).cantidad
+                    ok = db_actualizar_producto(producto_id, cantidad + 1)
+            except ErrorBaseDatos as e:
+                errores[e.tipo] += 1
+                continue
+            if ok:
+                confirmadas[producto_id] += 1
+            else:
+                errores["rechazada"] += 1
+    db_cerrar_conexiones()
+    return {"confirmadas": dict(confirmadas), "errores": dict(errores), "conflictos": conflictos,
+            "segundos": time.perf_counter() - comienzo}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def estres_ejecutar(procesos=4, operaciones=200, productos=5, modo="incremento", busy_timeout=10, reintentos=5,
+                    ruta_db=None, semilla=42):
+    """
+    Ejecuta la prueba de estrés y verifica que no haya actualizaciones perdidas.
+
+    Args:
+        procesos (int): Cantidad de procesos escritores.
+        operaciones (int): Sumas que realiza cada proceso.
+        productos (int): Cantidad de productos sobre los que se reparten las sumas (menos productos, más contención).
+        modo (str): "incremento", "lote", "cas" o "inseguro".
+        busy_timeout (float): Segundos que SQLite espera por el bloqueo antes de reintentar.
+        reintentos (int): Reintentos por escritura.
+        ruta_db (str): Base a utilizar (por defecto, una base temporal nueva).
+        semilla (int): Semilla para que la elección de productos sea reproducible.
+
+    Returns:
+        dict: Resumen con confirmadas, errores, conflictos, perdidas (por producto), ok, segundos y
+              escrituras_por_segundo.
+    """
+    directorio = None
+    if ruta_db is None:
+        directorio = tempfile.TemporaryDirectory(prefix="estres_inventario_")
+        ruta_db = os.path.join(directorio.name, "inventario.db")
+
+    _estres_configurar(ruta_db, busy_timeout, reintentos)
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        db_crear_tabla_productos()
+    with db_conexion() as conexion:
+        conexion.execute("DELETE FROM productos")
+        conexion.execute("DELETE FROM sqlite_sequence WHERE name = 'productos'")
+        conexion.execute("DELETE FROM movimientos")
+        conexion.executemany(
+            "INSERT INTO productos (nombre, descripcion, categoria, cantidad, precio) VALUES (?, '', 'Estres', 0, 1)",
+            [(f"Estres {i}",) for i in range(1, productos + 1)],
+        )
+        conexion.commit()
+    db_cerrar_conexiones()
+
+    inicio = time.time() + 0.5 + 0.1 * procesos
+    tareas = [(semilla + i, ruta_db, modo, operaciones, productos, busy_timeout, reintentos, inicio)
+              for i in range(procesos)]
+    # spawn: cada proceso abre sus propias conexiones (no se heredan las del proceso principal).
+    with multiprocessing.get_context("spawn").Pool(procesos) as pool:
+        resultados = pool.map(_estres_escritor, tareas)
+
+    confirmadas = Counter()
+    errores = Counter()
+    for resultado in resultados:
+        confirmadas.update({int(k): v for k, v in resultado["confirmadas"].items()})
+        errores.update(resultado["errores"])
+
+    with db_conexion() as conexion:
+        cantidades = dict(conexion.execute("SELECT id, cantidad FROM productos"))
+        ajustes = dict(conexion.execute(
+            "SELECT producto_id, COUNT(*) FROM movimientos WHERE tipo = 'ajuste' GROUP BY producto_id"
+        ))
+    db_cerrar_conexiones()
+    if directorio is not None:
+        directorio.cleanup()
+
+    perdidas = {producto_id: confirmadas[producto_id] - cantidad
+                for producto_id, cantidad in cantidades.items() if cantidad != confirmadas[producto_id]}
+    sin_movimiento = {producto_id: confirmadas[producto_id] - ajustes.get(producto_id, 0)
+                      for producto_id in cantidades if ajustes.get(producto_id, 0) != confirmadas[producto_id]}
+    segundos = max(resultado["segundos"] for resultado in resultados)
+    total = sum(confirmadas.values())
+    return {
+        "modo": modo,
+        "procesos": procesos,
+        "operaciones": procesos * operaciones,
+        "confirmadas": total,
+        "errores": dict(errores),
+        "conflictos": sum(resultado["conflictos"] for resultado in resultados),
+        "perdidas": perdidas,
+        "movimientos_faltantes": sin_movimiento,
+        "ok": not perdidas and not sin_movimiento,
+        "segundos": round(segundos, 3),
+        "escrituras_por_segundo": round(total / segundos, 1) if segundos else 0.0,
+    }
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para ejecutar la prueba desde la terminal. El código de salida es 1 si hubo actualizaciones perdidas.
+    """
+    parser = argparse.ArgumentParser(description="Prueba de estrés de escrituras concurrentes entre procesos.")
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--operaciones", type=int, default=200, help="Sumas por proceso.")
+    parser.add_argument("--productos", type=int, default=5)
+    parser.add_argument("--modo", choices=["incremento", "lote", "cas", "inseguro"], default="incremento")
+    parser.add_argument("--busy-timeout", type=float, default=10, dest="busy_timeout",
+                        help="Segundos de espera por el bloqueo antes de reintentar.")
+    parser.add_argument("--reintentos", type=int, default=5)
+    parser.add_argument("--db", help="Base a utilizar (por defecto, una temporal). Su tabla de productos se vacía.")
+    args = parser.parse_args()
+
+    resultado = estres_ejecutar(args.procesos, args.operaciones, args.productos, args.modo,
+                                args.busy_timeout, args.reintentos, args.db)
+    print(json.dumps(resultado, indent=2))
+    return 0 if resultado["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
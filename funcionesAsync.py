@@ -0,0 +1,144 @@
+"""
+Módulo: funcionesAsync.py
+Descripción: Este módulo ofrece una fachada asíncrona (asyncio) sobre las funciones de funcionesDataBase, para poder
+usar el inventario desde servicios asyncio sin bloquear el bucle de eventos.
+Las escrituras se ejecutan de a una en un hilo escritor dedicado (SQLite admite un solo escritor a la vez) y las
+lecturas en un pequeño grupo de hilos lectores. Si varias corrutinas piden la misma lectura al mismo tiempo, se
+ejecuta una sola consulta y todas reciben su resultado, salvo que entre medio haya terminado una escritura: una
+corrutina que espera su escritura y luego lee siempre ve lo que escribió.
+
+Ejemplo:
+    async with InventarioAsync() as inventario:
+        producto = await inventario.get_producto(1)
+        await inventario.actualizar(1, 25)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import funcionesDataBase
+from funcionesDataBase import (
+    db_ajustar_stock_lote,
+    db_actualizar_producto,
+    db_actualizar_producto_version,
+    db_buscar_productos,
+    db_eliminar_producto,
+    db_get_producto_by_id,
+    db_get_productos_by_condicion,
+    db_incrementar_cantidad,
+    db_insertar_producto,
+    db_producto_existe,
+    db_upsert_producto,
+)
+from funcionesProducto import ProductoBatch
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class InventarioAsync:
+    """
+    Fachada asíncrona del inventario.
+
+    Args:
+        lectores (int): Cantidad de hilos lectores. El pool de conexiones se amplía si hace falta
+                        para que cada hilo (lectores + escritor) tenga su propia conexión.
+    """
+
+    def __init__(self, lectores=4):
+        funcionesDataBase.DB_POOL_TAMANIO = max(funcionesDataBase.DB_POOL_TAMANIO, lectores + 1)
+        self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventario-escritor")
+        self._lectores = ThreadPoolExecutor(max_workers=lectores, thread_name_prefix="inventario-lector")
+        self._lecturas_en_curso = {}
+        # Escrituras terminadas: las lecturas solo se agrupan con otras iniciadas después de la misma escritura.
+        self._escrituras = 0
+        self.lecturas_agrupadas = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excepcion):
+        await self.cerrar()
+
+    async def cerrar(self):
+        """
+        Espera a que terminen las operaciones pendientes y libera los hilos.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._escritor.shutdown)
+        await loop.run_in_executor(None, self._lectores.shutdown)
+
+    async def _leer(self, funcion, *args):
+        """
+        Ejecuta una lectura en el grupo de lectores. Las lecturas idénticas que se piden mientras
+        otra está en curso esperan ese mismo resultado en lugar de consultar otra vez. Una lectura en curso
+        desde antes de la última escritura terminada no se reutiliza: podría no incluir esa escritura.
+        """
+        clave = (funcion.__name__, args, self._escrituras)
+        futuro = self._lecturas_en_curso.get(clave)
+        if futuro is None:
+            futuro = asyncio.get_running_loop().run_in_executor(self._lectores, funcion, *args)
+            self._lecturas_en_curso[clave] = futuro
+            futuro.add_done_callback(lambda _: self._lecturas_en_curso.pop(clave, None))
+        else:
+            self.lecturas_agrupadas += 1
+        # shield: si una corrutina se cancela, la lectura sigue para las demás que la esperan.
+        resultado = await asyncio.shield(futuro)
+        # Cada corrutina recibe su propia lista para que modificarla no afecte a las otras.
+        if isinstance(resultado, (list, ProductoBatch)):
+            return type(resultado)(resultado)
+        return resultado
+
+    async def _escribir(self, funcion, *args):
+        """
+        Ejecuta una escritura en el hilo escritor (en orden de llegada).
+        """
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._escritor, funcion, *args)
+        finally:
+            # Antes de que quien escribió continúe: sus lecturas siguientes ya no se agrupan con las anteriores.
+            self._escrituras += 1
+
+    # Lecturas ------------------------------------------------------------------------------------------------------
+    async def get_producto(self, producto_id):
+        """Versión asíncrona de db_get_producto_by_id()."""
+        return await self._leer(db_get_producto_by_id, producto_id)
+
+    async def existe(self, nombre):
+        """Versión asíncrona de db_producto_existe()."""
+        return await self._leer(db_producto_existe, nombre)
+
+    async def bajo_stock(self, minimo_stock):
+        """Versión asíncrona de db_get_productos_by_condicion()."""
+        return await self._leer(db_get_productos_by_condicion, minimo_stock)
+
+    async def buscar(self, texto, limite=20):
+        """Versión asíncrona de db_buscar_productos()."""
+        return await self._leer(db_buscar_productos, texto, limite)
+
+    # Escrituras ----------------------------------------------------------------------------------------------------
+    async def insertar(self, producto):
+        """Versión asíncrona de db_insertar_producto()."""
+        return await self._escribir(db_insertar_producto, producto)
+
+    async def upsert(self, producto):
+        """Versión asíncrona de db_upsert_producto()."""
+        return await self._escribir(db_upsert_producto, producto)
+
+    async def actualizar(self, producto_id, nueva_cantidad):
+        """Versión asíncrona de db_actualizar_producto()."""
+        return await self._escribir(db_actualizar_producto, producto_id, nueva_cantidad)
+
+    async def actualizar_version(self, producto_id, nueva_cantidad, version):
+        """Versión asíncrona de db_actualizar_producto_version()."""
+        return await self._escribir(db_actualizar_producto_version, producto_id, nueva_cantidad, version)
+
+    async def incrementar(self, producto_id, variacion):
+        """Versión asíncrona de db_incrementar_cantidad()."""
+        return await self._escribir(db_incrementar_cantidad, producto_id, variacion)
+
+    async def ajustar_stock_lote(self, movimientos):
+        """Versión asíncrona de db_ajustar_stock_lote()."""
+        return await self._escribir(db_ajustar_stock_lote, list(movimientos))
+
+    async def eliminar(self, producto_id):
+        """Versión asíncrona de db_eliminar_producto()."""
+        return await self._escribir(db_eliminar_producto, producto_id)
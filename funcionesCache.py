@@ -0,0 +1,116 @@
+"""
+Módulo: funcionesCache.py
+Descripción: Este módulo contiene una caché en memoria con política LRU (se descarta el elemento usado hace más tiempo)
+y vencimiento por tiempo (TTL). La usa funcionesDataBase para evitar consultar la base de datos cada vez que se busca
+el mismo producto. Lleva contadores de aciertos, fallos, descartes y vencimientos para poder dimensionarla.
+Para llenarla después de una consulta sin pisar una invalidación hecha mientras tanto, se toma generacion() antes de
+consultar y se la pasa a guardar(): si hubo una invalidación en el medio, el valor leído no se guarda.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Valor centinela para distinguir "no está en la caché" de un valor None almacenado.
+SIN_VALOR = object()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class CacheLRU:
+    """
+    Caché LRU segura para usar desde varios hilos.
+
+    Args:
+        tamanio (int): Cantidad máxima de elementos. Al superarla se descarta el menos usado.
+        ttl (float): Segundos de validez de cada elemento (None para que no venzan).
+    """
+
+    def __init__(self, tamanio=1024, ttl=None):
+        self.tamanio = tamanio
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.descartes = 0
+        self.vencimientos = 0
+
+    def obtener(self, clave):
+        """
+        Retorna el valor asociado a la clave o SIN_VALOR si no está (o venció).
+        """
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return SIN_VALOR
+            valor, vence = entrada
+            if vence is not None and vence < time.monotonic():
+                del self._datos[clave]
+                self.vencimientos += 1
+                self.fallos += 1
+                return SIN_VALOR
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def generacion(self):
+        """
+        Retorna la generación actual, que aumenta con cada invalidación o limpieza.
+        """
+        with self._lock:
+            return self._generacion
+
+    def guardar(self, clave, valor, generacion=None):
+        """
+        Guarda un valor, descartando el elemento menos usado si se supera el tamaño.
+
+        Args:
+            clave: Clave del elemento.
+            valor: Valor a guardar.
+            generacion (int): Resultado de generacion() tomado antes de leer el valor. Si desde entonces se
+                              invalidó o limpió la caché, el valor puede estar desactualizado y no se guarda.
+        """
+        vence = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generacion is not None and generacion != self._generacion:
+                return
+            self._datos[clave] = (valor, vence)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.tamanio:
+                self._datos.popitem(last=False)
+                self.descartes += 1
+
+    def invalidar(self, clave):
+        """
+        Elimina una clave de la caché (si existe).
+        """
+        with self._lock:
+            self._generacion += 1
+            self._datos.pop(clave, None)
+
+    def limpiar(self):
+        """
+        Elimina todos los elementos (los contadores se conservan).
+        """
+        with self._lock:
+            self._generacion += 1
+            self._datos.clear()
+
+    def estadisticas(self):
+        """
+        Retorna un diccionario con los contadores de la caché.
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "elementos": len(self._datos),
+                "tamanio": self.tamanio,
+                "ttl": self.ttl,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "descartes": self.descartes,
+                "vencimientos": self.vencimientos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
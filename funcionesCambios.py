@@ -0,0 +1,303 @@
+"""
+Módulo: funcionesCambios.py
+Descripción: Este módulo permite a otros sistemas sincronizarse con la tabla 'productos' de forma incremental, sin
+releerla completa con db_get_productos. Lee el registro 'cambios', que completan triggers con cada INSERT, UPDATE y
+DELETE (ver _db_migrar_cambios en funcionesDataBase): cada cambio tiene una secuencia creciente, la operación y la
+fila anterior y la nueva.
+
+Sincronización:
+    1. La primera vez, el consumidor guarda secuencia = cambios_ultima_secuencia() y copia los productos
+       (por ejemplo, con db_iter_productos).
+    2. Después pide cambios_desde(secuencia) (o cambios_esperar / cambios_iterar), los aplica y guarda la secuencia
+       del último cambio aplicado.
+Cada cambio trae las filas completas, por lo que aplicar dos veces el mismo cambio no altera el resultado: si el
+consumidor se interrumpe, retoma desde la última secuencia que guardó. Si pide cambios ya purgados
+(cambios_purgar) o anteriores a la restauración de un respaldo (cambios_reiniciar), la respuesta indica "reiniciar"
+y debe volver al paso 1.
+
+Las lecturas usan la clave primaria (secuencia), por lo que su costo depende de los cambios retornados y no del
+tamaño del registro. También puede ejecutarse directamente desde la terminal:
+
+    python funcionesCambios.py --desde 0
+    python funcionesCambios.py --desde 1500 --seguir
+    python funcionesCambios.py --purgar 100000
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+from funcionesDataBase import db_conexion, db_crear_tabla_productos
+from funcionesMetricas import metricas_medir
+
+# Cantidad de cambios por lectura.
+CAMBIOS_LIMITE = 500
+
+# Segundos entre consultas mientras se esperan cambios nuevos (cambios_esperar y cambios_iterar).
+CAMBIOS_INTERVALO = 0.25
+
+QUERY_CAMBIOS = """
+    SELECT secuencia, producto_id, operacion, anterior, nuevo, fecha
+    FROM cambios
+    WHERE secuencia > ?
+    ORDER BY secuencia
+    LIMIT ?
+"""
+
+# Infinitos que escribían los triggers anteriores a la versión 4 del esquema (Inf no es JSON válido). Las cadenas
+# se reconocen primero para no alterar un "Inf" dentro de un texto.
+_CAMBIOS_INFINITO = re.compile(r'("(?:[^"\\]|\\.)*")|-?\bInf\b')
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cambios_json(texto):
+    """
+    Decodifica una fila anterior o nueva de 'cambios'. Los infinitos registrados como Inf se toman como null.
+    """
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return json.loads(_CAMBIOS_INFINITO.sub(lambda coincidencia: coincidencia.group(1) or "null", texto))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cambios_fila(fila):
+    """
+    Convierte una fila de 'cambios' en un diccionario, con las filas anterior y nueva decodificadas.
+    """
+    secuencia, producto_id, operacion, anterior, nuevo, fecha = fila
+    return {
+        "secuencia": secuencia,
+        "producto_id": producto_id,
+        "operacion": operacion,
+        "anterior": _cambios_json(anterior) if anterior is not None else None,
+        "nuevo": _cambios_json(nuevo) if nuevo is not None else None,
+        "fecha": fecha,
+    }
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cambios_purgados_hasta(cursor):
+    """
+    Retorna la secuencia del último cambio purgado (0 si nunca se purgó).
+    """
+    cursor.execute("SELECT valor FROM configuracion WHERE clave = 'cambios_purgados_hasta'")
+    fila = cursor.fetchone()
+    return fila[0] if fila else 0
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cambios_marcar_purgados(cursor, hasta_secuencia):
+    """
+    Registra que los cambios hasta 'hasta_secuencia' ya no están disponibles (nunca retrocede).
+    """
+    cursor.execute("""
+        INSERT INTO configuracion (clave, valor) VALUES ('cambios_purgados_hasta', ?)
+        ON CONFLICT (clave) DO UPDATE SET valor = MAX(valor, excluded.valor)
+    """, (hasta_secuencia,))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def cambios_ultima_secuencia(conexion=None):
+    """
+    Retorna la secuencia del último cambio registrado (0 si todavía no hubo cambios).
+    Es el punto de partida de un consumidor que se sincroniza por primera vez.
+
+    Args:
+        conexion (sqlite3.Connection): Si se indica, se lee con esa conexión en lugar de una del pool.
+
+    Returns:
+        int: Última secuencia asignada.
+
+    Raises:
+        sqlite3.Error: Si no se puede leer la base (por ejemplo, con el backend "diccionario").
+    """
+    if conexion is None:
+        with db_conexion() as conexion:
+            return cambios_ultima_secuencia(conexion)
+    # sqlite_sequence se crea junto con la primera tabla AUTOINCREMENT: puede faltar en una base vacía.
+    if not conexion.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").fetchone():
+        return 0
+    fila = conexion.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'").fetchone()
+    return fila[0] if fila else 0
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def cambios_desde(secuencia=0, limite=CAMBIOS_LIMITE):
+    """
+    Obtiene los cambios posteriores a una secuencia, en orden.
+
+    Args:
+        secuencia (int): Última secuencia que el consumidor ya aplicó (0 para empezar desde el principio).
+        limite (int): Cantidad máxima de cambios a retornar.
+
+    Returns:
+        dict: {"cambios": lista de diccionarios (secuencia, producto_id, operacion, anterior, nuevo, fecha),
+               "ultima": secuencia desde la que debe pedirse la próxima vez,
+               "hay_mas": True si quedaron cambios sin retornar,
+               "reiniciar": True si parte de los cambios pedidos ya se purgó o se restauró un respaldo (el
+                            consumidor debe volver a copiar la tabla completa; en ese caso no se retornan cambios)}.
+
+    Raises:
+        ValueError: Si 'limite' es menor a 1.
+        sqlite3.Error: Si no se puede leer la base (por ejemplo, con el backend "diccionario").
+    """
+    if limite < 1:
+        raise ValueError("'limite' debe ser mayor a 0")
+    with db_conexion() as conexion:
+        cursor = conexion.cursor()
+        if secuencia < _cambios_purgados_hasta(cursor):
+            return {"cambios": [], "ultima": secuencia, "hay_mas": False, "reiniciar": True}
+        cursor.execute(QUERY_CAMBIOS, (secuencia, limite + 1))
+        cambios = [_cambios_fila(fila) for fila in cursor]
+    hay_mas = len(cambios) > limite
+    del cambios[limite:]
+    ultima = cambios[-1]["secuencia"] if cambios else secuencia
+    return {"cambios": cambios, "ultima": ultima, "hay_mas": hay_mas, "reiniciar": False}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def cambios_esperar(secuencia=0, limite=CAMBIOS_LIMITE, espera=0.0, intervalo=CAMBIOS_INTERVALO):
+    """
+    Igual que cambios_desde(), pero si no hay cambios nuevos espera hasta 'espera' segundos a que llegue alguno
+    (long polling). Entre consultas no retiene ninguna conexión del pool.
+
+    Args:
+        secuencia (int): Última secuencia que el consumidor ya aplicó.
+        limite (int): Cantidad máxima de cambios a retornar.
+        espera (float): Segundos máximos de espera (0 responde enseguida).
+        intervalo (float): Segundos entre consultas.
+
+    Returns:
+        dict: El resultado de cambios_desde() (con la lista vacía si se agotó la espera).
+    """
+    vencimiento = time.monotonic() + espera
+    while True:
+        resultado = cambios_desde(secuencia, limite)
+        if resultado["cambios"] or resultado["reiniciar"] or time.monotonic() >= vencimiento:
+            return resultado
+        time.sleep(min(intervalo, max(vencimiento - time.monotonic(), 0)))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def cambios_iterar(secuencia=0, limite=CAMBIOS_LIMITE, seguir=False, intervalo=CAMBIOS_INTERVALO):
+    """
+    Generador que entrega, en orden, todos los cambios posteriores a una secuencia, leyéndolos de a 'limite'.
+    Con seguir=True no termina al llegar al último: sigue entregando los cambios a medida que se registran
+    (como "tail -f"), consultando cada 'intervalo' segundos.
+
+    Args:
+        secuencia (int): Última secuencia que el consumidor ya aplicó.
+        limite (int): Cantidad máxima de cambios por lectura.
+        seguir (bool): Si es True, espera cambios nuevos en lugar de terminar.
+        intervalo (float): Segundos entre consultas cuando no hay cambios nuevos.
+
+    Yields:
+        dict: Cada cambio, con el formato de cambios_desde().
+
+    Raises:
+        RuntimeError: Si los cambios pedidos ya no están disponibles (el consumidor debe volver a copiar la tabla).
+    """
+    while True:
+        resultado = cambios_desde(secuencia, limite)
+        if resultado["reiniciar"]:
+            raise RuntimeError(f"Los cambios posteriores a la secuencia {secuencia} ya no están disponibles "
+                               "(se purgaron o se restauró un respaldo).")
+        yield from resultado["cambios"]
+        secuencia = resultado["ultima"]
+        if not resultado["hay_mas"]:
+            if not seguir:
+                return
+            time.sleep(intervalo)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def cambios_purgar(hasta_secuencia):
+    """
+    Elimina del registro los cambios con secuencia menor o igual a la indicada (por ejemplo, los que ya aplicaron
+    todos los consumidores). Los consumidores que pidan cambios anteriores recibirán "reiniciar".
+
+    Args:
+        hasta_secuencia (int): Última secuencia a eliminar.
+
+    Returns:
+        int: Cantidad de cambios eliminados.
+
+    Raises:
+        sqlite3.Error: Si no se puede escribir en la base.
+    """
+    with db_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM cambios WHERE secuencia <= ?", (hasta_secuencia,))
+        eliminados = cursor.rowcount
+        _cambios_marcar_purgados(cursor, hasta_secuencia)
+        conexion.commit()
+    return eliminados
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def cambios_reiniciar(secuencia_minima=0):
+    """
+    Obliga a todos los consumidores a volver a copiar la tabla: descarta el registro, adelanta la secuencia por
+    encima de la última asignada (y de 'secuencia_minima') y la marca como purgada. Se usa cuando 'productos'
+    cambió sin pasar por los triggers, por ejemplo al restaurar un respaldo: sin esto, la secuencia restaurada
+    retrocede, se reutilizan números ya entregados y los consumidores adelantados pierden cambios sin saberlo.
+
+    Args:
+        secuencia_minima (int): Última secuencia que pudo haber visto algún consumidor (por ejemplo, la de la base
+                                antes de restaurar).
+
+    Returns:
+        int: Secuencia marcada; el próximo cambio tendrá una mayor.
+
+    Raises:
+        sqlite3.Error: Si no se puede escribir en la base.
+    """
+    with db_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        marca = max(secuencia_minima, cambios_ultima_secuencia(conexion)) + 1
+        cursor.execute("DELETE FROM cambios")
+        cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'cambios'", (marca,))
+        if cursor.rowcount == 0:
+            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('cambios', ?)", (marca,))
+        _cambios_marcar_purgados(cursor, marca)
+        conexion.commit()
+    return marca
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para leer o purgar el registro de cambios desde la terminal (salida en JSON Lines).
+    """
+    parser = argparse.ArgumentParser(description="Registro de cambios de la tabla 'productos'.")
+    parser.add_argument("--desde", type=int, default=0, help="Última secuencia ya aplicada.")
+    parser.add_argument("--limite", type=int, default=CAMBIOS_LIMITE, help="Cambios por lectura.")
+    parser.add_argument("--seguir", action="store_true", help="Seguir mostrando los cambios nuevos (Ctrl+C para salir).")
+    parser.add_argument("--purgar", type=int, metavar="SECUENCIA", help="Elimina los cambios hasta esa secuencia.")
+    args = parser.parse_args()
+
+    db_crear_tabla_productos()
+    if args.purgar is not None:
+        print(f"Cambios eliminados: {cambios_purgar(args.purgar)}")
+        return 0
+    try:
+        for cambio in cambios_iterar(args.desde, args.limite, args.seguir):
+            print(json.dumps(cambio, ensure_ascii=False), flush=args.seguir)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
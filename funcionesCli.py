@@ -0,0 +1,500 @@
+"""
+Módulo: funcionesCli.py
+Descripción: Este módulo implementa la interfaz no interactiva del sistema (subcomandos de línea de comandos),
+pensada para usarse desde scripts, tareas programadas u otros procesos sin simular teclas.
+Cada subcomando reutiliza las funciones de funcionesDataBase y escribe su resultado en formato JSON Lines
+(un objeto por línea) o CSV. Los mensajes informativos se envían a la salida de error para no mezclarse con los datos.
+
+Ejemplos:
+    python main.py add --nombre Yerba --categoria Almacen --cantidad 10 --precio 2500
+    python main.py --formato csv list
+    python main.py update 3 --variacion -2
+    python main.py batch < comandos.txt
+    python main.py backup respaldos/inventario.db --compactar
+    python main.py changes --desde 1500 --seguir
+
+Códigos de salida:
+    0: la operación se realizó correctamente.
+    1: la operación no pudo realizarse (producto inexistente, datos rechazados, etc.).
+    2: uso incorrecto de los argumentos.
+"""
+
+import argparse
+import csv
+import json
+import shlex
+import sqlite3
+import sys
+from contextlib import redirect_stdout
+
+import funcionesDataBase
+from funcionesDataBase import (
+    COLUMNAS_ORDEN_PRODUCTOS,
+    COLUMNAS_PRODUCTOS,
+    DB_ENTERO_MAXIMO,
+    DB_ENTERO_MINIMO,
+    ErrorBaseDatos,
+    db_actualizar_producto,
+    db_actualizar_producto_version,
+    db_buscar_productos,
+    db_crear_tabla_productos,
+    db_eliminar_producto,
+    db_get_producto_by_id,
+    db_get_productos_by_condicion,
+    db_get_umbral_bajo_stock,
+    db_insertar_producto,
+    db_incrementar_cantidad,
+    db_iter_productos,
+    db_upsert_producto,
+)
+from funcionesMetricas import metricas_activar, metricas_guardar
+from funcionesProducto import Producto
+from funcionesValidacion import validacion_registro_producto
+
+SALIDA_OK = 0
+SALIDA_FALLO = 1
+SALIDA_USO = 2
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class _ErrorUso(Exception):
+    """
+    Error en los argumentos de un subcomando (se usa en lugar de la salida del proceso que hace argparse).
+    """
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class _Parser(argparse.ArgumentParser):
+    """
+    ArgumentParser que lanza _ErrorUso en lugar de terminar el proceso, para poder seguir
+    procesando el resto de los comandos en modo batch.
+    """
+
+    def error(self, message):
+        raise _ErrorUso(f"{self.prog}: {message}")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cli_entero(texto):
+    """
+    Tipo de los argumentos enteros: como int, pero rechaza los que no entran en un entero de SQLite (64 bits),
+    que de otro modo fallarían con OverflowError al pasarlos a una consulta.
+    """
+    try:
+        numero = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número entero no válido: {texto!r}")
+    if not DB_ENTERO_MINIMO <= numero <= DB_ENTERO_MAXIMO:
+        raise argparse.ArgumentTypeError(f"fuera de rango (entero de 64 bits): {texto}")
+    return numero
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def cli_crear_parser():
+    """
+    Construye el parser de argumentos con todos los subcomandos.
+
+    Returns:
+        argparse.ArgumentParser: Parser configurado.
+    """
+    parser = _Parser(prog="main.py", description="Gestión de inventario desde la línea de comandos.")
+    parser.add_argument("--db", help="Ruta de la base de datos (por defecto, inventario.db en el directorio actual).")
+    parser.add_argument("--backend", choices=funcionesDataBase.DB_BACKENDS,
+                        help="Almacenamiento: archivo SQLite (disco), SQLite en memoria o diccionarios de Python. "
+                             "Los dos últimos no guardan nada al terminar (útiles con 'batch').")
+    parser.add_argument("--formato", choices=["json", "csv"], default="json", help="Formato de la salida.")
+    parser.add_argument("--metricas", metavar="ARCHIVO", help="Registra métricas de rendimiento y las guarda en ARCHIVO (JSON).")
+    subparsers = parser.add_subparsers(dest="comando", required=True, parser_class=_Parser)
+
+    sub = subparsers.add_parser("add", help="Agrega un producto.")
+    sub.add_argument("--nombre", required=True)
+    sub.add_argument("--descripcion", default="")
+    sub.add_argument("--categoria", required=True)
+    sub.add_argument("--cantidad", required=True)
+    sub.add_argument("--precio", required=True)
+    sub.add_argument("--upsert", action="store_true", help="Si el nombre ya existe, actualiza sus datos.")
+
+    sub = subparsers.add_parser("list", help="Lista los productos.")
+    sub.add_argument("--orden", choices=COLUMNAS_ORDEN_PRODUCTOS, default="id")
+    sub.add_argument("--desc", action="store_true", help="Orden descendente.")
+    sub.add_argument("--columnas", help="Columnas separadas por coma.")
+    sub.add_argument("--limite", type=_cli_entero, help="Cantidad máxima de productos.")
+
+    sub = subparsers.add_parser("get", help="Muestra un producto por su ID.")
+    sub.add_argument("id", type=_cli_entero)
+
+    sub = subparsers.add_parser("update", help="Actualiza la cantidad de un producto.")
+    sub.add_argument("id", type=_cli_entero)
+    grupo = sub.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--cantidad", type=_cli_entero, help="Nueva cantidad absoluta.")
+    grupo.add_argument("--variacion", type=_cli_entero, help="Variación relativa (+/-).")
+    sub.add_argument("--version", type=_cli_entero, help="Con --cantidad: actualizar solo si el producto sigue en esta versión.")
+
+    sub = subparsers.add_parser("delete", help="Elimina un producto por su ID.")
+    sub.add_argument("id", type=_cli_entero)
+
+    sub = subparsers.add_parser("search", help="Busca productos por nombre, descripción o categoría.")
+    sub.add_argument("texto")
+    sub.add_argument("--limite", type=_cli_entero, default=20)
+
+    sub = subparsers.add_parser("low-stock", help="Reporte de productos con bajo stock.")
+    sub.add_argument("--minimo", type=_cli_entero, help="Umbral (por defecto, el configurado).")
+
+    sub = subparsers.add_parser("import", help="Importa productos (o movimientos de stock) desde CSV / JSON Lines.")
+    sub.add_argument("archivo")
+    sub.add_argument("--movimientos", action="store_true", help="El archivo contiene movimientos de stock.")
+
+    sub = subparsers.add_parser("export", help="Exporta los productos a la salida o a un archivo.")
+    sub.add_argument("--archivo", help="Archivo de destino (.csv, .jsonl, .icol, .parquet; opcional .gz/.bz2/.xz). "
+                                       "Por defecto, la salida estándar.")
+    sub.add_argument("--tipo", choices=["csv", "jsonl", "columnar", "parquet"],
+                     help="Formato del archivo (por defecto, según la extensión).")
+    sub.add_argument("--categoria", help="Exportar solo esta categoría.")
+    sub.add_argument("--menor-a", type=_cli_entero, dest="menor_a", help="Exportar solo productos con cantidad menor a N.")
+
+    sub = subparsers.add_parser("report", help="Reportes agregados: valor por categoría, mayor valor, bajo stock, "
+                                               "productos que se agotarían según su consumo.")
+    sub.add_argument("tipo", choices=["valor", "top", "bajo-stock", "pronostico"])
+    sub.add_argument("--limite", type=_cli_entero, default=10, help="Cantidad de productos del reporte 'top'.")
+    sub.add_argument("--minimo", type=_cli_entero, help="Umbral del reporte 'bajo-stock' (por defecto, el configurado).")
+    sub.add_argument("--dias", type=_cli_entero, help="Horizonte en días del reporte 'pronostico' (por defecto, 14).")
+
+    sub = subparsers.add_parser("backup", help="Crea un respaldo de la base de datos sin detener a otros procesos.")
+    sub.add_argument("archivo")
+    sub.add_argument("--compactar", action="store_true", help="Usa VACUUM INTO (copia compacta, sin páginas libres).")
+    sub.add_argument("--paginas", type=_cli_entero, help="Páginas copiadas por paso.")
+    sub.add_argument("--sin-verificar", action="store_true", dest="sin_verificar",
+                     help="No ejecutar PRAGMA integrity_check sobre la copia.")
+
+    sub = subparsers.add_parser("restore", help="Reemplaza el contenido de la base de datos por el de un respaldo.")
+    sub.add_argument("archivo")
+    sub.add_argument("--sin-verificar", action="store_true", dest="sin_verificar",
+                     help="No verificar la integridad del respaldo ni de la base restaurada.")
+
+    sub = subparsers.add_parser("changes", help="Muestra los cambios de productos posteriores a una secuencia.")
+    sub.add_argument("--desde", type=_cli_entero, default=0, help="Última secuencia ya aplicada (por defecto, 0: todos).")
+    sub.add_argument("--limite", type=_cli_entero, help="Cambios por lectura (por defecto, 500).")
+    sub.add_argument("--seguir", action="store_true", help="Seguir mostrando los cambios nuevos (Ctrl+C para salir).")
+
+    subparsers.add_parser("batch", help="Ejecuta un comando por línea leído de la entrada estándar.")
+    return parser
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cli_escribir_filas(salida, formato, columnas, filas):
+    """
+    Escribe filas de productos en JSON Lines o CSV.
+
+    Args:
+        salida (file): Destino de la escritura.
+        formato (str): "json" o "csv".
+        columnas (list): Nombres de las columnas.
+        filas (iterable): Objetos Producto o tuplas con los valores de cada fila.
+
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    cantidad = 0
+    if formato == "csv":
+        escritor = csv.writer(salida)
+        escritor.writerow(columnas)
+        for fila in filas:
+            escritor.writerow(fila.a_tupla(columnas) if isinstance(fila, Producto) else fila)
+            cantidad += 1
+    else:
+        for fila in filas:
+            datos = fila.a_dict(columnas) if isinstance(fila, Producto) else dict(zip(columnas, fila))
+            salida.write(json.dumps(datos, ensure_ascii=False) + "\n")
+            cantidad += 1
+    return cantidad
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cli_escribir_resultado(salida, formato, resultado):
+    """
+    Escribe el resultado de una operación (un diccionario) en JSON o CSV.
+    """
+    _cli_escribir_filas(salida, formato, list(resultado), [tuple(resultado.values())])
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cli_ejecutar(args, salida):
+    """
+    Ejecuta un subcomando ya interpretado.
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando.
+        salida (file): Destino de los datos.
+
+    Returns:
+        int: Código de salida.
+    """
+    formato = args.formato
+
+    if args.comando == "add":
+        producto, error = validacion_registro_producto(vars(args))
+        if error:
+            _cli_escribir_resultado(salida, formato, {"ok": False, "error": error})
+            return SALIDA_FALLO
+        if args.upsert:
+            resultado, producto_id = db_upsert_producto(producto)
+            _cli_escribir_resultado(salida, formato, {"ok": resultado is not None, "resultado": resultado, "id": producto_id})
+            return SALIDA_OK if resultado else SALIDA_FALLO
+        mensaje = db_insertar_producto(producto)
+        ok = not mensaje.startswith("Error")
+        _cli_escribir_resultado(salida, formato, {"ok": ok, "mensaje": mensaje})
+        return SALIDA_OK if ok else SALIDA_FALLO
+
+    if args.comando == "list":
+        columnas = args.columnas.split(",") if args.columnas else list(COLUMNAS_PRODUCTOS)
+        filas = db_iter_productos(columnas=columnas, orden=args.orden, descendente=args.desc)
+        if args.limite is not None:
+            filas = (fila for _, fila in zip(range(args.limite), filas))
+        _cli_escribir_filas(salida, formato, columnas, filas)
+        return SALIDA_OK
+
+    if args.comando == "export":
+        # Import diferido: solo se carga el exportador cuando se usa.
+        from funcionesExportacion import exportar_iter_bloques, exportar_productos
+        if not args.archivo:
+            bloques = exportar_iter_bloques(args.categoria, args.menor_a)
+            _cli_escribir_filas(salida, formato, COLUMNAS_PRODUCTOS, (fila for bloque in bloques for fila in bloque))
+            return SALIDA_OK
+        try:
+            resumen = exportar_productos(args.archivo, args.tipo, args.categoria, args.menor_a)
+        except (OSError, RuntimeError, ValueError) as e:
+            _cli_escribir_resultado(salida, formato, {"ok": False, "error": str(e)})
+            return SALIDA_FALLO
+        _cli_escribir_resultado(salida, formato, {"ok": True, "archivo": args.archivo, "filas": resumen["filas"],
+                                                  "bytes": resumen["bytes"], "segundos": round(resumen["segundos"], 3)})
+        return SALIDA_OK
+
+    if args.comando == "get":
+        producto = db_get_producto_by_id(args.id)
+        if producto is None:
+            _cli_escribir_resultado(salida, formato, {"ok": False, "error": f"no existe el producto {args.id}"})
+            return SALIDA_FALLO
+        _cli_escribir_filas(salida, formato, COLUMNAS_PRODUCTOS, [producto])
+        return SALIDA_OK
+
+    if args.comando == "update":
+        resultado = {"ok": False, "id": args.id}
+        if args.variacion is not None:
+            estado, cantidad = db_incrementar_cantidad(args.id, args.variacion)
+            resultado.update(ok=estado == "actualizado", resultado=estado, cantidad=cantidad)
+        elif args.cantidad < 0:
+            resultado["error"] = "la cantidad no puede ser negativa"
+        elif args.version is not None:
+            estado, version = db_actualizar_producto_version(args.id, args.cantidad, args.version)
+            resultado.update(ok=estado == "actualizado", resultado=estado, version=version)
+        elif db_actualizar_producto(args.id, args.cantidad):
+            resultado["ok"] = True
+        else:
+            resultado["error"] = f"no existe el producto {args.id}"
+        ok = resultado["ok"]
+        _cli_escribir_resultado(salida, formato, resultado)
+        return SALIDA_OK if ok else SALIDA_FALLO
+
+    if args.comando == "delete":
+        ok = db_eliminar_producto(args.id)
+        resultado = {"ok": ok, "id": args.id}
+        if not ok:
+            resultado["error"] = f"no existe el producto {args.id}"
+        _cli_escribir_resultado(salida, formato, resultado)
+        return SALIDA_OK if ok else SALIDA_FALLO
+
+    if args.comando == "search":
+        _cli_escribir_filas(salida, formato, COLUMNAS_PRODUCTOS, db_buscar_productos(args.texto, args.limite))
+        return SALIDA_OK
+
+    if args.comando == "low-stock":
+        minimo = args.minimo if args.minimo is not None else db_get_umbral_bajo_stock()
+        _cli_escribir_filas(salida, formato, COLUMNAS_PRODUCTOS, db_get_productos_by_condicion(minimo))
+        return SALIDA_OK
+
+    if args.comando == "report" and args.tipo == "pronostico":
+        # Import diferido: solo se carga el módulo de pronóstico cuando se usa.
+        from funcionesPronostico import PRONOSTICO_DIAS, pronostico_productos_a_agotarse
+        filas = pronostico_productos_a_agotarse(args.dias or PRONOSTICO_DIAS)
+        columnas = ["id", "nombre", "categoria", "cantidad", "consumo_diario", "desvio_diario", "punto_reposicion",
+                    "dias_restantes", "reponer"]
+        _cli_escribir_filas(salida, formato, columnas, [tuple(fila.values()) for fila in filas])
+        return SALIDA_OK
+
+    if args.comando == "report":
+        # Import diferido: solo se carga el módulo de reportes cuando se usa.
+        from funcionesReportes import (reporte_bajo_stock_por_categoria, reporte_top_productos_por_valor,
+                                       reporte_valor_por_categoria)
+        if args.tipo == "top":
+            filas = [(*producto.a_tupla(), valor) for producto, valor in reporte_top_productos_por_valor(args.limite)]
+            _cli_escribir_filas(salida, formato, list(COLUMNAS_PRODUCTOS) + ["valor"], filas)
+            return SALIDA_OK
+        if args.tipo == "valor":
+            filas = reporte_valor_por_categoria()
+            columnas = ["categoria", "productos", "unidades", "valor"]
+        else:
+            filas = reporte_bajo_stock_por_categoria(args.minimo)
+            columnas = ["categoria", "productos", "unidades"]
+        _cli_escribir_filas(salida, formato, columnas, [tuple(fila.values()) for fila in filas])
+        return SALIDA_OK
+
+    if args.comando in ("backup", "restore"):
+        # Import diferido: solo se carga el módulo de respaldo cuando se usa.
+        from funcionesRespaldo import RESPALDO_PAGINAS_POR_PASO, respaldo_crear, respaldo_restaurar
+        try:
+            if args.comando == "backup":
+                resumen = respaldo_crear(args.archivo, args.compactar, not args.sin_verificar,
+                                         args.paginas or RESPALDO_PAGINAS_POR_PASO)
+            else:
+                resumen = respaldo_restaurar(args.archivo, not args.sin_verificar)
+        except (OSError, RuntimeError, ValueError) as e:
+            _cli_escribir_resultado(salida, formato, {"ok": False, "error": str(e)})
+            return SALIDA_FALLO
+        _cli_escribir_resultado(salida, formato, {
+            "ok": True, "archivo": args.archivo, "paginas": resumen["paginas"], "pasos": resumen["pasos"],
+            "reinicios": resumen["reinicios"], "bytes": resumen["bytes"],
+            "segundos_copia": round(resumen["segundos_copia"], 3),
+            "segundos_verificacion": round(resumen["segundos_verificacion"], 3),
+            "segundos": round(resumen["segundos"], 3),
+        })
+        return SALIDA_OK
+
+    if args.comando == "import":
+        # Import diferido: solo se carga el importador cuando se usa.
+        from funcionesImportacion import importar_movimientos, importar_productos
+        try:
+            resumen = (importar_movimientos if args.movimientos else importar_productos)(args.archivo)
+        except OSError as e:
+            _cli_escribir_resultado(salida, formato, {"ok": False, "error": str(e)})
+            return SALIDA_FALLO
+        if args.movimientos:
+            ok = resumen["aplicado"]
+            resultado = {"ok": ok, "movimientos": resumen["movimientos"], "productos": resumen["productos"],
+                         "rechazados": len(resumen["rechazados"]) + len(resumen["errores_lectura"]),
+                         "segundos": round(resumen["segundos"], 3)}
+        else:
+            # Las filas válidas se insertan igual, pero un archivo con filas rechazadas no termina bien.
+            ok = resumen["rechazados"] == 0
+            resultado = {"ok": ok, "leidos": resumen["leidos"], "insertados": resumen["insertados"],
+                         "rechazados": resumen["rechazados"], "segundos": round(resumen["segundos"], 3)}
+        _cli_escribir_resultado(salida, formato, resultado)
+        return SALIDA_OK if ok else SALIDA_FALLO
+
+    if args.comando == "changes":
+        # Import diferido: solo se carga el registro de cambios cuando se usa.
+        from funcionesCambios import CAMBIOS_LIMITE, cambios_iterar
+        columnas = ["secuencia", "producto_id", "operacion", "fecha", "anterior", "nuevo"]
+        # En CSV las filas anterior y nueva se escriben como texto JSON.
+        codificar = (lambda fila: json.dumps(fila, ensure_ascii=False) if fila else "") if formato == "csv" else None
+
+        limite = CAMBIOS_LIMITE if args.limite is None else args.limite
+
+        def filas():
+            for cambio in cambios_iterar(args.desde, limite, args.seguir):
+                anterior, nuevo = cambio["anterior"], cambio["nuevo"]
+                if codificar:
+                    anterior, nuevo = codificar(anterior), codificar(nuevo)
+                yield (cambio["secuencia"], cambio["producto_id"], cambio["operacion"], cambio["fecha"], anterior, nuevo)
+                if args.seguir:
+                    salida.flush()
+
+        try:
+            _cli_escribir_filas(salida, formato, columnas, filas())
+        except RuntimeError as e:
+            _cli_escribir_resultado(salida, formato, {"ok": False, "error": str(e), "reiniciar": True})
+            return SALIDA_FALLO
+        except KeyboardInterrupt:
+            pass
+        return SALIDA_OK
+
+    if args.comando == "batch":
+        return _cli_batch(sys.stdin, salida, formato)
+
+    raise _ErrorUso(f"comando desconocido: {args.comando}")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _cli_batch(entrada, salida, formato):
+    """
+    Ejecuta los comandos leídos de la entrada, uno por línea, en el mismo proceso y con la misma conexión.
+    Las líneas vacías y las que empiezan con '#' se ignoran. Un comando que falla no detiene al resto.
+
+    Args:
+        entrada (file): Origen de los comandos.
+        salida (file): Destino de los datos.
+        formato (str): Formato por defecto para los comandos que no indiquen --formato.
+
+    Returns:
+        int: SALIDA_OK si todos los comandos terminaron bien, o el mayor código de error obtenido.
+    """
+    parser = cli_crear_parser()
+    codigo_final = SALIDA_OK
+    for numero_linea, linea in enumerate(entrada, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            palabras = shlex.split(linea)
+            if "--formato" not in palabras:
+                palabras = ["--formato", formato] + palabras
+            args = parser.parse_args(palabras)
+            if args.comando == "batch":
+                raise _ErrorUso("no se puede anidar 'batch'")
+            codigo = _cli_ejecutar(args, salida)
+        except (_ErrorUso, ValueError) as e:
+            print(f"línea {numero_linea}: {e}")
+            codigo = SALIDA_USO
+        except ErrorBaseDatos as e:
+            _cli_escribir_resultado(salida, args.formato, {"ok": False, **e.a_dict()})
+            codigo = SALIDA_FALLO
+        except (OSError, sqlite3.Error) as e:
+            print(f"línea {numero_linea}: {e}")
+            codigo = SALIDA_FALLO
+        codigo_final = max(codigo_final, codigo)
+    return codigo_final
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def cli_main(argumentos):
+    """
+    Punto de entrada de la interfaz no interactiva.
+
+    Args:
+        argumentos (list): Argumentos de la línea de comandos (sin el nombre del programa).
+
+    Returns:
+        int: Código de salida del proceso.
+    """
+    salida = sys.stdout
+    # Los mensajes que imprimen las funciones de la base de datos van a stderr; stdout queda solo para los datos.
+    with redirect_stdout(sys.stderr):
+        try:
+            args = cli_crear_parser().parse_args(argumentos)
+        except _ErrorUso as e:
+            print(e)
+            return SALIDA_USO
+
+        if args.db:
+            funcionesDataBase.DB_PATH = args.db
+        if args.backend:
+            funcionesDataBase.db_usar_backend(args.backend)
+        # Los errores de escritura se informan en la salida como resultado estructurado.
+        funcionesDataBase.DB_LANZAR_ERRORES = True
+        if args.metricas:
+            metricas_activar()
+        try:
+            db_crear_tabla_productos()
+            return _cli_ejecutar(args, salida)
+        except (_ErrorUso, ValueError) as e:
+            print(f"Error: {e}")
+            return SALIDA_USO
+        except ErrorBaseDatos as e:
+            _cli_escribir_resultado(salida, args.formato, {"ok": False, **e.a_dict()})
+            return SALIDA_FALLO
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error: {e}")
+            return SALIDA_FALLO
+        finally:
+            funcionesDataBase.db_cerrar_conexiones()
+            if args.metricas:
+                metricas_guardar(args.metricas)
@@ -4,20 +4,487 @@ Descripción: Este módulo gestiona las interacciones con la base de datos.
 Contiene funciones para insertar, actualizar, eliminar y consultar productos en la base de datos.
 También incluye la función que valida si un producto ya existe antes de insertarlo, evitando duplicados en el sistema.
 Las consultas a la base de datos están estructuradas para recuperar y manipular productos de manera eficiente.
+Todas las funciones obtienen su conexión a través de db_conexion(), que reutiliza conexiones de un pool
+(modo WAL y caché de sentencias preparadas). Con DB_USAR_POOL = False se vuelve a abrir una conexión por llamada.
+El almacenamiento se elige con DB_BACKEND: un archivo SQLite (por defecto), una base SQLite en memoria o
+diccionarios de Python (funcionesDiccionario.py), con las mismas funciones db_* en los tres casos.
+Las escrituras se reintentan si otro proceso tiene la base bloqueada; con DB_LANZAR_ERRORES = True, en lugar de
+imprimir los errores se lanza ErrorBaseDatos (lo usan la interfaz de línea de comandos y el servidor HTTP).
 """
 
 # Importamos los módulos necesarios.
 import sqlite3
 import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from funcionesCache import CacheLRU, SIN_VALOR
+from funcionesMetricas import ConexionMedida, metricas_activas, metricas_medir
+from funcionesProducto import (
+    COLUMNAS_PRODUCTOS,
+    Producto,
+    ProductoBatch,
+    producto_desde_columnas,
+    producto_row_factory,
+)
+
+# Ruta de la base de datos (formato multiplataforma). La variable de entorno INVENTARIO_DB permite indicar otra
+# sin modificar el código (por ejemplo, para que las pruebas no usen el inventario real).
+DB_PATH = os.environ.get("INVENTARIO_DB") or os.path.join(os.getcwd(), "inventario.db")
+
+# Backend de almacenamiento (también se elige con la variable de entorno INVENTARIO_BACKEND; para cambiarlo con el
+# programa en marcha usar db_usar_backend):
+#   - "disco": archivo SQLite en DB_PATH (comportamiento original).
+#   - "memoria": base SQLite en memoria compartida por todas las conexiones del proceso; DB_PATH hace de nombre.
+#     Los datos duran hasta db_descartar_memoria() o el fin del proceso.
+#   - "diccionario": diccionarios de Python, sin SQLite (ver funcionesDiccionario.py). Implementa las funciones
+#     db_*, pero no db_conexion(): lo que usa SQL directamente (reportes, exportación, respaldo) no está disponible.
+DB_BACKENDS = ("disco", "memoria", "diccionario")
+DB_BACKEND = os.environ.get("INVENTARIO_BACKEND") or "disco"
+
+# Configuración del gestor de conexiones.
+DB_USAR_POOL = True          # False: comportamiento original (una conexión nueva por llamada).
+DB_POOL_TAMANIO = 4          # Cantidad máxima de conexiones abiertas en simultáneo.
+DB_POOL_TIMEOUT = 30         # Segundos de espera por una conexión libre antes de fallar.
+DB_MODO_WAL = True           # Activa el journal WAL (lectores y escritor no se bloquean).
+DB_CACHE_SENTENCIAS = 256    # Sentencias preparadas que sqlite3 mantiene por conexión.
+
+# Escrituras concurrentes (varios procesos sobre la misma base). SQLite espera hasta DB_BUSY_TIMEOUT
+# segundos a que se libere el bloqueo; si aun así la base sigue ocupada, la escritura se reintenta
+# hasta DB_REINTENTOS veces con esperas aleatorias crecientes (backoff exponencial con jitter).
+DB_BUSY_TIMEOUT = 10         # Segundos (PRAGMA busy_timeout).
+DB_REINTENTOS = 5
+DB_REINTENTO_ESPERA_BASE = 0.05   # Segundos de espera máxima del primer reintento.
+DB_REINTENTO_ESPERA_MAXIMA = 2.0  # Tope de la espera entre reintentos.
+# False: las funciones de escritura imprimen el error y retornan un valor de fallo (comportamiento original).
+# True: lanzan ErrorBaseDatos, con el tipo de error y los reintentos realizados.
+DB_LANZAR_ERRORES = False
+
+# Caché de búsquedas por id y por nombre. Se invalida con cada escritura hecha desde este proceso;
+# el TTL acota cuánto puede tardar en verse un cambio hecho por otro proceso.
+DB_USAR_CACHE = True
+DB_CACHE_TAMANIO = 1024      # Elementos por caché.
+DB_CACHE_TTL = 30            # Segundos de validez de cada elemento.
+
+# Versión del esquema (tablas, índices y triggers) que crea db_crear_tabla_productos. Se guarda en
+# PRAGMA user_version: si la base ya está en esta versión, la inicialización se omite. Aumentarla al
+# agregar una migración.
+DB_VERSION_ESQUEMA = 4
+
+# Rango de los enteros de SQLite (64 bits con signo). Un número fuera de él no se puede pasar como parámetro de
+# una consulta (sqlite3 lanza OverflowError): las interfaces lo rechazan antes.
+DB_ENTERO_MINIMO = -2 ** 63
+DB_ENTERO_MAXIMO = 2 ** 63 - 1
+
+# Umbral con el que se inicializa el reporte de bajo stock precalculado (ver db_set_umbral_bajo_stock).
+DB_UMBRAL_BAJO_STOCK = 10
+
+# Ventanas (en días) sobre las que se acumula el consumo de cada producto (ver funcionesPronostico).
+DB_VENTANAS_CONSUMO = (7, 28)
+
+# Columnas válidas para ordenar listados (no admiten NULL) y lista de columnas para los SELECT
+# (se nombran explícitamente para que el orden coincida siempre con los campos de Producto).
+COLUMNAS_ORDEN_PRODUCTOS = ("id", "nombre", "categoria", "cantidad", "precio")
+SQL_COLUMNAS_PRODUCTOS = ", ".join(COLUMNAS_PRODUCTOS)
+SQL_COLUMNAS_PRODUCTOS_P = ", ".join(f"p.{columna}" for columna in COLUMNAS_PRODUCTOS)
+
+# Alta de un producto solo si no hay otro con el mismo nombre (parámetros: nombre, descripcion, categoria, cantidad
+# y precio). La verificación va en la misma sentencia con NOT EXISTS y no con ON CONFLICT: SQLite reserva el id de
+# AUTOINCREMENT antes de resolver el conflicto, así que cada fila descartada (o actualizada, en un upsert) dejaría
+# un hueco en los ids. La usan db_insertar_producto, db_upsert_producto y el importador.
+SQL_INSERTAR_PRODUCTO = """
+    INSERT INTO productos (nombre, descripcion, categoria, cantidad, precio)
+    SELECT ?1, ?2, ?3, ?4, ?5
+    WHERE NOT EXISTS (SELECT 1 FROM productos WHERE nombre = ?1)
+"""
+
+# Estado interno del pool.
+_pool_libres = queue.LifoQueue()
+_pool_creadas = 0
+_pool_ruta = None
+_pool_lock = threading.Lock()
+_pool_local = threading.local()
+# Backend "memoria": una conexión por base que la mantiene viva aunque se cierren las del pool.
+_memoria_anclas = {}
+_cache_por_id = CacheLRU(DB_CACHE_TAMANIO, DB_CACHE_TTL)
+_cache_por_nombre = CacheLRU(DB_CACHE_TAMANIO, DB_CACHE_TTL)
+_caches_derivadas = []
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class ErrorBaseDatos(sqlite3.Error):
+    """
+    Error de una operación de escritura, lanzado cuando DB_LANZAR_ERRORES es True.
+
+    Attributes:
+        operacion (str): Operación que falló (por ejemplo, "actualizar el producto").
+        tipo (str): "bloqueo" (la base siguió ocupada después de los reintentos), "integridad" u "otro".
+        reintentos (int): Cantidad de reintentos realizados.
+    """
+
+    def __init__(self, operacion, error, reintentos=0):
+        super().__init__(f"Error al {operacion}: {error}")
+        self.operacion = operacion
+        self.reintentos = reintentos
+        if _db_es_bloqueo(error):
+            self.tipo = "bloqueo"
+        elif isinstance(error, sqlite3.IntegrityError):
+            self.tipo = "integridad"
+        else:
+            self.tipo = "otro"
+
+    def a_dict(self):
+        """
+        Retorna el error como diccionario (por ejemplo, para responderlo en JSON).
+        """
+        return {"error": str(self), "operacion": self.operacion, "tipo": self.tipo, "reintentos": self.reintentos}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_es_bloqueo(error):
+    """
+    Indica si un error de sqlite3 se debe a que la base estaba bloqueada por otra conexión (SQLITE_BUSY / SQLITE_LOCKED).
+    """
+    nombre = getattr(error, "sqlite_errorname", "") or ""
+    if nombre.startswith(("SQLITE_BUSY", "SQLITE_LOCKED")):
+        return True
+    return isinstance(error, sqlite3.OperationalError) and "locked" in str(error)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_reintentar(operacion, funcion):
+    """
+    Ejecuta una escritura y la reintenta si falla porque la base está bloqueada por otro proceso.
+    funcion debe abrir su propia conexión (db_conexion) y confirmar su transacción, para que cada
+    intento empiece de cero.
+
+    Args:
+        operacion (str): Descripción de la operación para el mensaje de error.
+        funcion (callable): Escritura a ejecutar, sin argumentos.
+
+    Returns:
+        El valor retornado por funcion.
+
+    Raises:
+        ErrorBaseDatos: Si la escritura falla por otro motivo o sigue bloqueada después de DB_REINTENTOS intentos.
+    """
+    for intento in range(DB_REINTENTOS + 1):
+        try:
+            return funcion()
+        except sqlite3.Error as e:
+            if not _db_es_bloqueo(e) or intento == DB_REINTENTOS:
+                raise ErrorBaseDatos(operacion, e, intento) from e
+        time.sleep(random.uniform(0, min(DB_REINTENTO_ESPERA_MAXIMA, DB_REINTENTO_ESPERA_BASE * 2 ** intento)))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_error(error, valor):
+    """
+    Informa un ErrorBaseDatos según DB_LANZAR_ERRORES: lo lanza, o lo imprime y retorna valor.
+    """
+    if DB_LANZAR_ERRORES:
+        raise error
+    print(error)
+    return valor
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_conectar(**opciones):
+    """
+    Abre una conexión a la base configurada según DB_BACKEND ("disco" o "memoria").
+    Las bases en memoria usan el VFS memdb con un nombre que empieza con '/', lo que las comparte entre todas
+    las conexiones del proceso (con bloqueos como los de un archivo, a diferencia de cache=shared).
+
+    Args:
+        **opciones: Argumentos adicionales para sqlite3.connect.
+
+    Returns:
+        sqlite3.Connection: Conexión abierta.
+    """
+    if DB_BACKEND == "diccionario":
+        raise sqlite3.NotSupportedError("El backend 'diccionario' no usa SQLite: db_conexion() no está disponible.")
+    if DB_BACKEND != "memoria":
+        return sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT, **opciones)
+
+    nombre = DB_PATH if DB_PATH.startswith("/") else "/" + DB_PATH
+    for caracter, escape in (("%", "%25"), ("?", "%3f"), ("#", "%23")):
+        nombre = nombre.replace(caracter, escape)
+    uri = f"file:{nombre}?vfs=memdb"
+    with _pool_lock:
+        if DB_PATH not in _memoria_anclas:
+            _memoria_anclas[DB_PATH] = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    return sqlite3.connect(uri, uri=True, timeout=DB_BUSY_TIMEOUT, **opciones)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_abrir_conexion():
+    """
+    Abre una conexión nueva configurada para uso prolongado dentro del pool.
+
+    Returns:
+        sqlite3.Connection: Conexión lista para usar.
+    """
+    conexion = _db_conectar(check_same_thread=False, cached_statements=DB_CACHE_SENTENCIAS)
+    if DB_MODO_WAL:
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+    return conexion
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_pool_tomar():
+    """
+    Toma una conexión libre del pool, creando una nueva si todavía no se alcanzó DB_POOL_TAMANIO.
+    Si DB_PATH o DB_BACKEND cambiaron desde la última vez, se descartan las conexiones anteriores.
+
+    Returns:
+        sqlite3.Connection: Conexión tomada del pool.
+    """
+    global _pool_creadas, _pool_ruta
+    with _pool_lock:
+        if _pool_ruta != (DB_BACKEND, DB_PATH):
+            _db_pool_vaciar()
+            _pool_ruta = (DB_BACKEND, DB_PATH)
+        try:
+            return _pool_libres.get_nowait()
+        except queue.Empty:
+            if _pool_creadas < DB_POOL_TAMANIO:
+                _pool_creadas += 1
+                crear = True
+            else:
+                crear = False
+
+    if crear:
+        try:
+            return _db_abrir_conexion()
+        except sqlite3.Error:
+            with _pool_lock:
+                _pool_creadas -= 1
+            raise
+
+    try:
+        return _pool_libres.get(timeout=DB_POOL_TIMEOUT)
+    except queue.Empty:
+        raise sqlite3.OperationalError("No hay conexiones libres en el pool (tiempo de espera agotado).")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_pool_devolver(conexion):
+    """
+    Devuelve una conexión al pool. Si pertenece a otra base (DB_PATH o DB_BACKEND cambiaron), se cierra.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a devolver.
+    """
+    with _pool_lock:
+        if _pool_ruta == (DB_BACKEND, DB_PATH):
+            _pool_libres.put(conexion)
+            return
+    conexion.close()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_pool_vaciar():
+    """
+    Cierra todas las conexiones libres del pool. Debe llamarse con _pool_lock tomado.
+    """
+    global _pool_creadas
+    while True:
+        try:
+            _pool_libres.get_nowait().close()
+        except queue.Empty:
+            break
+    _pool_creadas = 0
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_cerrar_conexiones():
+    """
+    Cierra todas las conexiones libres del pool (por ejemplo, al salir del programa).
+    """
+    with _pool_lock:
+        _db_pool_vaciar()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_usar_backend(backend, ruta=None):
+    """
+    Cambia el backend de almacenamiento (y opcionalmente la ruta) con el programa en marcha.
+    Se cierran las conexiones del pool y se vacían las cachés, que podrían tener datos del backend anterior.
+
+    Ejemplo:
+        db_usar_backend("memoria", "pruebas")   # base SQLite en memoria llamada "pruebas"
+
+    Args:
+        backend (str): Uno de DB_BACKENDS.
+        ruta (str): Nueva DB_PATH (para "memoria" y "diccionario" es el nombre de la base).
+    """
+    global DB_BACKEND, DB_PATH
+    if backend not in DB_BACKENDS:
+        raise ValueError(f"Backend desconocido: '{backend}' (opciones: {', '.join(DB_BACKENDS)})")
+    DB_BACKEND = backend
+    if ruta is not None:
+        DB_PATH = ruta
+    db_cerrar_conexiones()
+    db_cache_limpiar()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_descartar_memoria(ruta=None):
+    """
+    Descarta los datos de una base en memoria (backends "memoria" y "diccionario"), o de todas.
+    Una base "memoria" se libera cuando se cierra su última conexión: las que estén en uso en otros hilos
+    la mantienen hasta que terminen.
+
+    Args:
+        ruta (str): Nombre de la base a descartar (None para descartar todas).
+    """
+    db_cerrar_conexiones()
+    with _pool_lock:
+        rutas = list(_memoria_anclas) if ruta is None else [ruta]
+        for nombre in rutas:
+            conexion = _memoria_anclas.pop(nombre, None)
+            if conexion is not None:
+                conexion.close()
+    if "funcionesDiccionario" in sys.modules:
+        sys.modules["funcionesDiccionario"].diccionario_descartar(ruta)
+    db_cache_limpiar()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_diccionario():
+    """
+    Retorna el almacén del backend "diccionario" para DB_PATH. El módulo se importa la primera vez que se usa.
+    """
+    from funcionesDiccionario import diccionario_almacen
+    return diccionario_almacen(DB_PATH)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@contextmanager
+def db_conexion():
+    """
+    Administrador de contexto que entrega una conexión a la base de datos.
+
+    - Con DB_USAR_POOL en True, la conexión se toma del pool y se devuelve al salir del bloque.
+      Dentro de un mismo hilo las llamadas anidadas reutilizan la misma conexión.
+    - Con DB_USAR_POOL en False, se abre y se cierra una conexión por llamada (comportamiento original).
+    - Al salir del bloque se deshace cualquier transacción que no se haya confirmado con commit().
+    - Con las métricas activadas (funcionesMetricas) se entrega la conexión envuelta en ConexionMedida.
+    - Con DB_BACKEND = "diccionario" lanza sqlite3.NotSupportedError (no hay base SQLite).
+
+    Ejemplo:
+        with db_conexion() as conexion:
+            conexion.execute("SELECT COUNT(*) FROM productos")
+
+    Yields:
+        sqlite3.Connection: Conexión a la base de datos.
+    """
+    if not DB_USAR_POOL:
+        conexion = _db_conectar()
+        try:
+            yield ConexionMedida(conexion) if metricas_activas() else conexion
+        finally:
+            conexion.close()
+        return
+
+    conexion = getattr(_pool_local, "conexion", None)
+    if conexion is not None:
+        # Llamada anidada dentro del mismo hilo: reutilizamos la conexión en uso.
+        yield ConexionMedida(conexion) if metricas_activas() else conexion
+        return
+
+    conexion = _db_pool_tomar()
+    _pool_local.conexion = conexion
+    try:
+        yield ConexionMedida(conexion) if metricas_activas() else conexion
+    finally:
+        _pool_local.conexion = None
+        # Ninguna transacción pendiente debe pasar al siguiente usuario de la conexión.
+        if conexion.in_transaction:
+            conexion.rollback()
+        _db_pool_devolver(conexion)
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_cache_invalidar(producto_id=None, nombre=None):
+    """
+    Quita de la caché las entradas de un producto. Las funciones de escritura la llaman automáticamente.
+
+    Args:
+        producto_id (int): ID del producto a invalidar.
+        nombre (str): Nombre del producto a invalidar.
+    """
+    if producto_id is not None:
+        _cache_por_id.invalidar((DB_PATH, producto_id))
+    if nombre is not None:
+        _cache_por_nombre.invalidar((DB_PATH, nombre))
+    for cache in _caches_derivadas:
+        cache.limpiar()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_cache_limpiar():
+    """
+    Vacía la caché de productos (por ejemplo, luego de una importación masiva).
+    """
+    _cache_por_id.limpiar()
+    _cache_por_nombre.limpiar()
+    for cache in _caches_derivadas:
+        cache.limpiar()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_cache_registrar(cache):
+    """
+    Registra una caché de resultados calculados a partir de varios productos (por ejemplo, reportes).
+    Como cualquier escritura puede cambiar esos resultados, se vacía entera con cada invalidación.
+
+    Args:
+        cache (CacheLRU): Caché a registrar.
+    """
+    if cache not in _caches_derivadas:
+        _caches_derivadas.append(cache)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_cache_configurar(tamanio=None, ttl=None):
+    """
+    Cambia el tamaño y/o el TTL de la caché de productos. Las entradas actuales se descartan.
+
+    Args:
+        tamanio (int): Cantidad máxima de elementos por caché.
+        ttl (float): Segundos de validez de cada elemento.
+    """
+    for cache in (_cache_por_id, _cache_por_nombre):
+        if tamanio is not None:
+            cache.tamanio = tamanio
+        if ttl is not None:
+            cache.ttl = ttl
+        cache.limpiar()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_cache_estadisticas():
+    """
+    Retorna los contadores de la caché de productos (aciertos, fallos, descartes y vencimientos).
+
+    Returns:
+        dict: {"por_id": {...}, "por_nombre": {...}}
+    """
+    return {"por_id": _cache_por_id.estadisticas(), "por_nombre": _cache_por_nombre.estadisticas()}
 
-# Ruta de la base de datos (formato multiplataforma).
-DB_PATH = os.path.join(os.getcwd(), "inventario.db")
 
 #---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_crear_tabla_productos():
     """
-    Crea la tabla 'productos' en la base de datos SQLite.
-    Si la tabla ya existe, no se vuelve a crear.
+    Crea la tabla 'productos' en la base de datos SQLite y aplica las migraciones pendientes.
+    Si la base ya está en la versión DB_VERSION_ESQUEMA (PRAGMA user_version) no se hace nada más.
 
     Estructura de la tabla:
         - id: Clave primaria autoincremental.
@@ -26,32 +493,393 @@ def db_crear_tabla_productos():
         - categoria: Categoría del producto (TEXT, NOT NULL).
         - cantidad: Cantidad disponible (INTEGER, NOT NULL).
         - precio: Precio del producto (REAL, NOT NULL).
+        - version: Número de versión, aumenta con cada modificación (INTEGER, NOT NULL).
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().crear_tabla_productos()
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            if cursor.execute("PRAGMA user_version").fetchone()[0] >= DB_VERSION_ESQUEMA:
+                return
+            # BEGIN IMMEDIATE: si varios procesos arrancan a la vez, solo uno aplica las migraciones.
+            cursor.execute("BEGIN IMMEDIATE")
+            if cursor.execute("PRAGMA user_version").fetchone()[0] >= DB_VERSION_ESQUEMA:
+                conexion.rollback()
+                return
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS productos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nombre TEXT NOT NULL,
+                    descripcion TEXT,
+                    categoria TEXT NOT NULL,
+                    cantidad INTEGER NOT NULL,
+                    precio REAL NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+            _db_migrar_version(cursor)
+            completa = _db_migrar_indices(cursor)
+            _db_migrar_busqueda(cursor)
+            _db_migrar_movimientos(cursor)
+            _db_migrar_consumo(cursor)
+            _db_migrar_cambios(cursor)
+            if completa:
+                # Si faltó el índice único (nombres repetidos), se vuelve a intentar en el próximo inicio.
+                cursor.execute(f"PRAGMA user_version = {DB_VERSION_ESQUEMA}")
+            conexion.commit()
+            print("Tabla 'productos' creada o ya existente.")
+    except sqlite3.Error as e:
+        print(f"Error al crear la tabla 'productos': {e}")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_migrar_version(cursor):
+    """
+    Agrega la columna 'version' a una tabla 'productos' creada antes de que existiera.
+    Los productos existentes quedan en la versión 1.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor de la conexión en la que se aplica la migración.
+    """
+    cursor.execute("SELECT 1 FROM pragma_table_info('productos') WHERE name = 'version'")
+    if cursor.fetchone() is None:
+        cursor.execute("ALTER TABLE productos ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_migrar_indices(cursor):
+    """
+    Crea los índices de la tabla 'productos' si todavía no existen.
+        - idx_productos_nombre: índice único sobre nombre (evita duplicados y acelera las búsquedas por nombre).
+        - idx_productos_categoria_valor: índice sobre (categoria, cantidad, precio). Cubre los reportes
+          agrupados por categoría (se resuelven leyendo solo el índice) y reemplaza al anterior
+          idx_productos_categoria, que era un prefijo suyo.
+        - idx_productos_cantidad: índice sobre cantidad (reporte de bajo stock).
+        - idx_productos_valor: índice sobre la expresión cantidad * precio (ranking por valor de stock).
+
+    Si la tabla ya contiene nombres repetidos, el índice único no puede crearse: se informan los
+    nombres en conflicto y se continúa con el resto de los índices.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor de la conexión en la que se aplica la migración.
+
+    Returns:
+        bool: True si se crearon todos los índices, False si faltó el índice único.
+    """
+    completa = True
+    try:
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_productos_nombre ON productos (nombre)")
+    except sqlite3.IntegrityError:
+        cursor.execute("SELECT nombre FROM productos GROUP BY nombre HAVING COUNT(*) > 1 LIMIT 10")
+        repetidos = ", ".join(repr(fila[0]) for fila in cursor.fetchall())
+        print(f"Advertencia: no se pudo crear el índice único sobre 'nombre'. Nombres repetidos: {repetidos}")
+        completa = False
+    cursor.execute("DROP INDEX IF EXISTS idx_productos_categoria")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_productos_categoria_valor ON productos (categoria, cantidad, precio)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_productos_cantidad ON productos (cantidad)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_productos_valor ON productos (cantidad * precio)")
+    return completa
+
 
+#---------------------------------------------------------------------------------------------------------------------
+def _db_migrar_busqueda(cursor):
+    """
+    Crea el índice de texto completo 'productos_fts' (FTS5) sobre nombre, descripcion y categoria,
+    y los triggers que lo mantienen sincronizado con cada INSERT, UPDATE y DELETE de 'productos'.
+    Si el índice se crea por primera vez, se carga con los productos existentes.
+
+    Si la versión de SQLite no incluye FTS5, se informa y db_buscar_productos() usa LIKE.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor de la conexión en la que se aplica la migración.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'productos_fts'")
+    existia = cursor.fetchone() is not None
+    try:
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS productos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                descripcion TEXT,
-                categoria TEXT NOT NULL,
-                cantidad INTEGER NOT NULL,
-                precio REAL NOT NULL
+            CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+                nombre, descripcion, categoria,
+                content='productos', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
             )
         """)
-        conexion.commit()
-        print("Tabla 'productos' creada o ya existente.")
-    except sqlite3.Error as e:
-        print(f"Error al crear la tabla 'productos': {e}")
-    finally:
-        if conexion:
-            conexion.close()
+    except sqlite3.OperationalError as e:
+        print(f"Advertencia: búsqueda de texto completo no disponible ({e}).")
+        return
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_insertar AFTER INSERT ON productos BEGIN
+            INSERT INTO productos_fts (rowid, nombre, descripcion, categoria)
+            VALUES (new.id, new.nombre, new.descripcion, new.categoria);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_eliminar AFTER DELETE ON productos BEGIN
+            INSERT INTO productos_fts (productos_fts, rowid, nombre, descripcion, categoria)
+            VALUES ('delete', old.id, old.nombre, old.descripcion, old.categoria);
+        END
+    """)
+    # Solo se reindexa cuando cambian columnas de texto (no en cada actualización de stock).
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_actualizar
+        AFTER UPDATE OF nombre, descripcion, categoria ON productos BEGIN
+            INSERT INTO productos_fts (productos_fts, rowid, nombre, descripcion, categoria)
+            VALUES ('delete', old.id, old.nombre, old.descripcion, old.categoria);
+            INSERT INTO productos_fts (rowid, nombre, descripcion, categoria)
+            VALUES (new.id, new.nombre, new.descripcion, new.categoria);
+        END
+    """)
+    if not existia:
+        cursor.execute("INSERT INTO productos_fts (productos_fts) VALUES ('rebuild')")
 
 
 #---------------------------------------------------------------------------------------------------------------------
+def _db_migrar_movimientos(cursor):
+    """
+    Crea el registro de movimientos de stock y el reporte de bajo stock precalculado.
+
+    - movimientos: una fila por cada alta, cambio de cantidad o baja de un producto, con la variación
+      y la cantidad resultante. La completan triggers, por lo que se registran todos los cambios
+      sin importar qué función los haga.
+    - productos_bajo_stock: ids de los productos cuya cantidad es menor al umbral guardado en
+      'configuracion'. Los triggers la mantienen al día fila por fila, por lo que el reporte no
+      necesita recorrer la tabla 'productos'.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor de la conexión en la que se aplica la migración.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS movimientos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            producto_id INTEGER NOT NULL,
+            tipo TEXT NOT NULL,
+            variacion INTEGER NOT NULL,
+            cantidad_resultante INTEGER NOT NULL,
+            fecha TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movimientos_producto ON movimientos (producto_id, id)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS movimientos_alta AFTER INSERT ON productos BEGIN
+            INSERT INTO movimientos (producto_id, tipo, variacion, cantidad_resultante)
+            VALUES (new.id, 'alta', new.cantidad, new.cantidad);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS movimientos_ajuste AFTER UPDATE OF cantidad ON productos
+        WHEN new.cantidad <> old.cantidad BEGIN
+            INSERT INTO movimientos (producto_id, tipo, variacion, cantidad_resultante)
+            VALUES (new.id, 'ajuste', new.cantidad - old.cantidad, new.cantidad);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS movimientos_baja AFTER DELETE ON productos BEGIN
+            INSERT INTO movimientos (producto_id, tipo, variacion, cantidad_resultante)
+            VALUES (old.id, 'baja', -old.cantidad, 0);
+        END
+    """)
+
+    cursor.execute("CREATE TABLE IF NOT EXISTS configuracion (clave TEXT PRIMARY KEY, valor)")
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'productos_bajo_stock'")
+    existia = cursor.fetchone() is not None
+    cursor.execute("CREATE TABLE IF NOT EXISTS productos_bajo_stock (producto_id INTEGER PRIMARY KEY)")
+    condicion = "(SELECT valor FROM configuracion WHERE clave = 'umbral_bajo_stock')"
+    # Los triggers no usan INSERT OR IGNORE: dentro de un trigger la política de conflicto la impone
+    # la sentencia externa (por ejemplo, un INSERT OR REPLACE), no la del trigger.
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS bajo_stock_alta AFTER INSERT ON productos
+        WHEN new.cantidad < {condicion} BEGIN
+            INSERT INTO productos_bajo_stock (producto_id) VALUES (new.id);
+        END
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS bajo_stock_ajuste")
+    cursor.execute(f"""
+        CREATE TRIGGER bajo_stock_ajuste AFTER UPDATE OF cantidad ON productos BEGIN
+            DELETE FROM productos_bajo_stock WHERE producto_id = old.id AND new.cantidad >= {condicion};
+            INSERT INTO productos_bajo_stock (producto_id)
+            SELECT new.id WHERE new.cantidad < {condicion}
+            AND NOT EXISTS (SELECT 1 FROM productos_bajo_stock WHERE producto_id = new.id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS bajo_stock_baja AFTER DELETE ON productos BEGIN
+            DELETE FROM productos_bajo_stock WHERE producto_id = old.id;
+        END
+    """)
+    if not existia:
+        _db_recalcular_bajo_stock(cursor, DB_UMBRAL_BAJO_STOCK)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_migrar_consumo(cursor):
+    """
+    Crea las tablas de consumo que usa el pronóstico de reposición (funcionesPronostico).
+
+    - consumo_diario: unidades egresadas por producto y día (UTC). La completa un trigger sobre 'movimientos'
+      con cada ajuste negativo de cantidad, por lo que cuenta cualquier cambio hecho con db_actualizar_producto,
+      db_incrementar_cantidad, db_ajustar_stock_lote, etc. Las altas y bajas de productos no son consumo.
+    - consumo_ventanas: una fila por ventana de DB_VENTANAS_CONSUMO, con el primer día que incluye.
+    - consumo_acumulado: por producto y ventana, la suma de los egresos diarios y de sus cuadrados (para la
+      variabilidad). Los triggers de consumo_diario la mantienen al día; al avanzar una ventana solo se restan
+      los días que salen de ella, sin volver a recorrer el historial.
+
+    Si las tablas se crean por primera vez, se cargan a partir de los movimientos ya registrados.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor de la conexión en la que se aplica la migración.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'consumo_diario'")
+    existia = cursor.fetchone() is not None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS consumo_diario (
+            producto_id INTEGER NOT NULL,
+            dia TEXT NOT NULL,
+            unidades INTEGER NOT NULL,
+            PRIMARY KEY (producto_id, dia)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_consumo_diario_dia ON consumo_diario (dia)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS consumo_ventanas (dias INTEGER PRIMARY KEY, inicio TEXT NOT NULL)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS consumo_acumulado (
+            producto_id INTEGER NOT NULL,
+            dias INTEGER NOT NULL,
+            unidades INTEGER NOT NULL,
+            cuadrados INTEGER NOT NULL,
+            PRIMARY KEY (producto_id, dias)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS consumo_egreso AFTER INSERT ON movimientos
+        WHEN new.tipo = 'ajuste' AND new.variacion < 0 BEGIN
+            INSERT INTO consumo_diario (producto_id, dia, unidades)
+            VALUES (new.producto_id, substr(new.fecha, 1, 10), -new.variacion)
+            ON CONFLICT (producto_id, dia) DO UPDATE SET unidades = unidades + excluded.unidades;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS consumo_diario_alta AFTER INSERT ON consumo_diario BEGIN
+            INSERT INTO consumo_acumulado (producto_id, dias, unidades, cuadrados)
+            SELECT new.producto_id, dias, new.unidades, new.unidades * new.unidades
+            FROM consumo_ventanas WHERE new.dia >= inicio
+            ON CONFLICT (producto_id, dias) DO UPDATE SET
+                unidades = unidades + excluded.unidades, cuadrados = cuadrados + excluded.cuadrados;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS consumo_diario_cambio AFTER UPDATE OF unidades ON consumo_diario BEGIN
+            UPDATE consumo_acumulado SET
+                unidades = unidades + new.unidades - old.unidades,
+                cuadrados = cuadrados + new.unidades * new.unidades - old.unidades * old.unidades
+            WHERE producto_id = new.producto_id
+            AND dias IN (SELECT dias FROM consumo_ventanas WHERE new.dia >= inicio);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS consumo_baja AFTER DELETE ON productos BEGIN
+            DELETE FROM consumo_acumulado WHERE producto_id = old.id;
+            DELETE FROM consumo_diario WHERE producto_id = old.id;
+        END
+    """)
+
+    for dias in DB_VENTANAS_CONSUMO:
+        cursor.execute("INSERT OR IGNORE INTO consumo_ventanas (dias, inicio) VALUES (?, date('now', ?))",
+                       (dias, f"-{dias - 1} days"))
+    if not existia:
+        # El trigger consumo_diario_alta completa consumo_acumulado a partir de estas filas.
+        cursor.execute("""
+            INSERT INTO consumo_diario (producto_id, dia, unidades)
+            SELECT m.producto_id, substr(m.fecha, 1, 10), -SUM(m.variacion)
+            FROM movimientos m
+            JOIN productos p ON p.id = m.producto_id
+            WHERE m.tipo = 'ajuste' AND m.variacion < 0
+            GROUP BY m.producto_id, substr(m.fecha, 1, 10)
+        """)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_migrar_cambios(cursor):
+    """
+    Crea el registro de cambios de 'productos' que consumen otros sistemas para sincronizarse (funcionesCambios).
+
+    - cambios: una fila por cada INSERT, UPDATE o DELETE de un producto, con la fila anterior y la nueva como
+      objetos JSON (NULL en la que no existe). La completan triggers, por lo que se registran todos los cambios
+      sin importar qué función (o qué proceso) los haga. Las actualizaciones que no modifican ninguna columna
+      no se registran.
+    - secuencia: AUTOINCREMENT, por lo que nunca se reutiliza aunque se purguen filas. Como SQLite confirma las
+      escrituras de a una, los cambios se vuelven visibles en el orden de su secuencia.
+
+    Los productos existentes al crear la tabla no generan filas: quien se sincroniza por primera vez lee la
+    secuencia actual, copia la tabla completa y desde ahí aplica los cambios.
+
+    json_object() escribe un real infinito como Inf, que no es JSON válido: en las columnas numéricas se
+    registra null (como ya ocurre con NaN, que SQLite guarda como NULL). Los triggers se vuelven a crear en
+    cada migración para que las bases anteriores también tomen esta versión.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor de la conexión en la que se aplica la migración.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cambios (
+            secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+            producto_id INTEGER NOT NULL,
+            operacion TEXT NOT NULL,
+            anterior TEXT,
+            nuevo TEXT,
+            fecha TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+        )
+    """)
+
+    def json_fila(fila):
+        valores = {columna: f"{fila}.{columna}" for columna in COLUMNAS_PRODUCTOS}
+        for columna in ("cantidad", "precio"):
+            valores[columna] = f"nullif(nullif({valores[columna]}, 9e999), -9e999)"
+        return "json_object(" + ", ".join(f"'{columna}', {valor}" for columna, valor in valores.items()) + ")"
+
+    json_anterior = json_fila("old")
+    json_nuevo = json_fila("new")
+
+    modificada = " OR ".join(f"old.{columna} IS NOT new.{columna}" for columna in COLUMNAS_PRODUCTOS)
+    for trigger in ("cambios_alta", "cambios_modificacion", "cambios_baja"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS cambios_alta AFTER INSERT ON productos BEGIN
+            INSERT INTO cambios (producto_id, operacion, nuevo) VALUES (new.id, 'insert', {json_nuevo});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS cambios_modificacion AFTER UPDATE ON productos WHEN {modificada} BEGIN
+            INSERT INTO cambios (producto_id, operacion, anterior, nuevo)
+            VALUES (new.id, 'update', {json_anterior}, {json_nuevo});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS cambios_baja AFTER DELETE ON productos BEGIN
+            INSERT INTO cambios (producto_id, operacion, anterior) VALUES (old.id, 'delete', {json_anterior});
+        END
+    """)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _db_recalcular_bajo_stock(cursor, umbral):
+    """
+    Guarda el umbral y vuelve a calcular la tabla productos_bajo_stock (usa el índice sobre cantidad).
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor a utilizar (la transacción la confirma quien llama).
+        umbral (int): Cantidad por debajo de la cual un producto se considera con bajo stock.
+    """
+    cursor.execute("INSERT OR REPLACE INTO configuracion (clave, valor) VALUES ('umbral_bajo_stock', ?)", (umbral,))
+    cursor.execute("DELETE FROM productos_bajo_stock")
+    cursor.execute("INSERT INTO productos_bajo_stock (producto_id) SELECT id FROM productos WHERE cantidad < ?",
+                   (umbral,))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_producto_existe(nombre):
     """
     Verifica si un producto con el nombre dado ya existe en la tabla 'productos'.
@@ -62,30 +890,36 @@ def db_producto_existe(nombre):
     Returns:
         bool: True si el producto existe, False en caso contrario.
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().producto_existe(nombre)
+    if DB_USAR_CACHE:
+        existe = _cache_por_nombre.obtener((DB_PATH, nombre))
+        if existe is not SIN_VALOR:
+            return existe
+        generacion = _cache_por_nombre.generacion()
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
-        query = "SELECT COUNT(*) FROM productos WHERE nombre = ?"
-        cursor.execute(query, (nombre,))
-        count = cursor.fetchone()[0]
-        return count > 0
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            query = "SELECT COUNT(*) FROM productos WHERE nombre = ?"
+            cursor.execute(query, (nombre,))
+            count = cursor.fetchone()[0]
+            if DB_USAR_CACHE:
+                _cache_por_nombre.guardar((DB_PATH, nombre), count > 0, generacion)
+            return count > 0
     except sqlite3.Error as e:
         print(f"Error al verificar si el producto existe: {e}")
         return False
-    finally:
-        if conexion:
-            conexion.close()
 
 
 #---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_insertar_producto(producto):
     """
     Inserta un producto en la tabla 'productos'.
     Si el nombre del producto ya existe, no realiza la inserción.
 
     Args:
-        producto (dict): Diccionario con las claves correspondientes a los campos:
+        producto (dict | Producto): Diccionario (o Producto) con las claves correspondientes a los campos:
             - nombre (str): Nombre del producto.
             - descripcion (str): Descripción opcional del producto.
             - categoria (str): Categoría del producto.
@@ -95,65 +929,210 @@ def db_insertar_producto(producto):
     Returns:
         str: Mensaje indicando el resultado de la operación.
     """
-    conexion = None
-    try:
-        nombre = producto.get("nombre")
-        if db_producto_existe(nombre):
-            return f"Error: El producto '{nombre}' ya existe en la base de datos."
-
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().insertar_producto(producto)
+    if isinstance(producto, Producto):
+        producto = producto.a_dict()
+    nombre = producto.get("nombre")
 
-        query = """
-            INSERT INTO productos (nombre, descripcion, categoria, cantidad, precio)
-            VALUES (?, ?, ?, ?, ?)
-        """
-        placeholders = (
-            nombre,
-            producto.get("descripcion"),
-            producto.get("categoria"),
-            producto.get("cantidad"),
-            producto.get("precio"),
-        )
+    def insertar():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            # La verificación de duplicados va en la misma sentencia (ver SQL_INSERTAR_PRODUCTO).
+            placeholders = (
+                nombre,
+                producto.get("descripcion"),
+                producto.get("categoria"),
+                producto.get("cantidad"),
+                producto.get("precio"),
+            )
+            cursor.execute(SQL_INSERTAR_PRODUCTO, placeholders)
+            conexion.commit()
+            db_cache_invalidar(nombre=nombre)
+            if cursor.rowcount == 0:
+                return f"Error: El producto '{nombre}' ya existe en la base de datos."
+            return f"Producto '{nombre}' insertado correctamente."
 
-        cursor.execute(query, placeholders)
-        conexion.commit()
-        return f"Producto '{nombre}' insertado correctamente."
-    except sqlite3.Error as e:
-        return f"Error al insertar el producto: {e}"
-    except KeyError as e:
-        return f"Falta clave requerida en el diccionario: {e}"
+    try:
+        return _db_reintentar("insertar el producto", insertar)
+    except ErrorBaseDatos as e:
+        if DB_LANZAR_ERRORES:
+            raise
+        return str(e)
     except Exception as e:
         return f"Error inesperado: {e}"
-    finally:
-        if conexion:
-            conexion.close()
 
 
 #---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_upsert_producto(producto):
+    """
+    Inserta un producto o, si ya existe uno con el mismo nombre, actualiza sus datos
+    (descripción, categoría, cantidad y precio), en una única transacción.
+
+    No usa INSERT ... ON CONFLICT DO UPDATE: aunque termine actualizando, esa sentencia reserva un id de
+    AUTOINCREMENT (ver SQL_INSERTAR_PRODUCTO). Se actualiza primero y solo si el nombre no existe se inserta.
+
+    Args:
+        producto (dict | Producto): Datos del producto (nombre, descripcion, categoria, cantidad y precio).
+
+    Returns:
+        tuple: (resultado, producto_id) donde resultado es "insertado" o "actualizado".
+               Si ocurre un error se retorna (None, None).
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().upsert_producto(producto)
+    if isinstance(producto, Producto):
+        producto = producto.a_dict()
+
+    def upsert():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            # BEGIN IMMEDIATE evita que otro escritor inserte el mismo nombre entre ambas sentencias.
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("""
+                UPDATE productos SET
+                    descripcion = ?, categoria = ?, cantidad = ?, precio = ?, version = version + 1
+                WHERE nombre = ?
+                RETURNING id
+            """, (producto.get("descripcion"), producto.get("categoria"), producto.get("cantidad"),
+                  producto.get("precio"), producto.get("nombre")))
+            filas = cursor.fetchall()
+            if filas:
+                resultado = "actualizado"
+            else:
+                cursor.execute(SQL_INSERTAR_PRODUCTO + "RETURNING id",
+                               (producto.get("nombre"), producto.get("descripcion"), producto.get("categoria"),
+                                producto.get("cantidad"), producto.get("precio")))
+                filas = cursor.fetchall()
+                resultado = "insertado"
+            producto_id = filas[0][0]
+            conexion.commit()
+            db_cache_invalidar(producto_id, producto.get("nombre"))
+            return resultado, producto_id
+
+    try:
+        return _db_reintentar("insertar o actualizar el producto", upsert)
+    except ErrorBaseDatos as e:
+        return _db_error(e, (None, None))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_get_productos():
     """
     Obtiene todos los productos de la tabla 'productos'.
+    Para recorrer tablas grandes conviene db_iter_productos(), que no los carga todos a la vez.
 
     Returns:
-        list: Lista de tuplas con los datos de los productos.
+        ProductoBatch: Productos guardados por columnas (se recorre como una lista de Producto).
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().get_productos()
+    productos = ProductoBatch()
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
-        cursor.execute("SELECT * FROM productos")
-        productos = cursor.fetchall()
-        return productos
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(f"SELECT {SQL_COLUMNAS_PRODUCTOS} FROM productos")
+            productos.extender(cursor)
+            return productos
     except sqlite3.Error as e:
         print(f"Error al obtener los productos: {e}")
-        return []
-    finally:
-        if conexion:
-            conexion.close()
+        return ProductoBatch()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir(filas=lambda resultado: len(resultado[0]))
+def db_get_pagina_productos(tamanio_pagina=20, despues_de=None, antes_de=None, columnas=None, orden="id", descendente=False):
+    """
+    Obtiene una página de productos usando paginación por clave (keyset): en lugar de OFFSET se
+    filtra a partir de la última fila vista, por lo que cada página cuesta lo mismo sin importar su posición.
+
+    Args:
+        tamanio_pagina (int): Cantidad máxima de filas de la página.
+        despues_de (tuple): Clave (valor de orden, id) de la última fila de la página anterior.
+        antes_de (tuple): Clave (valor de orden, id) de la primera fila de la página siguiente
+                          (para retroceder una página). Se ignora si se indica despues_de.
+        columnas (list): Columnas a devolver (por defecto, todas las de COLUMNAS_PRODUCTOS).
+        orden (str): Columna de ordenamiento (una de COLUMNAS_ORDEN_PRODUCTOS). El id desempata.
+        descendente (bool): Si es True, ordena de mayor a menor.
+
+    Returns:
+        tuple: (productos, primera_clave, ultima_clave). productos es una lista de Producto (las columnas no
+               pedidas quedan en None); las claves sirven para pedir la página anterior o la siguiente
+               (None si la página está vacía).
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().get_pagina_productos(tamanio_pagina, despues_de, antes_de, columnas, orden, descendente)
+    todas = not columnas
+    columnas = list(columnas or COLUMNAS_PRODUCTOS)
+    if orden not in COLUMNAS_ORDEN_PRODUCTOS:
+        raise ValueError(f"No se puede ordenar por la columna '{orden}'.")
+    desconocidas = [columna for columna in columnas if columna not in COLUMNAS_PRODUCTOS]
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas: {', '.join(desconocidas)}")
+
+    # Para retroceder se recorre en sentido inverso y luego se invierte el resultado.
+    retroceder = despues_de is None and antes_de is not None
+    hacia_atras = descendente != retroceder
+    comparacion = "<" if hacia_atras else ">"
+    direccion = "DESC" if hacia_atras else "ASC"
+    clave = despues_de if not retroceder else antes_de
+
+    query = f"SELECT {', '.join(columnas)}, {orden}, id FROM productos"
+    parametros = ()
+    if clave is not None:
+        query += f" WHERE ({orden}, id) {comparacion} (?, ?)"
+        parametros = tuple(clave)
+    query += f" ORDER BY {orden} {direccion}, id {direccion} LIMIT ?"
+
+    try:
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(query, parametros + (tamanio_pagina,))
+            filas = cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Error al obtener la página de productos: {e}")
+        return [], None, None
+
+    if retroceder:
+        filas.reverse()
+    if not filas:
+        return [], None, None
+    if todas:
+        productos = [Producto(*fila[:-2]) for fila in filas]
+    else:
+        productos = [producto_desde_columnas(columnas, fila[:-2]) for fila in filas]
+    return productos, filas[0][-2:], filas[-1][-2:]
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def db_iter_productos(tamanio_pagina=500, columnas=None, orden="id", descendente=False):
+    """
+    Generador que recorre todos los productos de a una página por vez, por lo que la memoria utilizada
+    no depende del tamaño de la tabla. Entre página y página la conexión se devuelve al pool.
+
+    Args:
+        tamanio_pagina (int): Cantidad de filas que se leen por consulta.
+        columnas (list): Columnas a devolver (por defecto, todas).
+        orden (str): Columna de ordenamiento (una de COLUMNAS_ORDEN_PRODUCTOS).
+        descendente (bool): Si es True, ordena de mayor a menor.
+
+    Yields:
+        Producto: Un producto por fila (las columnas no pedidas quedan en None).
+    """
+    ultima_clave = None
+    while True:
+        filas, _, ultima_clave = db_get_pagina_productos(
+            tamanio_pagina, despues_de=ultima_clave, columnas=columnas, orden=orden, descendente=descendente
+        )
+        yield from filas
+        if len(filas) < tamanio_pagina:
+            return
 
 
 #---------------------------------------------------------------------------------------------------------------------
+@metricas_medir(filas=lambda producto: int(producto is not None))
 def db_get_producto_by_id(producto_id):
     """
     Obtiene un producto por su ID.
@@ -162,87 +1141,432 @@ def db_get_producto_by_id(producto_id):
         producto_id (int): ID del producto.
 
     Returns:
-        tuple: Tupla con los datos del producto o None si no existe.
+        Producto: Producto encontrado o None si no existe.
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().get_producto_by_id(producto_id)
+    if DB_USAR_CACHE:
+        producto = _cache_por_id.obtener((DB_PATH, producto_id))
+        if producto is not SIN_VALOR:
+            return producto
+        # Si otro hilo modifica el producto (e invalida la caché) mientras se lee, lo leído no se guarda.
+        generacion = _cache_por_id.generacion()
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
-        cursor.execute("SELECT * FROM productos WHERE id = ?", (producto_id,))
-        return cursor.fetchone()
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.row_factory = producto_row_factory
+            cursor.execute(f"SELECT {SQL_COLUMNAS_PRODUCTOS} FROM productos WHERE id = ?", (producto_id,))
+            producto = cursor.fetchone()
+            # Solo se guardan productos encontrados: un id inexistente puede aparecer con la próxima inserción.
+            if DB_USAR_CACHE and producto is not None:
+                _cache_por_id.guardar((DB_PATH, producto_id), producto, generacion)
+            return producto
     except sqlite3.Error as e:
         print(f"Error al obtener el producto por ID: {e}")
         return None
-    finally:
-        if conexion:
-            conexion.close()
 
 
 #---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_buscar_productos(texto, limite=20):
+    """
+    Busca productos cuyo nombre, descripción o categoría contengan las palabras indicadas.
+    Cada palabra se busca como prefijo ("cafe" encuentra "cafetera") y sin distinguir acentos.
+    Los resultados se ordenan por relevancia (bm25), dando más peso al nombre y luego a la categoría.
+
+    Args:
+        texto (str): Palabras a buscar.
+        limite (int): Cantidad máxima de resultados.
+
+    Returns:
+        list: Lista de Producto encontrados, de mayor a menor relevancia.
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().buscar_productos(texto, limite)
+    palabras = re.findall(r"\w+", texto or "")
+    if not palabras:
+        return []
+    consulta = " ".join(f'"{palabra}"*' for palabra in palabras)
+
+    try:
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.row_factory = producto_row_factory
+            try:
+                cursor.execute(f"""
+                    SELECT {SQL_COLUMNAS_PRODUCTOS_P} FROM productos_fts
+                    JOIN productos p ON p.id = productos_fts.rowid
+                    WHERE productos_fts MATCH ?
+                    ORDER BY bm25(productos_fts, 10.0, 1.0, 5.0)
+                    LIMIT ?
+                """, (consulta, limite))
+            except sqlite3.OperationalError:
+                # Sin FTS5: búsqueda por coincidencia parcial (recorre la tabla).
+                condicion = " AND ".join("(nombre || ' ' || IFNULL(descripcion, '') || ' ' || categoria) LIKE ?"
+                                         for _ in palabras)
+                cursor.execute(f"SELECT {SQL_COLUMNAS_PRODUCTOS} FROM productos WHERE {condicion} LIMIT ?",
+                               tuple(f"%{palabra}%" for palabra in palabras) + (limite,))
+            return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Error al buscar productos: {e}")
+        return []
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_actualizar_producto(producto_id, nueva_cantidad):
     """
-    Actualiza la cantidad de un producto.
+    Actualiza la cantidad de un producto sin verificar si cambió desde que se leyó
+    (ver db_actualizar_producto_version y db_incrementar_cantidad).
 
     Args:
         producto_id (int): ID del producto.
         nueva_cantidad (int): Nueva cantidad del producto.
+
+    Returns:
+        bool: True si el producto existía y se actualizó, False en caso contrario.
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().actualizar_producto(producto_id, nueva_cantidad)
+
+    def actualizar():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("UPDATE productos SET cantidad = ?, version = version + 1 WHERE id = ?",
+                           (nueva_cantidad, producto_id))
+            conexion.commit()
+            db_cache_invalidar(producto_id)
+            return cursor.rowcount
+
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
-        cursor.execute("UPDATE productos SET cantidad = ? WHERE id = ?", (nueva_cantidad, producto_id))
-        conexion.commit()
-        print(f"Producto con ID {producto_id} actualizado correctamente.")
-    except sqlite3.Error as e:
-        print(f"Error al actualizar el producto: {e}")
-    finally:
-        if conexion:
-            conexion.close()
+        actualizados = _db_reintentar("actualizar el producto", actualizar)
+    except ErrorBaseDatos as e:
+        return _db_error(e, False)
+    if actualizados == 0:
+        print(f"No existe un producto con ID {producto_id}.")
+        return False
+    print(f"Producto con ID {producto_id} actualizado correctamente.")
+    return True
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_actualizar_producto_version(producto_id, nueva_cantidad, version):
+    """
+    Actualiza la cantidad de un producto solo si no fue modificado desde que se leyó (compare-and-set):
+    la actualización se aplica si la versión guardada sigue siendo la indicada.
+
+    Args:
+        producto_id (int): ID del producto.
+        nueva_cantidad (int): Nueva cantidad del producto.
+        version (int): Versión del producto leída antes de calcular la nueva cantidad.
+
+    Returns:
+        tuple: (resultado, version) donde resultado es:
+            - "actualizado": se aplicó el cambio; version es la nueva versión.
+            - "conflicto": otro proceso lo modificó antes; version es la versión actual.
+            - "inexistente": no existe el producto; version es None.
+            Si ocurre un error se retorna (None, None).
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().actualizar_producto_version(producto_id, nueva_cantidad, version)
+
+    def actualizar():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(
+                "UPDATE productos SET cantidad = ?, version = version + 1 WHERE id = ? AND version = ? RETURNING version",
+                (nueva_cantidad, producto_id, version),
+            )
+            fila = cursor.fetchone()
+            conexion.commit()
+            # También sin cambios: si no coincidió la versión, la entrada en caché es la que está desactualizada.
+            db_cache_invalidar(producto_id)
+            if fila is not None:
+                return "actualizado", fila[0]
+            cursor.execute("SELECT version FROM productos WHERE id = ?", (producto_id,))
+            fila = cursor.fetchone()
+            return ("conflicto", fila[0]) if fila else ("inexistente", None)
+
+    try:
+        return _db_reintentar("actualizar el producto", actualizar)
+    except ErrorBaseDatos as e:
+        return _db_error(e, (None, None))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_incrementar_cantidad(producto_id, variacion):
+    """
+    Suma una variación (+/-) a la cantidad de un producto en una única sentencia, sin leerla antes.
+    La variación no se aplica si la cantidad quedaría negativa.
+
+    Args:
+        producto_id (int): ID del producto.
+        variacion (int): Unidades a sumar (negativo para restar).
+
+    Returns:
+        tuple: (resultado, cantidad) donde resultado es:
+            - "actualizado": se aplicó la variación; cantidad es la nueva cantidad.
+            - "insuficiente": la cantidad quedaría negativa; cantidad es la cantidad actual.
+            - "inexistente": no existe el producto; cantidad es None.
+            Si ocurre un error se retorna (None, None).
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().incrementar_cantidad(producto_id, variacion)
+
+    def incrementar():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(
+                "UPDATE productos SET cantidad = cantidad + ?, version = version + 1 "
+                "WHERE id = ? AND cantidad + ? >= 0 RETURNING cantidad",
+                (variacion, producto_id, variacion),
+            )
+            fila = cursor.fetchone()
+            conexion.commit()
+            # También sin cambios: la cantidad en caché puede ser anterior a la que impidió aplicar la variación.
+            db_cache_invalidar(producto_id)
+            if fila is not None:
+                return "actualizado", fila[0]
+            cursor.execute("SELECT cantidad FROM productos WHERE id = ?", (producto_id,))
+            fila = cursor.fetchone()
+            return ("insuficiente", fila[0]) if fila else ("inexistente", None)
+
+    try:
+        return _db_reintentar("actualizar el producto", incrementar)
+    except ErrorBaseDatos as e:
+        return _db_error(e, (None, None))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir(filas=lambda resumen: resumen["productos"] if resumen["aplicado"] else 0)
+def db_ajustar_stock_lote(movimientos):
+    """
+    Aplica variaciones relativas de stock (+/-) a muchos productos en una única transacción.
+    Las variaciones de un mismo producto se suman antes de aplicarse, y todo el lote se rechaza
+    (sin modificar nada) si algún producto no existe o si su cantidad quedaría negativa.
+
+    Args:
+        movimientos (iterable): Pares (producto_id, variacion), por ejemplo [(1, +10), (2, -3)].
+
+    Returns:
+        dict: Resumen con las claves aplicado (bool), movimientos, productos, rechazados
+              (lista de tuplas (producto_id, motivo)), segundos y movimientos_por_segundo.
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().ajustar_stock_lote(movimientos)
+    inicio = time.perf_counter()
+    variaciones = {}
+    cantidad_movimientos = 0
+    for producto_id, variacion in movimientos:
+        cantidad_movimientos += 1
+        variaciones[producto_id] = variaciones.get(producto_id, 0) + variacion
+    parametros = [(variacion, producto_id, variacion) for producto_id, variacion in variaciones.items() if variacion]
+
+    resumen = {"aplicado": False, "movimientos": cantidad_movimientos, "productos": len(parametros), "rechazados": []}
+
+    def ajustar():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            # La condición descarta las filas que quedarían en negativo; si alguna fila no se
+            # actualizó (id inexistente o stock insuficiente) se deshace todo el lote.
+            cursor.executemany(
+                "UPDATE productos SET cantidad = cantidad + ?, version = version + 1 WHERE id = ? AND cantidad + ? >= 0",
+                parametros
+            )
+            if cursor.rowcount == len(parametros):
+                conexion.commit()
+                return True, []
+            conexion.rollback()
+            return False, _db_diagnosticar_lote(cursor, parametros)
+
+    try:
+        resumen["aplicado"], resumen["rechazados"] = _db_reintentar("ajustar el stock", ajustar)
+    except ErrorBaseDatos as e:
+        resumen["rechazados"] = _db_error(e, [(None, str(e))])
+
+    if resumen["aplicado"]:
+        for _, producto_id, _ in parametros:
+            db_cache_invalidar(producto_id)
+    resumen["segundos"] = time.perf_counter() - inicio
+    resumen["movimientos_por_segundo"] = cantidad_movimientos / resumen["segundos"] if resumen["segundos"] else 0.0
+    return resumen
 
 
 #---------------------------------------------------------------------------------------------------------------------
+def _db_diagnosticar_lote(cursor, parametros, maximo=100):
+    """
+    Identifica los productos que impidieron aplicar un lote de ajustes de stock.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor a utilizar.
+        parametros (list): Tuplas (variacion, producto_id, variacion) del lote rechazado.
+        maximo (int): Cantidad máxima de problemas a informar.
+
+    Returns:
+        list: Lista de tuplas (producto_id, motivo).
+    """
+    rechazados = []
+    for variacion, producto_id, _ in parametros:
+        cursor.execute("SELECT cantidad FROM productos WHERE id = ?", (producto_id,))
+        fila = cursor.fetchone()
+        if fila is None:
+            rechazados.append((producto_id, "el producto no existe"))
+        elif fila[0] + variacion < 0:
+            rechazados.append((producto_id, f"stock insuficiente (actual {fila[0]}, variación {variacion})"))
+        if len(rechazados) >= maximo:
+            break
+    return rechazados
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_eliminar_producto(producto_id):
     """
     Elimina un producto por su ID.
 
     Args:
         producto_id (int): ID del producto a eliminar.
+
+    Returns:
+        bool: True si el producto existía y se eliminó, False en caso contrario.
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().eliminar_producto(producto_id)
+
+    def eliminar():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("DELETE FROM productos WHERE id = ? RETURNING nombre", (producto_id,))
+            eliminados = cursor.fetchall()
+            conexion.commit()
+            if eliminados:
+                db_cache_invalidar(producto_id, eliminados[0][0])
+            return eliminados
+
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
-        cursor.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
-        conexion.commit()
-        print(f"Producto con ID {producto_id} eliminado correctamente.")
-    except sqlite3.Error as e:
-        print(f"Error al eliminar el producto: {e}")
-    finally:
-        if conexion:
-            conexion.close()
+        eliminados = _db_reintentar("eliminar el producto", eliminar)
+    except ErrorBaseDatos as e:
+        return _db_error(e, False)
+    if not eliminados:
+        print(f"No existe un producto con ID {producto_id}.")
+        return False
+    print(f"Producto con ID {producto_id} eliminado correctamente.")
+    return True
 
 
 #---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
 def db_get_productos_by_condicion(minimo_stock):
     """
     Obtiene los productos cuya cantidad es menor al stock mínimo.
+    Si minimo_stock coincide con el umbral configurado, se responde desde la tabla precalculada
+    productos_bajo_stock; en otro caso se recorre solo el rango necesario del índice sobre cantidad.
+    En ambos casos el tiempo depende de la cantidad de resultados y no del tamaño de la tabla.
 
     Args:
         minimo_stock (int): Cantidad mínima de stock.
 
     Returns:
-        list: Lista de tuplas con los productos que cumplen la condición.
+        ProductoBatch: Productos que cumplen la condición, ordenados por id (se recorre como una lista de Producto).
     """
-    conexion = None
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().get_productos_by_condicion(minimo_stock)
     try:
-        conexion = sqlite3.connect(DB_PATH)
-        cursor = conexion.cursor()
-        cursor.execute("SELECT * FROM productos WHERE cantidad < ?", (minimo_stock,))
-        return cursor.fetchall()
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT valor FROM configuracion WHERE clave = 'umbral_bajo_stock'")
+            fila = cursor.fetchone()
+            if fila is not None and fila[0] == minimo_stock:
+                cursor.execute(f"""
+                    SELECT {SQL_COLUMNAS_PRODUCTOS_P} FROM productos_bajo_stock b
+                    JOIN productos p ON p.id = b.producto_id
+                    ORDER BY p.id
+                """)
+            else:
+                # Se ordenan por id, como la tabla precalculada. Con "+id" SQLite no puede usar el orden de la
+                # tabla para el ORDER BY y sigue leyendo solo el rango del índice sobre cantidad (luego ordena).
+                cursor.execute(f"SELECT {SQL_COLUMNAS_PRODUCTOS} FROM productos WHERE cantidad < ? ORDER BY +id",
+                               (minimo_stock,))
+            return ProductoBatch(cursor)
     except sqlite3.Error as e:
         print(f"Error al obtener productos con bajo stock: {e}")
+        return ProductoBatch()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_get_umbral_bajo_stock():
+    """
+    Obtiene el umbral de bajo stock configurado para el reporte precalculado.
+
+    Returns:
+        int: Umbral configurado (DB_UMBRAL_BAJO_STOCK si no hay ninguno guardado).
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().get_umbral_bajo_stock()
+    try:
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT valor FROM configuracion WHERE clave = 'umbral_bajo_stock'")
+            fila = cursor.fetchone()
+            return fila[0] if fila is not None else DB_UMBRAL_BAJO_STOCK
+    except sqlite3.Error as e:
+        print(f"Error al obtener el umbral de bajo stock: {e}")
+        return DB_UMBRAL_BAJO_STOCK
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_set_umbral_bajo_stock(umbral):
+    """
+    Cambia el umbral del reporte de bajo stock precalculado y lo vuelve a calcular.
+    A partir de ese momento los triggers lo mantienen actualizado con cada cambio de cantidad.
+
+    Args:
+        umbral (int): Cantidad por debajo de la cual un producto se considera con bajo stock.
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().set_umbral_bajo_stock(umbral)
+
+    def recalcular():
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            _db_recalcular_bajo_stock(cursor, umbral)
+            conexion.commit()
+
+    try:
+        _db_reintentar("actualizar el umbral de bajo stock", recalcular)
+    except ErrorBaseDatos as e:
+        return _db_error(e, None)
+    print(f"Umbral de bajo stock actualizado a {umbral}.")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def db_get_movimientos(producto_id, limite=50):
+    """
+    Obtiene los últimos movimientos de stock registrados para un producto.
+
+    Args:
+        producto_id (int): ID del producto.
+        limite (int): Cantidad máxima de movimientos.
+
+    Returns:
+        list: Lista de tuplas (id, producto_id, tipo, variacion, cantidad_resultante, fecha),
+              del más reciente al más antiguo.
+    """
+    if DB_BACKEND == "diccionario":
+        return _db_diccionario().get_movimientos(producto_id, limite)
+    try:
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT * FROM movimientos WHERE producto_id = ? ORDER BY id DESC LIMIT ?",
+                           (producto_id, limite))
+            return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Error al obtener los movimientos del producto: {e}")
         return []
-    finally:
-        if conexion:
-            conexion.close()
\ No newline at end of file
@@ -0,0 +1,420 @@
+"""
+Módulo: funcionesDiccionario.py
+Descripción: Este módulo implementa el backend de almacenamiento "diccionario" (ver DB_BACKEND en funcionesDataBase):
+los productos se guardan en diccionarios de Python, sin SQLite ni archivos, y se pierden al terminar el proceso.
+Sirve para pruebas rápidas y para comparar el costo de SQLite con el mismo banco de pruebas (benchmarkDataBase.py).
+
+Cada método de AlmacenDiccionario reproduce a la función db_* del mismo nombre (mismos argumentos, mismos valores
+de retorno y mismos mensajes), incluido lo que en SQLite hacen los índices y los triggers:
+    - índice único por nombre (diccionario nombre -> id) e ids que nunca se reutilizan (AUTOINCREMENT); los
+      nombres repetidos no consumen ids (SQL_INSERTAR_PRODUCTO).
+    - registro de movimientos (alta, ajuste y baja) y conjunto de productos con bajo stock según el umbral.
+    - listas ordenadas por columna para la paginación por clave; se arman al pedirlas y se descartan con cada cambio.
+La búsqueda de texto no usa FTS5: recorre los productos comparando prefijos de palabras (sin acentos) y ordena por
+una relevancia aproximada (coincidencias en el nombre, luego en la categoría y luego en la descripción).
+No admite SQL: las funciones que usan db_conexion() directamente (reportes, exportación, respaldo) fallan con
+sqlite3.NotSupportedError.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+import funcionesDataBase
+from funcionesProducto import COLUMNAS_PRODUCTOS, Producto, ProductoBatch, producto_desde_columnas
+
+# Posición de cada columna en las tuplas guardadas (mismo orden que COLUMNAS_PRODUCTOS).
+_POSICION = {columna: posicion for posicion, columna in enumerate(COLUMNAS_PRODUCTOS)}
+_CANTIDAD = _POSICION["cantidad"]
+_VERSION = _POSICION["version"]
+
+# Columnas obligatorias (NOT NULL en la tabla de SQLite).
+_COLUMNAS_OBLIGATORIAS = ("nombre", "categoria", "cantidad", "precio")
+
+# Peso de cada campo en la relevancia de la búsqueda (el mismo que usa bm25 en db_buscar_productos).
+_PESOS_BUSQUEDA = (10.0, 1.0, 5.0)
+
+# Almacenes abiertos, uno por ruta (DB_PATH hace de nombre, como en el backend "memoria").
+_almacenes = {}
+_almacenes_lock = threading.Lock()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def diccionario_almacen(ruta):
+    """
+    Retorna el almacén asociado a una ruta, creándolo vacío si todavía no existe.
+
+    Args:
+        ruta (str): Nombre del almacén (normalmente DB_PATH).
+
+    Returns:
+        AlmacenDiccionario: Almacén de la ruta.
+    """
+    almacen = _almacenes.get(ruta)
+    if almacen is None:
+        with _almacenes_lock:
+            almacen = _almacenes.setdefault(ruta, AlmacenDiccionario())
+    return almacen
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def diccionario_descartar(ruta=None):
+    """
+    Descarta el almacén de una ruta (o todos) con sus datos.
+
+    Args:
+        ruta (str): Almacén a descartar (None para descartar todos).
+    """
+    with _almacenes_lock:
+        if ruta is None:
+            _almacenes.clear()
+        else:
+            _almacenes.pop(ruta, None)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _diccionario_normalizar(texto):
+    """
+    Pasa un texto a minúsculas y le quita los acentos (como el tokenizador unicode61 remove_diacritics de FTS5).
+    """
+    descompuesto = unicodedata.normalize("NFD", (texto or "").lower())
+    return "".join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _diccionario_palabras(*textos):
+    """
+    Retorna, por cada texto, la tupla de sus palabras normalizadas.
+    """
+    return tuple(tuple(re.findall(r"\w+", _diccionario_normalizar(texto))) for texto in textos)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _diccionario_fecha():
+    """
+    Fecha y hora actual (UTC) con el formato que usa la tabla movimientos de SQLite.
+    """
+    ahora = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:", time.gmtime(ahora)) + f"{ahora % 60:06.3f}"
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class AlmacenDiccionario:
+    """
+    Inventario guardado en memoria, seguro para usar desde varios hilos (cada operación toma un único lock,
+    por lo que las escrituras son atómicas como una transacción).
+    Los productos se guardan como tuplas en el orden de COLUMNAS_PRODUCTOS y se entregan como Producto nuevos.
+    El precio se guarda como float, igual que la columna REAL de SQLite.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._filas = {}             # id -> tupla con los valores de COLUMNAS_PRODUCTOS.
+        self._por_nombre = {}        # nombre -> id.
+        self._palabras = {}          # id -> (palabras del nombre, de la descripción, de la categoría).
+        self._movimientos = {}       # id de producto -> lista de movimientos (tuplas como en SQLite).
+        self._ultimo_id = 0
+        self._ultimo_movimiento = 0
+        self._umbral = funcionesDataBase.DB_UMBRAL_BAJO_STOCK
+        self._bajo_stock = set()
+        # Listas ordenadas para paginar: orden -> (revision, [(valor, id), ...]). Los cambios de cantidad no
+        # alteran el orden por id, por eso se llevan dos revisiones.
+        self._ordenes = {}
+        self._revision_filas = 0
+        self._revision_valores = 0
+
+    #-----------------------------------------------------------------------------------------------------------------
+    def _registrar_movimiento(self, producto_id, tipo, variacion, cantidad):
+        """
+        Agrega un movimiento al historial del producto (lo que hacen los triggers movimientos_* en SQLite).
+        """
+        self._ultimo_movimiento += 1
+        self._movimientos.setdefault(producto_id, []).append(
+            (self._ultimo_movimiento, producto_id, tipo, variacion, cantidad, _diccionario_fecha())
+        )
+
+    def _guardar(self, fila, anterior=None):
+        """
+        Guarda una fila nueva o modificada y mantiene los índices, los movimientos y el bajo stock.
+        """
+        producto_id = fila[0]
+        cantidad = fila[_CANTIDAD]
+        self._filas[producto_id] = fila
+        self._revision_valores += 1
+        if anterior is None:
+            self._revision_filas += 1
+            self._por_nombre[fila[1]] = producto_id
+            self._registrar_movimiento(producto_id, "alta", cantidad, cantidad)
+        elif anterior[_CANTIDAD] != cantidad:
+            self._registrar_movimiento(producto_id, "ajuste", cantidad - anterior[_CANTIDAD], cantidad)
+        if anterior is None or anterior[1:4] != fila[1:4]:
+            self._palabras[producto_id] = _diccionario_palabras(fila[1], fila[2], fila[3])
+        if cantidad < self._umbral:
+            self._bajo_stock.add(producto_id)
+        else:
+            self._bajo_stock.discard(producto_id)
+
+    def _cambiar_cantidad(self, producto_id, cantidad):
+        """
+        Cambia la cantidad de un producto existente y aumenta su versión. Retorna la fila nueva.
+        """
+        anterior = self._filas[producto_id]
+        fila = anterior[:_CANTIDAD] + (cantidad, anterior[_CANTIDAD + 1], anterior[_VERSION] + 1)
+        self._guardar(fila, anterior)
+        return fila
+
+    def _validar(self, producto):
+        """
+        Lanza sqlite3.IntegrityError si falta una columna obligatoria (como la restricción NOT NULL).
+        """
+        for columna in _COLUMNAS_OBLIGATORIAS:
+            if producto.get(columna) is None:
+                raise sqlite3.IntegrityError(f"NOT NULL constraint failed: productos.{columna}")
+
+    def _claves_ordenadas(self, orden):
+        """
+        Retorna la lista de claves (valor de orden, id) ordenada, armándola solo si hubo cambios.
+        """
+        revision = self._revision_filas if orden == "id" else self._revision_valores
+        guardada = self._ordenes.get(orden)
+        if guardada is not None and guardada[0] == revision:
+            return guardada[1]
+        if orden == "id":
+            claves = [(producto_id, producto_id) for producto_id in self._filas]
+        else:
+            posicion = _POSICION[orden]
+            claves = sorted((fila[posicion], fila[0]) for fila in self._filas.values())
+        self._ordenes[orden] = (revision, claves)
+        return claves
+
+    #-----------------------------------------------------------------------------------------------------------------
+    def crear_tabla_productos(self):
+        """
+        No hay nada que crear: el almacén se inicializa vacío.
+        """
+
+    def cargar_filas(self, filas):
+        """
+        Agrega muchos productos de una vez, sin verificar nombres repetidos (equivale al INSERT por lotes que usa el
+        banco de pruebas).
+
+        Args:
+            filas (iterable): Tuplas (nombre, descripcion, categoria, cantidad, precio).
+
+        Returns:
+            int: Cantidad de productos agregados.
+        """
+        cantidad = 0
+        with self._lock:
+            for nombre, descripcion, categoria, stock, precio in filas:
+                self._ultimo_id += 1
+                self._guardar((self._ultimo_id, nombre, descripcion, categoria, stock, float(precio), 1))
+                cantidad += 1
+        return cantidad
+
+    def producto_existe(self, nombre):
+        return nombre in self._por_nombre
+
+    def insertar_producto(self, producto):
+        if isinstance(producto, Producto):
+            producto = producto.a_dict()
+        nombre = producto.get("nombre")
+        try:
+            self._validar(producto)
+        except sqlite3.IntegrityError as e:
+            error = funcionesDataBase.ErrorBaseDatos("insertar el producto", e)
+            if funcionesDataBase.DB_LANZAR_ERRORES:
+                raise error
+            return str(error)
+        with self._lock:
+            # Como SQL_INSERTAR_PRODUCTO, un nombre repetido no consume un id.
+            if nombre in self._por_nombre:
+                return f"Error: El producto '{nombre}' ya existe en la base de datos."
+            self._ultimo_id += 1
+            self._guardar((self._ultimo_id, nombre, producto.get("descripcion"), producto["categoria"],
+                           producto["cantidad"], float(producto["precio"]), 1))
+        return f"Producto '{nombre}' insertado correctamente."
+
+    def upsert_producto(self, producto):
+        if isinstance(producto, Producto):
+            producto = producto.a_dict()
+        try:
+            self._validar(producto)
+        except sqlite3.IntegrityError as e:
+            error = funcionesDataBase.ErrorBaseDatos("insertar o actualizar el producto", e)
+            if funcionesDataBase.DB_LANZAR_ERRORES:
+                raise error
+            print(error)
+            return None, None
+        nombre = producto["nombre"]
+        with self._lock:
+            producto_id = self._por_nombre.get(nombre)
+            if producto_id is None:
+                self._ultimo_id += 1
+                self._guardar((self._ultimo_id, nombre, producto.get("descripcion"), producto["categoria"],
+                               producto["cantidad"], float(producto["precio"]), 1))
+                return "insertado", self._ultimo_id
+            anterior = self._filas[producto_id]
+            self._guardar((producto_id, nombre, producto.get("descripcion"), producto["categoria"],
+                           producto["cantidad"], float(producto["precio"]), anterior[_VERSION] + 1), anterior)
+            return "actualizado", producto_id
+
+    def get_productos(self):
+        with self._lock:
+            return ProductoBatch(list(self._filas.values()))
+
+    def get_pagina_productos(self, tamanio_pagina=20, despues_de=None, antes_de=None, columnas=None, orden="id",
+                             descendente=False):
+        todas = not columnas
+        columnas = list(columnas or COLUMNAS_PRODUCTOS)
+        if orden not in funcionesDataBase.COLUMNAS_ORDEN_PRODUCTOS:
+            raise ValueError(f"No se puede ordenar por la columna '{orden}'.")
+        desconocidas = [columna for columna in columnas if columna not in COLUMNAS_PRODUCTOS]
+        if desconocidas:
+            raise ValueError(f"Columnas desconocidas: {', '.join(desconocidas)}")
+
+        # Mismo criterio que la consulta de SQLite: para retroceder se recorre en sentido inverso.
+        retroceder = despues_de is None and antes_de is not None
+        hacia_atras = descendente != retroceder
+        clave = despues_de if not retroceder else antes_de
+        with self._lock:
+            claves = self._claves_ordenadas(orden)
+            if hacia_atras:
+                fin = len(claves) if clave is None else bisect_left(claves, tuple(clave))
+                pagina = claves[max(0, fin - tamanio_pagina):fin][::-1]
+            else:
+                comienzo = 0 if clave is None else bisect_right(claves, tuple(clave))
+                pagina = claves[comienzo:comienzo + tamanio_pagina]
+            filas = [self._filas[producto_id] for _, producto_id in pagina]
+
+        if retroceder:
+            pagina.reverse()
+            filas.reverse()
+        if not filas:
+            return [], None, None
+        if todas:
+            productos = [Producto(*fila) for fila in filas]
+        else:
+            posiciones = [_POSICION[columna] for columna in columnas]
+            productos = [producto_desde_columnas(columnas, [fila[posicion] for posicion in posiciones])
+                         for fila in filas]
+        return productos, pagina[0], pagina[-1]
+
+    def get_producto_by_id(self, producto_id):
+        fila = self._filas.get(producto_id)
+        return Producto(*fila) if fila is not None else None
+
+    def buscar_productos(self, texto, limite=20):
+        palabras = re.findall(r"\w+", _diccionario_normalizar(texto))
+        if not palabras:
+            return []
+        resultados = []
+        with self._lock:
+            for producto_id, campos in self._palabras.items():
+                relevancia = 0.0
+                for palabra in palabras:
+                    coincidencias = [peso for peso, palabras_campo in zip(_PESOS_BUSQUEDA, campos)
+                                     if any(candidata.startswith(palabra) for candidata in palabras_campo)]
+                    if not coincidencias:
+                        break
+                    relevancia += sum(coincidencias)
+                else:
+                    resultados.append((-relevancia, producto_id))
+            resultados.sort()
+            return [Producto(*self._filas[producto_id]) for _, producto_id in resultados[:limite]]
+
+    def actualizar_producto(self, producto_id, nueva_cantidad):
+        with self._lock:
+            existe = producto_id in self._filas
+            if existe:
+                self._cambiar_cantidad(producto_id, nueva_cantidad)
+        if not existe:
+            print(f"No existe un producto con ID {producto_id}.")
+            return False
+        print(f"Producto con ID {producto_id} actualizado correctamente.")
+        return True
+
+    def actualizar_producto_version(self, producto_id, nueva_cantidad, version):
+        with self._lock:
+            fila = self._filas.get(producto_id)
+            if fila is None:
+                return "inexistente", None
+            if fila[_VERSION] != version:
+                return "conflicto", fila[_VERSION]
+            return "actualizado", self._cambiar_cantidad(producto_id, nueva_cantidad)[_VERSION]
+
+    def incrementar_cantidad(self, producto_id, variacion):
+        with self._lock:
+            fila = self._filas.get(producto_id)
+            if fila is None:
+                return "inexistente", None
+            if fila[_CANTIDAD] + variacion < 0:
+                return "insuficiente", fila[_CANTIDAD]
+            return "actualizado", self._cambiar_cantidad(producto_id, fila[_CANTIDAD] + variacion)[_CANTIDAD]
+
+    def ajustar_stock_lote(self, movimientos):
+        inicio = time.perf_counter()
+        variaciones = {}
+        cantidad_movimientos = 0
+        for producto_id, variacion in movimientos:
+            cantidad_movimientos += 1
+            variaciones[producto_id] = variaciones.get(producto_id, 0) + variacion
+        variaciones = {producto_id: variacion for producto_id, variacion in variaciones.items() if variacion}
+
+        resumen = {"aplicado": False, "movimientos": cantidad_movimientos, "productos": len(variaciones),
+                   "rechazados": []}
+        with self._lock:
+            for producto_id, variacion in variaciones.items():
+                fila = self._filas.get(producto_id)
+                if fila is None:
+                    resumen["rechazados"].append((producto_id, "el producto no existe"))
+                elif fila[_CANTIDAD] + variacion < 0:
+                    resumen["rechazados"].append(
+                        (producto_id, f"stock insuficiente (actual {fila[_CANTIDAD]}, variación {variacion})"))
+                if len(resumen["rechazados"]) >= 100:
+                    break
+            if not resumen["rechazados"]:
+                for producto_id, variacion in variaciones.items():
+                    self._cambiar_cantidad(producto_id, self._filas[producto_id][_CANTIDAD] + variacion)
+                resumen["aplicado"] = True
+        resumen["segundos"] = time.perf_counter() - inicio
+        resumen["movimientos_por_segundo"] = cantidad_movimientos / resumen["segundos"] if resumen["segundos"] else 0.0
+        return resumen
+
+    def eliminar_producto(self, producto_id):
+        with self._lock:
+            fila = self._filas.pop(producto_id, None)
+            if fila is not None:
+                del self._por_nombre[fila[1]]
+                del self._palabras[producto_id]
+                self._bajo_stock.discard(producto_id)
+                self._revision_filas += 1
+                self._revision_valores += 1
+                self._registrar_movimiento(producto_id, "baja", -fila[_CANTIDAD], 0)
+        if fila is None:
+            print(f"No existe un producto con ID {producto_id}.")
+            return False
+        print(f"Producto con ID {producto_id} eliminado correctamente.")
+        return True
+
+    def get_productos_by_condicion(self, minimo_stock):
+        with self._lock:
+            if minimo_stock == self._umbral:
+                return ProductoBatch([self._filas[producto_id] for producto_id in sorted(self._bajo_stock)])
+            return ProductoBatch([fila for fila in self._filas.values() if fila[_CANTIDAD] < minimo_stock])
+
+    def get_umbral_bajo_stock(self):
+        return self._umbral
+
+    def set_umbral_bajo_stock(self, umbral):
+        with self._lock:
+            self._umbral = umbral
+            self._bajo_stock = {producto_id for producto_id, fila in self._filas.items() if fila[_CANTIDAD] < umbral}
+        print(f"Umbral de bajo stock actualizado a {umbral}.")
+
+    def get_movimientos(self, producto_id, limite=50):
+        with self._lock:
+            return self._movimientos.get(producto_id, [])[-limite:][::-1] if limite > 0 else []
@@ -0,0 +1,313 @@
+"""
+Módulo: funcionesExportacion.py
+Descripción: Este módulo exporta la tabla 'productos' a archivos para análisis (por ejemplo, una copia nocturna).
+Los productos se leen con una única consulta recorrida de a bloques (fetchmany), por lo que la memoria utilizada no
+depende del tamaño de la tabla y el archivo refleja un estado consistente de la base aunque haya escrituras en curso.
+
+Formatos:
+    - csv:      texto separado por comas, con encabezado.
+    - jsonl:    un objeto JSON por línea.
+    - columnar: formato binario propio por columnas (ver exportar_escribir_columnar / exportar_leer_columnar).
+    - parquet:  solo si está instalada la librería opcional pyarrow.
+Agregando .gz, .bz2 o .xz al nombre del archivo la salida se comprime (excepto parquet, que comprime internamente).
+
+Uso:
+    python funcionesExportacion.py productos.csv.gz --categoria Bebidas --menor-a 10
+"""
+
+import argparse
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import sqlite3
+import struct
+import time
+from array import array
+
+from funcionesDataBase import SQL_COLUMNAS_PRODUCTOS, db_conexion
+from funcionesMetricas import metricas_medir
+from funcionesProducto import COLUMNAS_PRODUCTOS
+
+# Filas que se leen de la base en cada bloque.
+EXPORTACION_TAMANIO_BLOQUE = 10000
+
+# Formato columnar: firma, versión y tipo de cada columna ("i" entero, "f" real, "s" texto).
+COLUMNAR_FIRMA = b"INVCOL01"
+COLUMNAR_TIPOS = {"id": "i", "nombre": "s", "descripcion": "s", "categoria": "s", "cantidad": "i", "precio": "f",
+                  "version": "i"}
+
+_COMPRESORES = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def exportar_detectar_formato(ruta):
+    """
+    Determina el formato y la compresión a partir del nombre del archivo.
+
+    Args:
+        ruta (str): Ruta del archivo (por ejemplo "productos.jsonl.gz").
+
+    Returns:
+        tuple: (formato, compresion). formato es "csv", "jsonl", "columnar" o "parquet";
+               compresion es ".gz", ".bz2", ".xz" o None.
+    """
+    base, extension = os.path.splitext(ruta.lower())
+    compresion = None
+    if extension in _COMPRESORES:
+        compresion = extension
+        base, extension = os.path.splitext(base)
+    formatos = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".ndjson": "jsonl",
+                ".icol": "columnar", ".parquet": "parquet"}
+    return formatos.get(extension, "csv"), compresion
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def exportar_iter_bloques(categoria=None, cantidad_menor_a=None, tamanio_bloque=EXPORTACION_TAMANIO_BLOQUE):
+    """
+    Generador que recorre los productos (ordenados por id) en bloques de filas.
+
+    Args:
+        categoria (str): Si se indica, solo se exportan productos de esa categoría.
+        cantidad_menor_a (int): Si se indica, solo se exportan productos con cantidad menor a ese valor.
+        tamanio_bloque (int): Filas por bloque.
+
+    Yields:
+        list: Lista de tuplas en el orden de COLUMNAS_PRODUCTOS.
+    """
+    condiciones = []
+    parametros = []
+    if categoria is not None:
+        condiciones.append("categoria = ?")
+        parametros.append(categoria)
+    if cantidad_menor_a is not None:
+        condiciones.append("cantidad < ?")
+        parametros.append(cantidad_menor_a)
+    query = f"SELECT {SQL_COLUMNAS_PRODUCTOS} FROM productos"
+    if condiciones:
+        query += " WHERE " + " AND ".join(condiciones)
+    query += " ORDER BY id"
+
+    with db_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.arraysize = tamanio_bloque
+        cursor.execute(query, parametros)
+        while True:
+            bloque = cursor.fetchmany()
+            if not bloque:
+                return
+            yield bloque
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _exportar_abrir(ruta, compresion, binario):
+    """
+    Abre el archivo de destino, comprimido si corresponde.
+    """
+    abrir = _COMPRESORES.get(compresion)
+    if binario:
+        return abrir(ruta, "wb") if abrir else open(ruta, "wb")
+    if abrir:
+        return abrir(ruta, "wt", encoding="utf-8", newline="")
+    return open(ruta, "w", encoding="utf-8", newline="")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def exportar_escribir_csv(archivo, bloques):
+    """
+    Escribe los bloques de productos en formato CSV con encabezado.
+
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    escritor = csv.writer(archivo)
+    escritor.writerow(COLUMNAS_PRODUCTOS)
+    filas = 0
+    for bloque in bloques:
+        escritor.writerows(bloque)
+        filas += len(bloque)
+    return filas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def exportar_escribir_jsonl(archivo, bloques):
+    """
+    Escribe los bloques de productos en formato JSON Lines.
+
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    filas = 0
+    for bloque in bloques:
+        archivo.write("".join(
+            json.dumps(dict(zip(COLUMNAS_PRODUCTOS, fila)), ensure_ascii=False) + "\n" for fila in bloque
+        ))
+        filas += len(bloque)
+    return filas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def exportar_escribir_columnar(archivo, bloques):
+    """
+    Escribe los bloques de productos en el formato binario columnar.
+
+    Estructura (enteros little-endian):
+        - firma COLUMNAR_FIRMA (8 bytes) y largo + JSON con el esquema {"columnas": [[nombre, tipo], ...]}.
+        - por cada bloque: cantidad de filas (uint32) y luego cada columna:
+            "i": filas enteros int64 (None se guarda como el mínimo int64).
+            "f": filas reales float64 (None se guarda como NaN).
+            "s": filas + 1 offsets int64 seguidos de los textos UTF-8 concatenados (None se guarda como "").
+        - un bloque con 0 filas marca el final del archivo.
+
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    esquema = json.dumps({"columnas": [[c, COLUMNAR_TIPOS[c]] for c in COLUMNAS_PRODUCTOS]}).encode("utf-8")
+    archivo.write(COLUMNAR_FIRMA + struct.pack("<I", len(esquema)) + esquema)
+    nulo_entero = -2 ** 63
+    filas = 0
+    for bloque in bloques:
+        archivo.write(struct.pack("<I", len(bloque)))
+        for indice, columna in enumerate(zip(*bloque)):
+            tipo = COLUMNAR_TIPOS[COLUMNAS_PRODUCTOS[indice]]
+            if tipo == "i":
+                archivo.write(array("q", (nulo_entero if v is None else v for v in columna)).tobytes())
+            elif tipo == "f":
+                archivo.write(array("d", (float("nan") if v is None else v for v in columna)).tobytes())
+            else:
+                textos = [("" if v is None else v).encode("utf-8") for v in columna]
+                offsets = array("q", [0])
+                for texto in textos:
+                    offsets.append(offsets[-1] + len(texto))
+                archivo.write(offsets.tobytes())
+                archivo.write(b"".join(textos))
+        filas += len(bloque)
+    archivo.write(struct.pack("<I", 0))
+    return filas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def exportar_leer_columnar(ruta):
+    """
+    Generador que lee un archivo en formato columnar (comprimido o no), de a un bloque por vez.
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Yields:
+        dict: {columna: lista de valores} para cada bloque.
+    """
+    _, compresion = exportar_detectar_formato(ruta)
+    abrir = _COMPRESORES.get(compresion, open)
+    with abrir(ruta, "rb") as archivo:
+        if archivo.read(len(COLUMNAR_FIRMA)) != COLUMNAR_FIRMA:
+            raise ValueError("El archivo no tiene formato columnar de inventario.")
+        largo = struct.unpack("<I", archivo.read(4))[0]
+        columnas = json.loads(archivo.read(largo))["columnas"]
+        while True:
+            filas = struct.unpack("<I", archivo.read(4))[0]
+            if filas == 0:
+                return
+            bloque = {}
+            for nombre, tipo in columnas:
+                if tipo in ("i", "f"):
+                    valores = array("q" if tipo == "i" else "d")
+                    valores.frombytes(archivo.read(8 * filas))
+                    bloque[nombre] = valores.tolist()
+                else:
+                    offsets = array("q")
+                    offsets.frombytes(archivo.read(8 * (filas + 1)))
+                    datos = archivo.read(offsets[-1])
+                    bloque[nombre] = [datos[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(filas)]
+            yield bloque
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _exportar_escribir_parquet(ruta, bloques):
+    """
+    Escribe los bloques en formato Parquet usando la librería opcional pyarrow (un row group por bloque).
+
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("El formato parquet requiere la librería 'pyarrow' (pip install pyarrow). "
+                           "Use el formato columnar (.icol) como alternativa sin dependencias.")
+    esquema = pa.schema([("id", pa.int64()), ("nombre", pa.string()), ("descripcion", pa.string()),
+                         ("categoria", pa.string()), ("cantidad", pa.int64()), ("precio", pa.float64()),
+                         ("version", pa.int64())])
+    filas = 0
+    with pq.ParquetWriter(ruta, esquema, compression="zstd") as escritor:
+        for bloque in bloques:
+            columnas = [list(columna) for columna in zip(*bloque)]
+            escritor.write_table(pa.Table.from_arrays(columnas, schema=esquema))
+            filas += len(bloque)
+    return filas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir(filas=lambda resumen: resumen["filas"])
+def exportar_productos(ruta, formato=None, categoria=None, cantidad_menor_a=None,
+                       tamanio_bloque=EXPORTACION_TAMANIO_BLOQUE):
+    """
+    Exporta los productos a un archivo.
+
+    Args:
+        ruta (str): Archivo de destino. La extensión define el formato y la compresión si no se indica formato.
+        formato (str): "csv", "jsonl", "columnar" o "parquet" (por defecto, según la extensión).
+        categoria (str): Filtra por categoría.
+        cantidad_menor_a (int): Filtra los productos con cantidad menor a ese valor.
+        tamanio_bloque (int): Filas leídas por bloque.
+
+    Returns:
+        dict: Resumen con las claves filas, bytes, segundos y filas_por_segundo.
+    """
+    formato_detectado, compresion = exportar_detectar_formato(ruta)
+    formato = formato or formato_detectado
+    inicio = time.perf_counter()
+    bloques = exportar_iter_bloques(categoria, cantidad_menor_a, tamanio_bloque)
+
+    if formato == "parquet":
+        filas = _exportar_escribir_parquet(ruta, bloques)
+    else:
+        escritores = {"csv": exportar_escribir_csv, "jsonl": exportar_escribir_jsonl,
+                      "columnar": exportar_escribir_columnar}
+        if formato not in escritores:
+            raise ValueError(f"Formato de exportación desconocido: '{formato}'")
+        with _exportar_abrir(ruta, compresion, binario=formato == "columnar") as archivo:
+            filas = escritores[formato](archivo, bloques)
+
+    segundos = time.perf_counter() - inicio
+    return {"filas": filas, "bytes": os.path.getsize(ruta), "segundos": segundos,
+            "filas_por_segundo": filas / segundos if segundos else 0.0}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para exportar desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Exporta los productos a CSV, JSON Lines o formato columnar.")
+    parser.add_argument("archivo", help="Archivo de destino (.csv, .jsonl, .icol, .parquet; opcional .gz/.bz2/.xz).")
+    parser.add_argument("--formato", choices=["csv", "jsonl", "columnar", "parquet"])
+    parser.add_argument("--categoria", help="Exportar solo esta categoría.")
+    parser.add_argument("--menor-a", type=int, dest="menor_a", help="Exportar solo productos con cantidad menor a N.")
+    args = parser.parse_args()
+
+    try:
+        resumen = exportar_productos(args.archivo, args.formato, args.categoria, args.menor_a)
+    except (OSError, RuntimeError, ValueError, sqlite3.Error) as e:
+        print(f"Error al exportar: {e}")
+        return 1
+    print(f"Se exportaron {resumen['filas']} productos a '{args.archivo}' ({resumen['bytes']} bytes) "
+          f"en {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,316 @@
+"""
+Módulo: funcionesImportacion.py
+Descripción: Este módulo permite cargar productos en forma masiva desde archivos CSV o JSON Lines.
+Los archivos se leen de a una fila por vez (sin cargarlos completos en memoria), cada bloque de filas se valida por
+columnas con los validadores de funcionesValidacion y los nombres repetidos se descartan contra la base de datos
+en una sola pasada.
+Las inserciones se agrupan en lotes que se confirman en una única transacción con executemany.
+Además permite aplicar archivos de movimientos de stock (columnas producto_id y variacion) en una sola transacción.
+También puede ejecutarse directamente desde la terminal:
+
+    python funcionesImportacion.py catalogo.csv --lote 5000 --rechazos rechazos.csv
+    python funcionesImportacion.py movimientos.csv --movimientos
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+
+from funcionesDataBase import (SQL_INSERTAR_PRODUCTO, db_ajustar_stock_lote, db_cache_limpiar, db_conexion,
+                               db_crear_tabla_productos)
+from funcionesValidacion import validacion_columnas_productos, validacion_error_fila, validacion_registros_a_columnas
+
+# Cantidad de filas que se insertan por transacción.
+IMPORTACION_TAMANIO_LOTE = 5000
+
+# Cantidad máxima de filas rechazadas que se conservan en el resumen (el resto solo se cuenta).
+IMPORTACION_MAX_RECHAZOS_RESUMEN = 100
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def importar_detectar_formato(ruta):
+    """
+    Determina el formato del archivo a partir de su extensión.
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Returns:
+        str: "csv" o "jsonl".
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return "csv"
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def importar_leer_registros(ruta, formato=None):
+    """
+    Generador que lee el archivo de a una fila por vez.
+
+    Args:
+        ruta (str): Ruta del archivo CSV (con encabezado) o JSON Lines (un objeto por línea).
+        formato (str): "csv" o "jsonl". Si es None se deduce de la extensión.
+
+    Yields:
+        tuple: (numero_linea, registro, error). registro es un diccionario o None si la línea no se pudo leer.
+
+    Raises:
+        OSError: Si el archivo no se puede abrir o no está codificado en UTF-8.
+    """
+    formato = formato or importar_detectar_formato(ruta)
+    try:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            if formato == "csv":
+                lector = csv.DictReader(archivo)
+                for registro in lector:
+                    yield lector.line_num, registro, None
+            else:
+                for numero_linea, linea in enumerate(archivo, start=1):
+                    linea = linea.strip()
+                    if not linea:
+                        continue
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError as e:
+                        yield numero_linea, None, f"JSON no válido: {e.msg}"
+                        continue
+                    if not isinstance(registro, dict):
+                        yield numero_linea, None, "se esperaba un objeto JSON"
+                        continue
+                    yield numero_linea, registro, None
+    except UnicodeDecodeError as e:
+        # Es un ValueError, pero se trata como los demás errores de lectura del archivo.
+        raise OSError(f"el archivo '{ruta}' no está codificado en UTF-8 (byte {e.start}: {e.reason})") from e
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def importar_productos(ruta, formato=None, tamanio_lote=IMPORTACION_TAMANIO_LOTE, ruta_rechazos=None):
+    """
+    Importa productos desde un archivo CSV o JSON Lines.
+
+    1. Carga en un conjunto los nombres ya registrados (una sola consulta).
+    2. Lee el archivo fila por fila y valida cada bloque de tamanio_lote filas por columnas.
+    3. Descarta los nombres que ya existen en la base o que se repiten dentro del archivo.
+    4. Inserta los registros válidos en lotes, con una transacción por lote.
+
+    Args:
+        ruta (str): Ruta del archivo a importar.
+        formato (str): "csv" o "jsonl". Si es None se deduce de la extensión.
+        tamanio_lote (int): Cantidad de filas por transacción.
+        ruta_rechazos (str): Si se indica, se escribe un CSV con todas las filas rechazadas y el motivo.
+
+    Returns:
+        dict: Resumen con las claves leidos, insertados, rechazados, segundos, filas_por_segundo
+              y detalle_rechazos (lista de tuplas (linea, motivo), limitada a IMPORTACION_MAX_RECHAZOS_RESUMEN).
+
+    Raises:
+        OSError: Si el archivo no se puede leer. Los lotes ya insertados se conservan.
+    """
+    inicio = time.perf_counter()
+    resumen = {"leidos": 0, "insertados": 0, "rechazados": 0, "detalle_rechazos": []}
+    archivo_rechazos = None
+    escritor_rechazos = None
+
+    def rechazar(numero_linea, motivo):
+        resumen["rechazados"] += 1
+        if len(resumen["detalle_rechazos"]) < IMPORTACION_MAX_RECHAZOS_RESUMEN:
+            resumen["detalle_rechazos"].append((numero_linea, motivo))
+        if escritor_rechazos:
+            escritor_rechazos.writerow([numero_linea, motivo])
+
+    try:
+        if ruta_rechazos:
+            archivo_rechazos = open(ruta_rechazos, "w", newline="", encoding="utf-8")
+            escritor_rechazos = csv.writer(archivo_rechazos)
+            escritor_rechazos.writerow(["linea", "motivo"])
+
+        with db_conexion() as conexion:
+            nombres = {fila[0] for fila in conexion.execute("SELECT nombre FROM productos")}
+            bloque = []
+
+            for leido in importar_leer_registros(ruta, formato):
+                resumen["leidos"] += 1
+                bloque.append(leido)
+                if len(bloque) >= tamanio_lote:
+                    lote = _importar_validar_bloque(bloque, nombres, rechazar)
+                    resumen["insertados"] += _importar_insertar_lote(conexion, lote)
+                    bloque = []
+
+            if bloque:
+                lote = _importar_validar_bloque(bloque, nombres, rechazar)
+                resumen["insertados"] += _importar_insertar_lote(conexion, lote)
+    finally:
+        # Los nombres importados pudieron quedar en caché como inexistentes.
+        db_cache_limpiar()
+        if archivo_rechazos:
+            archivo_rechazos.close()
+
+    resumen["segundos"] = time.perf_counter() - inicio
+    resumen["filas_por_segundo"] = resumen["leidos"] / resumen["segundos"] if resumen["segundos"] else 0.0
+    return resumen
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _importar_validar_bloque(bloque, nombres, rechazar):
+    """
+    Valida por columnas un bloque de filas leídas y descarta los nombres repetidos, respetando el orden del archivo.
+
+    Args:
+        bloque (list): Tuplas (numero_linea, registro, error) retornadas por importar_leer_registros().
+        nombres (set): Nombres ya registrados o importados; se agregan los del bloque.
+        rechazar (callable): Función que recibe (numero_linea, motivo) para cada fila descartada.
+
+    Returns:
+        list: Tuplas (nombre, descripcion, categoria, cantidad, precio) listas para insertar.
+    """
+    lote = []
+    columnas = validacion_registros_a_columnas([registro or {} for _, registro, _ in bloque])
+    resultado = validacion_columnas_productos(columnas)
+    filas = zip(resultado["nombre"], resultado["descripcion"], resultado["categoria"],
+                resultado["cantidad"], resultado["precio"])
+    for indice, ((numero_linea, _, error), fila) in enumerate(zip(bloque, filas)):
+        if error is None and resultado["invalidos"][indice]:
+            error = validacion_error_fila(columnas, resultado, indice)
+        if error is not None:
+            rechazar(numero_linea, error)
+            continue
+        if fila[0] in nombres:
+            rechazar(numero_linea, f"nombre duplicado: '{fila[0]}'")
+            continue
+        nombres.add(fila[0])
+        lote.append(fila)
+    return lote
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _importar_insertar_lote(conexion, lote):
+    """
+    Inserta un lote de productos ya validados en una única transacción. Los nombres que otro proceso haya
+    registrado mientras tanto se omiten sin consumir ids (ver SQL_INSERTAR_PRODUCTO).
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a utilizar.
+        lote (list): Lista de tuplas (nombre, descripcion, categoria, cantidad, precio).
+
+    Returns:
+        int: Cantidad de filas insertadas.
+    """
+    with conexion:
+        cursor = conexion.executemany(SQL_INSERTAR_PRODUCTO, lote)
+    return cursor.rowcount
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def importar_mostrar_resumen(resumen):
+    """
+    Muestra en consola el resumen de una importación.
+
+    Args:
+        resumen (dict): Resumen retornado por importar_productos().
+    """
+    print(f"Filas leídas: {resumen['leidos']}")
+    print(f"Productos insertados: {resumen['insertados']}")
+    print(f"Filas rechazadas: {resumen['rechazados']}")
+    for numero_linea, motivo in resumen["detalle_rechazos"]:
+        print(f"  línea {numero_linea}: {motivo}")
+    if resumen["rechazados"] > len(resumen["detalle_rechazos"]):
+        print(f"  ... y {resumen['rechazados'] - len(resumen['detalle_rechazos'])} rechazos más.")
+    print(f"Tiempo: {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s)")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def importar_movimientos(ruta, formato=None):
+    """
+    Aplica un archivo de movimientos de stock (CSV o JSON Lines con los campos producto_id y variacion,
+    donde variacion es un entero positivo para ingresos o negativo para egresos).
+
+    El archivo se aplica completo o no se aplica: si alguna línea es inválida, algún producto no existe
+    o algún stock quedaría negativo, no se modifica ningún producto.
+
+    Args:
+        ruta (str): Ruta del archivo de movimientos.
+        formato (str): "csv" o "jsonl". Si es None se deduce de la extensión.
+
+    Returns:
+        dict: Resumen retornado por db_ajustar_stock_lote(), con la clave adicional errores_lectura
+              (lista de tuplas (linea, motivo)). Si hubo errores de lectura, aplicado es False.
+    """
+    inicio = time.perf_counter()
+    movimientos = []
+    errores = []
+    for numero_linea, registro, error in importar_leer_registros(ruta, formato):
+        if error is None:
+            try:
+                movimientos.append((int(registro.get("producto_id")), int(registro.get("variacion"))))
+                continue
+            except (TypeError, ValueError):
+                error = "producto_id y variacion deben ser números enteros"
+        if len(errores) < IMPORTACION_MAX_RECHAZOS_RESUMEN:
+            errores.append((numero_linea, error))
+
+    if errores:
+        segundos = time.perf_counter() - inicio
+        return {"aplicado": False, "movimientos": len(movimientos), "productos": 0, "rechazados": [],
+                "errores_lectura": errores, "segundos": segundos, "movimientos_por_segundo": 0.0}
+
+    resumen = db_ajustar_stock_lote(movimientos)
+    resumen["errores_lectura"] = []
+    resumen["segundos"] = time.perf_counter() - inicio
+    resumen["movimientos_por_segundo"] = resumen["movimientos"] / resumen["segundos"] if resumen["segundos"] else 0.0
+    return resumen
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def importar_mostrar_resumen_movimientos(resumen):
+    """
+    Muestra en consola el resumen de la aplicación de un archivo de movimientos.
+
+    Args:
+        resumen (dict): Resumen retornado por importar_movimientos().
+    """
+    for numero_linea, motivo in resumen["errores_lectura"]:
+        print(f"  línea {numero_linea}: {motivo}")
+    for producto_id, motivo in resumen["rechazados"]:
+        print(f"  producto {producto_id}: {motivo}")
+    if resumen["aplicado"]:
+        print(f"Movimientos aplicados: {resumen['movimientos']} sobre {resumen['productos']} productos.")
+    else:
+        print("El archivo no se aplicó: no se modificó ningún producto.")
+    print(f"Tiempo: {resumen['segundos']:.2f} s ({resumen['movimientos_por_segundo']:.0f} movimientos/s)")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para importar desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Importa productos desde un archivo CSV o JSON Lines.")
+    parser.add_argument("archivo", help="Ruta del archivo a importar.")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="Formato del archivo (por defecto según la extensión).")
+    parser.add_argument("--lote", type=int, default=IMPORTACION_TAMANIO_LOTE, help="Filas por transacción.")
+    parser.add_argument("--rechazos", help="Archivo CSV donde guardar las filas rechazadas.")
+    parser.add_argument("--movimientos", action="store_true",
+                        help="El archivo contiene movimientos de stock (producto_id, variacion).")
+    args = parser.parse_args()
+
+    db_crear_tabla_productos()
+    try:
+        if args.movimientos:
+            resumen = importar_movimientos(args.archivo, args.formato)
+            importar_mostrar_resumen_movimientos(resumen)
+            return 0 if resumen["aplicado"] else 1
+        resumen = importar_productos(args.archivo, args.formato, args.lote, args.rechazos)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error al importar: {e}")
+        return 1
+    importar_mostrar_resumen(resumen)
+    return 1 if resumen["rechazados"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,10 +5,23 @@ Gestiona la visualización de opciones y la ejecución de las tareas relacionada
 Cada opción del menú se vincula con una función que interactúa con la base de datos para manipular los productos.
 """
 
+import os
+
 from funcionesDataBase import *
 from funcionesValidacion import *
+from funcionesImportacion import (importar_productos, importar_mostrar_resumen, importar_movimientos,
+                                  importar_mostrar_resumen_movimientos)
+from funcionesMetricas import (metricas_activar, metricas_activas, metricas_desactivar, metricas_guardar,
+                               metricas_mostrar_reporte, metricas_reiniciar)
+from funcionesReportes import (reporte_valor_por_categoria, reporte_top_productos_por_valor,
+                               reporte_bajo_stock_por_categoria)
+from funcionesRespaldo import respaldo_crear, respaldo_mostrar_resumen, respaldo_restaurar
+from funcionesPronostico import PRONOSTICO_DIAS, pronostico_mostrar_reporte, pronostico_productos_a_agotarse
 from colorama import Fore
 
+# Cantidad de productos que se muestran por página.
+MENU_TAMANIO_PAGINA = 20
+
 #---------------------------------------------------------------------------------------------------------------------
 def menu_mostrar_opciones():
     """
@@ -27,6 +40,13 @@ def menu_mostrar_opciones():
            5. Buscar producto.
            6. Reporte de bajo stock.
            7. Salir.
+           8. Importar productos desde archivo (CSV / JSON Lines).
+           9. Buscar productos por nombre, descripción o categoría.
+           10. Aplicar archivo de movimientos de stock.
+           11. Reportes de valorización por categoría.
+           12. Métricas de rendimiento.
+           13. Respaldar / restaurar la base de datos.
+           14. Pronóstico de reposición (productos que se agotarían según su consumo).
        """)
     opcion = input(Fore.MAGENTA + "Seleccion una opción: ")
     #Agregar un modulo de validacion para evitar errores - PENDIENTE
@@ -72,16 +92,38 @@ def menu_mostrar_productos():
     """
     menu_mostrar_productos()
     1. no recibe ningún argumento
-    2. llama a db_get_productos() que retorna una lista de tuplas con el contenido de la tabla
-    3. usamos un bucle for para mostrar en consola
+    2. llama a db_get_pagina_productos() que retorna una página de tuplas con el contenido de la tabla
+    3. usamos un bucle for para mostrar la página en consola
+    4. el usuario puede avanzar o retroceder de página; solo se mantiene en memoria la página actual
     """
-    lista_productos = db_get_productos()
+    lista_productos, primera_clave, ultima_clave = db_get_pagina_productos(MENU_TAMANIO_PAGINA)
 
-    if lista_productos:
+    if not lista_productos:
+        print(Fore.RED + "No hay productos que mostrar")
+        return
+
+    pagina = 1
+    while True:
+        print(Fore.CYAN + f"\n--- Página {pagina} ---")
         for producto in lista_productos:
             print(producto)
-    else:
-        print(Fore.RED + "No hay productos que mostrar")
+
+        opcion = input(Fore.MAGENTA + "\nIngrese 's' para la página siguiente, 'a' para la anterior "
+                                      "o cualquier otra tecla para volver: ").lower()
+        if opcion == "s":
+            resultado = db_get_pagina_productos(MENU_TAMANIO_PAGINA, despues_de=ultima_clave)
+            desplazamiento = 1
+        elif opcion == "a":
+            resultado = db_get_pagina_productos(MENU_TAMANIO_PAGINA, antes_de=primera_clave)
+            desplazamiento = -1
+        else:
+            break
+
+        if not resultado[0]:
+            print(Fore.RED + "No hay más páginas en esa dirección.")
+            continue
+        lista_productos, primera_clave, ultima_clave = resultado
+        pagina += desplazamiento
 
 
 #---------------------------------------------------------------------------------------------------------------------
@@ -91,17 +133,31 @@ def menu_actualizar_producto():
     1. solicita al usuario que ingrese el id del producto a modificar
     2. buscamos el producto en la tabla (si no existe informamos)
     3. mostramos cantidad actual y pedimos que ingrese la nueva cantidad
-    4. llamar a db_actualizar_registro(id, nueva_cantidad)
+    4. llamar a db_actualizar_producto_version(id, nueva_cantidad, version): si otro usuario modificó el producto
+       mientras tanto, no se pisa su cambio; se muestra la cantidad actualizada y se vuelve a pedir la nueva cantidad
     """
     producto_id = int(input(Fore.MAGENTA + "\nIngrese el id del producto a actualizar: "))
     get_producto = db_get_producto_by_id(producto_id)
     if not get_producto:
-        print(Fore.RED + "ERROR: no se ha encontrado ningún producto con el id {id}")
-    else:
-        print(Fore.YELLOW + f"Cantidad actual {get_producto[4]} ")
+        print(Fore.RED + f"ERROR: no se ha encontrado ningún producto con el id {producto_id}")
+        return
+    version = get_producto.version
+    print(Fore.YELLOW + f"Cantidad actual {get_producto.cantidad} ")
+    while True:
         nueva_cantidad = validacion_get_cantidad("Nueva cantidad: ")
-        db_actualizar_producto(producto_id, nueva_cantidad)
+        resultado, version = db_actualizar_producto_version(producto_id, nueva_cantidad, version)
+        if resultado != "conflicto":
+            break
+        # Se reintenta con la versión que informó el conflicto; la relectura solo muestra la cantidad actual.
+        get_producto = db_get_producto_by_id(producto_id)
+        if get_producto is None:
+            resultado = "inexistente"
+            break
+        print(Fore.RED + f"El producto fue modificado por otro usuario. Cantidad actual {get_producto.cantidad} ")
+    if resultado == "actualizado":
         print(Fore.GREEN + "Registro actualizado exitosamente!")
+    elif resultado == "inexistente":
+        print(Fore.RED + f"ERROR: el producto con id {producto_id} fue eliminado")
 
 
 #---------------------------------------------------------------------------------------------------------------------
@@ -148,13 +204,182 @@ def menu_buscar_producto():
 def menu_reporte_bajo_stock():
     """
     menu_reporte_bajo_stock()
-    1. solicita al usuario que ingrese la cantidad mínima para el reporte
+    1. solicita al usuario que ingrese la cantidad mínima para el reporte (Enter usa el umbral configurado,
+       que se responde desde el reporte precalculado)
     2. llamar a db_get_productos_by_condicion(condicion) que retorna una lista_productos
     """
-    minimo_stock = int(input(Fore.MAGENTA + "\nIngrese el unmbral de mínimo stock: "))
+    umbral = db_get_umbral_bajo_stock()
+    entrada = input(Fore.MAGENTA + f"\nIngrese el umbral de mínimo stock (Enter para usar {umbral}): ").strip()
+    minimo_stock = int(entrada) if entrada else umbral
     lista_productos = db_get_productos_by_condicion(minimo_stock)
     if not lista_productos:
-        print(Fore.RED + "No se ha encontrado ningún producto con stock menor a {minimo_stock}")
+        print(Fore.RED + f"No se ha encontrado ningún producto con stock menor a {minimo_stock}")
+    else:
+        for producto in lista_productos:
+            print(Fore.YELLOW + str(producto))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_importar_productos():
+    """
+    menu_importar_productos()
+    1. solicita al usuario la ruta del archivo CSV o JSON Lines
+    2. llama a importar_productos(ruta) que valida e inserta los productos en lotes
+    3. muestra el resumen: filas insertadas, rechazadas y filas por segundo
+    """
+    ruta = input(Fore.MAGENTA + "\nIngrese la ruta del archivo a importar: ").strip()
+    if not os.path.isfile(ruta):
+        print(Fore.RED + f"ERROR: no se encontró el archivo '{ruta}'")
+        return
+    try:
+        resumen = importar_productos(ruta)
+    except OSError as e:
+        print(Fore.RED + f"ERROR: {e}")
+        return
+    print(Fore.GREEN + "\nImportación finalizada")
+    importar_mostrar_resumen(resumen)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_buscar_productos_texto():
+    """
+    menu_buscar_productos_texto()
+    1. solicita al usuario una o más palabras a buscar
+    2. llamar a db_buscar_productos(texto) que busca en nombre, descripción y categoría
+    3. muestra los resultados ordenados por relevancia
+    """
+    texto = input(Fore.MAGENTA + "\nIngrese el texto a buscar: ").strip()
+    lista_productos = db_buscar_productos(texto, MENU_TAMANIO_PAGINA)
+    if not lista_productos:
+        print(Fore.RED + f"No se ha encontrado ningún producto que coincida con '{texto}'")
     else:
         for producto in lista_productos:
-            print(Fore.YELLOW + str(producto))
\ No newline at end of file
+            print(Fore.GREEN + str(producto))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_aplicar_movimientos():
+    """
+    menu_aplicar_movimientos()
+    1. solicita al usuario la ruta del archivo de movimientos (producto_id, variacion)
+    2. llama a importar_movimientos(ruta) que aplica todo el archivo en una sola transacción
+    3. muestra el resumen y el rendimiento (movimientos por segundo)
+    """
+    ruta = input(Fore.MAGENTA + "\nIngrese la ruta del archivo de movimientos: ").strip()
+    if not os.path.isfile(ruta):
+        print(Fore.RED + f"ERROR: no se encontró el archivo '{ruta}'")
+        return
+    try:
+        resumen = importar_movimientos(ruta)
+    except OSError as e:
+        print(Fore.RED + f"ERROR: {e}")
+        return
+    color = Fore.GREEN if resumen["aplicado"] else Fore.RED
+    print(color + "\nResultado de la aplicación de movimientos")
+    importar_mostrar_resumen_movimientos(resumen)
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_reportes_valorizacion():
+    """
+    menu_reportes_valorizacion()
+    1. muestra el valor del stock (cantidad * precio) de cada categoría y el total
+    2. muestra los productos con mayor valor de stock
+    3. muestra la cantidad de productos con bajo stock (umbral configurado) por categoría
+    """
+    print(Fore.CYAN + "\nValor del stock por categoría")
+    total = 0
+    for fila in reporte_valor_por_categoria():
+        total += fila["valor"]
+        print(Fore.YELLOW + f"{fila['categoria']:<25} {fila['productos']:>8} productos {fila['unidades']:>10} unidades "
+                            f"$ {fila['valor']:>15,.2f}")
+    print(Fore.GREEN + f"{'Total':<56} $ {total:>15,.2f}")
+
+    print(Fore.CYAN + "\nProductos con mayor valor de stock")
+    for producto, valor in reporte_top_productos_por_valor(MENU_TAMANIO_PAGINA // 2):
+        print(Fore.YELLOW + f"{producto.id:>8} {producto.nombre:<30} {producto.cantidad:>8} x {producto.precio:>10,.2f} "
+                            f"= $ {valor:>14,.2f}")
+
+    print(Fore.CYAN + f"\nProductos con bajo stock (menos de {db_get_umbral_bajo_stock()}) por categoría")
+    filas = reporte_bajo_stock_por_categoria()
+    if not filas:
+        print(Fore.GREEN + "No hay productos con bajo stock.")
+    for fila in filas:
+        print(Fore.YELLOW + f"{fila['categoria']:<25} {fila['productos']:>8} productos {fila['unidades']:>10} unidades")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_metricas_rendimiento():
+    """
+    menu_metricas_rendimiento()
+    1. muestra las métricas registradas (llamadas, latencias, filas y sentencias lentas con su plan de ejecución)
+    2. permite activar o desactivar el registro, guardar las métricas en un archivo JSON o reiniciarlas
+    """
+    metricas_mostrar_reporte()
+    accion = "desactivar" if metricas_activas() else "activar"
+    opcion = input(Fore.MAGENTA + f"\n'a' para {accion}, 'g' para guardar en JSON, 'r' para reiniciar "
+                                  "o Enter para volver: ").strip().lower()
+    if opcion == "a":
+        if metricas_activas():
+            metricas_desactivar()
+        else:
+            metricas_activar()
+        print(Fore.GREEN + f"Métricas {'activadas' if metricas_activas() else 'desactivadas'}.")
+    elif opcion == "g":
+        ruta = input(Fore.MAGENTA + "Ruta del archivo (Enter para metricas.json): ").strip() or "metricas.json"
+        metricas_guardar(ruta)
+        print(Fore.GREEN + f"Métricas guardadas en '{ruta}'.")
+    elif opcion == "r":
+        metricas_reiniciar()
+        print(Fore.GREEN + "Métricas reiniciadas.")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_respaldo_base_datos():
+    """
+    menu_respaldo_base_datos()
+    1. pregunta si se desea crear un respaldo o restaurar uno existente
+    2. crea el respaldo (opcionalmente compacto) o, previa confirmación, restaura el archivo indicado
+    3. muestra las páginas copiadas y los tiempos de copia y verificación
+    """
+    opcion = input(Fore.MAGENTA + "\n'c' para crear un respaldo, 'r' para restaurar uno o Enter para volver: ").strip().lower()
+    if opcion == "c":
+        ruta = input(Fore.MAGENTA + "Ruta del respaldo (Enter para respaldo.db): ").strip() or "respaldo.db"
+        compactar = input(Fore.MAGENTA + "¿Compactar la copia (más lenta, archivo más chico)? (s/n): ").strip().lower() == "s"
+        try:
+            resumen = respaldo_crear(ruta, compactar)
+        except (OSError, RuntimeError, ValueError, sqlite3.Error) as e:
+            print(Fore.RED + f"ERROR: no se pudo crear el respaldo: {e}")
+            return
+        print(Fore.GREEN + f"\nRespaldo creado en '{ruta}'.")
+        respaldo_mostrar_resumen(resumen)
+    elif opcion == "r":
+        ruta = input(Fore.MAGENTA + "Ruta del respaldo a restaurar: ").strip()
+        if not os.path.isfile(ruta):
+            print(Fore.RED + f"ERROR: no se encontró el archivo '{ruta}'")
+            return
+        confirmacion = input(Fore.RED + "Se reemplazarán todos los datos actuales. ¿Continuar? (s/n): ").strip().lower()
+        if confirmacion != "s":
+            print(Fore.YELLOW + "Restauración cancelada.")
+            return
+        try:
+            resumen = respaldo_restaurar(ruta)
+        except (OSError, RuntimeError, sqlite3.Error) as e:
+            print(Fore.RED + f"ERROR: no se pudo restaurar el respaldo: {e}")
+            return
+        print(Fore.GREEN + f"\nBase de datos restaurada desde '{ruta}'.")
+        respaldo_mostrar_resumen(resumen)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def menu_pronostico_reposicion():
+    """
+    menu_pronostico_reposicion()
+    1. solicita al usuario el horizonte en días (Enter usa PRONOSTICO_DIAS)
+    2. llama a pronostico_productos_a_agotarse(dias), que estima el consumo diario de cada producto a partir
+       de sus movimientos de stock
+    3. muestra los productos que se agotarían dentro de ese plazo, con su punto de reposición
+    """
+    entrada = input(Fore.MAGENTA + f"\nIngrese el horizonte en días (Enter para usar {PRONOSTICO_DIAS}): ").strip()
+    dias = int(entrada) if entrada else PRONOSTICO_DIAS
+    print(Fore.CYAN + "\nPronóstico de reposición")
+    pronostico_mostrar_reporte(pronostico_productos_a_agotarse(dias), dias)
@@ -0,0 +1,331 @@
+"""
+Módulo: funcionesMetricas.py
+Descripción: Este módulo mide el rendimiento de las funciones de acceso a datos (opcional, desactivado por defecto).
+Con las métricas activadas se registra, por función: cantidad de llamadas, errores, filas retornadas y un histograma
+de latencias; y por sentencia SQL: las que superan METRICAS_UMBRAL_LENTO se guardan junto con su plan de ejecución
+(EXPLAIN QUERY PLAN). Con las métricas desactivadas, cada llamada medida solo agrega la verificación de un indicador.
+
+Uso:
+    - Desde el código: metricas_activar(), ..., metricas_resumen() o metricas_guardar("metricas.json").
+    - Desde la terminal: definir la variable de entorno INVENTARIO_METRICAS=1 o usar la opción --metricas de main.py.
+    - Desde el menú: opción "Métricas de rendimiento".
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Duración (segundos) a partir de la cual una sentencia SQL se registra como lenta.
+METRICAS_UMBRAL_LENTO = 0.02
+# Cantidad máxima de sentencias lentas que se conservan (las más recientes).
+METRICAS_MAX_LENTAS = 100
+# Límites superiores (milisegundos) de los intervalos del histograma de latencias; el último es "más de 1000 ms".
+METRICAS_INTERVALOS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Estado interno.
+_activas = False
+_lock = threading.Lock()
+_local = threading.local()
+_funciones = {}
+_consultas_lentas = deque(maxlen=METRICAS_MAX_LENTAS)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_activar(umbral_lento=None):
+    """
+    Activa el registro de métricas. Los contadores acumulados hasta el momento se conservan.
+
+    Args:
+        umbral_lento (float): Segundos a partir de los cuales una sentencia se considera lenta.
+    """
+    global _activas, METRICAS_UMBRAL_LENTO
+    if umbral_lento is not None:
+        METRICAS_UMBRAL_LENTO = umbral_lento
+    _activas = True
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_desactivar():
+    """
+    Desactiva el registro de métricas (los contadores se conservan hasta llamar a metricas_reiniciar).
+    """
+    global _activas
+    _activas = False
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_activas():
+    """
+    Indica si el registro de métricas está activado.
+    """
+    return _activas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_reiniciar():
+    """
+    Descarta todas las métricas registradas.
+    """
+    with _lock:
+        _funciones.clear()
+        _consultas_lentas.clear()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _metricas_contar_filas(resultado):
+    """
+    Cantidad de filas de un resultado de tipo colección (lista, ProductoBatch); None para otros resultados.
+    """
+    if isinstance(resultado, (str, bytes, tuple, dict)) or not hasattr(resultado, "__len__"):
+        return None
+    return len(resultado)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _metricas_registrar(nombre, segundos, filas, error):
+    """
+    Acumula una llamada medida en las estadísticas de la función.
+    """
+    with _lock:
+        datos = _funciones.get(nombre)
+        if datos is None:
+            datos = _funciones[nombre] = {"llamadas": 0, "errores": 0, "filas": 0, "segundos": 0.0, "maximo": 0.0,
+                                          "histograma": [0] * (len(METRICAS_INTERVALOS_MS) + 1)}
+        datos["llamadas"] += 1
+        datos["segundos"] += segundos
+        datos["maximo"] = max(datos["maximo"], segundos)
+        datos["histograma"][bisect_left(METRICAS_INTERVALOS_MS, segundos * 1000)] += 1
+        if error:
+            datos["errores"] += 1
+        if filas:
+            datos["filas"] += filas
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_medir(filas=None):
+    """
+    Decorador que registra llamadas, latencia, filas retornadas y errores (excepciones) de una función.
+
+    Args:
+        filas (callable): Función que recibe el resultado y retorna la cantidad de filas. Por defecto se usa
+                          len() si el resultado es una lista o ProductoBatch.
+
+    Ejemplo:
+        @metricas_medir(filas=lambda resultado: len(resultado[0]))
+        def db_get_pagina_productos(...):
+    """
+    contar = filas or _metricas_contar_filas
+
+    def decorador(funcion):
+        nombre = funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activas:
+                return funcion(*args, **kwargs)
+            anterior = getattr(_local, "funcion", None)
+            _local.funcion = nombre
+            inicio = time.perf_counter()
+            try:
+                resultado = funcion(*args, **kwargs)
+            except BaseException:
+                _metricas_registrar(nombre, time.perf_counter() - inicio, None, True)
+                raise
+            finally:
+                _local.funcion = anterior
+            _metricas_registrar(nombre, time.perf_counter() - inicio, contar(resultado), False)
+            return resultado
+
+        return envoltura
+
+    return decorador
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _metricas_registrar_sentencia(conexion, sql, parametros, segundos):
+    """
+    Registra una sentencia lenta junto con su plan de ejecución.
+    """
+    instruccion = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    plan = []
+    if instruccion in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE"):
+        try:
+            plan = [fila[3] for fila in conexion.execute("EXPLAIN QUERY PLAN " + sql, parametros)]
+        except Exception as e:
+            plan = [f"(no disponible: {e})"]
+    with _lock:
+        _consultas_lentas.append({
+            "funcion": getattr(_local, "funcion", None),
+            "sql": " ".join(sql.split()),
+            "parametros": repr(parametros)[:200],
+            "ms": round(segundos * 1000, 3),
+            "plan": plan,
+            "momento": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class _CursorMedido:
+    """
+    Cursor que mide la duración de execute() / executemany() (para un SELECT, hasta obtener la primera fila).
+    El resto de los atributos se delegan en el cursor de sqlite3.
+    """
+
+    __slots__ = ("_cursor", "_conexion")
+
+    def __init__(self, cursor, conexion):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_conexion", conexion)
+
+    def _medir(self, metodo, sql, parametros):
+        inicio = time.perf_counter()
+        getattr(self._cursor, metodo)(sql, parametros)
+        segundos = time.perf_counter() - inicio
+        if segundos >= METRICAS_UMBRAL_LENTO:
+            if metodo == "executemany":
+                parametros = next(iter(parametros), ()) if isinstance(parametros, (list, tuple)) else ()
+            _metricas_registrar_sentencia(self._conexion, sql, parametros, segundos)
+        return self
+
+    def execute(self, sql, parametros=()):
+        return self._medir("execute", sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self._medir("executemany", sql, parametros)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._cursor, nombre, valor)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class ConexionMedida:
+    """
+    Envoltorio de una conexión de sqlite3 cuyos cursores miden la duración de cada sentencia.
+    db_conexion() lo entrega en lugar de la conexión cuando las métricas están activadas.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a envolver (disponible en el atributo 'conexion').
+    """
+
+    __slots__ = ("conexion",)
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+
+    def cursor(self):
+        return _CursorMedido(self.conexion.cursor(), self.conexion)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+    # Los métodos especiales no pasan por __getattr__: 'with conexion:' (commit o rollback al salir) se delega
+    # explícitamente, y retorna el envoltorio para que las sentencias del bloque también se midan.
+    def __enter__(self):
+        self.conexion.__enter__()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return self.conexion.__exit__(tipo, valor, traza)
+
+    def __getattr__(self, nombre):
+        return getattr(self.conexion, nombre)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _metricas_percentil(histograma, total, percentil):
+    """
+    Estima un percentil a partir del histograma: retorna el límite superior del intervalo que lo contiene (ms).
+    """
+    objetivo = total * percentil / 100
+    acumulado = 0
+    for indice, cantidad in enumerate(histograma):
+        acumulado += cantidad
+        if acumulado >= objetivo:
+            return METRICAS_INTERVALOS_MS[indice] if indice < len(METRICAS_INTERVALOS_MS) else None
+    return None
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_resumen():
+    """
+    Retorna las métricas registradas en un formato apto para JSON.
+
+    Returns:
+        dict: {"activas", "umbral_lento_ms", "funciones": {nombre: {...}}, "consultas_lentas": [...]}.
+              Los percentiles son estimaciones (límite superior del intervalo del histograma, en ms;
+              None si supera el último intervalo).
+    """
+    etiquetas = [f"<={limite}ms" for limite in METRICAS_INTERVALOS_MS] + [f">{METRICAS_INTERVALOS_MS[-1]}ms"]
+    funciones = {}
+    with _lock:
+        for nombre, datos in sorted(_funciones.items()):
+            llamadas = datos["llamadas"]
+            funciones[nombre] = {
+                "llamadas": llamadas,
+                "errores": datos["errores"],
+                "filas": datos["filas"],
+                "total_ms": round(datos["segundos"] * 1000, 3),
+                "promedio_ms": round(datos["segundos"] * 1000 / llamadas, 4),
+                "p50_ms": _metricas_percentil(datos["histograma"], llamadas, 50),
+                "p95_ms": _metricas_percentil(datos["histograma"], llamadas, 95),
+                "p99_ms": _metricas_percentil(datos["histograma"], llamadas, 99),
+                "max_ms": round(datos["maximo"] * 1000, 3),
+                "histograma": {etiqueta: cantidad for etiqueta, cantidad in zip(etiquetas, datos["histograma"]) if cantidad},
+            }
+        lentas = list(_consultas_lentas)
+    return {"activas": _activas, "umbral_lento_ms": METRICAS_UMBRAL_LENTO * 1000,
+            "funciones": funciones, "consultas_lentas": lentas}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_guardar(ruta):
+    """
+    Guarda el resumen de métricas en un archivo JSON.
+
+    Args:
+        ruta (str): Ruta del archivo a escribir.
+    """
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(metricas_resumen(), archivo, indent=2, ensure_ascii=False)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def metricas_mostrar_reporte(resumen=None):
+    """
+    Muestra en consola el resumen de métricas: una línea por función y las sentencias lentas.
+
+    Args:
+        resumen (dict): Resumen a mostrar (por defecto, metricas_resumen()).
+    """
+    resumen = resumen or metricas_resumen()
+    print(f"Métricas {'activadas' if resumen['activas'] else 'desactivadas'} "
+          f"(sentencias lentas: más de {resumen['umbral_lento_ms']:g} ms)")
+    if not resumen["funciones"]:
+        print("Todavía no hay llamadas registradas.")
+        return
+    print(f"{'Función':<32} {'llamadas':>9} {'errores':>8} {'filas':>10} {'prom ms':>9} {'p95 ms':>8} {'max ms':>9}")
+    for nombre, datos in resumen["funciones"].items():
+        p95 = datos["p95_ms"] if datos["p95_ms"] is not None else f">{METRICAS_INTERVALOS_MS[-1]}"
+        print(f"{nombre:<32} {datos['llamadas']:>9} {datos['errores']:>8} {datos['filas']:>10} "
+              f"{datos['promedio_ms']:>9.3f} {p95:>8} {datos['max_ms']:>9.3f}")
+    for consulta in resumen["consultas_lentas"][-10:]:
+        print(f"\n[{consulta['momento']}] {consulta['ms']} ms en {consulta['funcion']}: {consulta['sql'][:150]}")
+        for paso in consulta["plan"]:
+            print(f"    {paso}")
+
+
+if os.environ.get("INVENTARIO_METRICAS") in ("1", "true", "si"):
+    metricas_activar()
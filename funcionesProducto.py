@@ -0,0 +1,147 @@
+"""
+Módulo: funcionesProducto.py
+Descripción: Este módulo define los tipos con los que viajan los productos entre la base de datos y el resto del sistema.
+- Producto: un producto individual (con __slots__, se accede por nombre de campo: producto.cantidad).
+- ProductoBatch: muchos productos guardados por columnas (arrays de enteros y reales y listas de textos), que ocupa
+  bastante menos memoria que una lista de tuplas u objetos para listados grandes.
+También incluye la fábrica de filas (row_factory) para que sqlite3 construya directamente objetos Producto.
+"""
+
+from array import array
+
+# Columnas de la tabla 'productos', en el orden en que se consultan.
+COLUMNAS_PRODUCTOS = ("id", "nombre", "descripcion", "categoria", "cantidad", "precio", "version")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class Producto:
+    """
+    Producto del inventario. Los campos que no se consultaron (por ejemplo, al pedir solo algunas
+    columnas) quedan en None. Los objetos pueden estar compartidos con la caché: no deben modificarse.
+    version aumenta con cada modificación del producto (ver db_actualizar_producto_version).
+
+    Se escribe a mano (equivale a @dataclass(slots=True)) porque importar dataclasses carga inspect,
+    que agrega ~10 ms al arranque de cada invocación desde la línea de comandos.
+    """
+
+    __slots__ = COLUMNAS_PRODUCTOS
+    __match_args__ = COLUMNAS_PRODUCTOS
+
+    def __init__(self, id=None, nombre=None, descripcion=None, categoria=None, cantidad=None, precio=None,
+                 version=None):
+        self.id = id
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.categoria = categoria
+        self.cantidad = cantidad
+        self.precio = precio
+        self.version = version
+
+    def __repr__(self):
+        campos = ", ".join(f"{columna}={getattr(self, columna)!r}" for columna in COLUMNAS_PRODUCTOS)
+        return f"Producto({campos})"
+
+    def __eq__(self, otro):
+        if otro.__class__ is not self.__class__:
+            return NotImplemented
+        return self.a_tupla() == otro.a_tupla()
+
+    __hash__ = None
+
+    def a_tupla(self, columnas=COLUMNAS_PRODUCTOS):
+        """
+        Retorna los valores de las columnas indicadas como tupla (por ejemplo, para escribir un CSV).
+        """
+        return tuple(getattr(self, columna) for columna in columnas)
+
+    def a_dict(self, columnas=COLUMNAS_PRODUCTOS):
+        """
+        Retorna un diccionario {columna: valor} con las columnas indicadas (por ejemplo, para JSON).
+        """
+        return {columna: getattr(self, columna) for columna in columnas}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def producto_row_factory(cursor, fila):
+    """
+    row_factory de sqlite3 para consultas que devuelven todas las columnas de COLUMNAS_PRODUCTOS, en orden.
+
+    Ejemplo:
+        cursor.row_factory = producto_row_factory
+    """
+    return Producto(*fila)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def producto_desde_columnas(columnas, fila):
+    """
+    Construye un Producto a partir de una fila con solo algunas columnas.
+
+    Args:
+        columnas (list): Nombres de las columnas de la fila.
+        fila (tuple): Valores en el mismo orden que columnas.
+
+    Returns:
+        Producto: Producto con los campos indicados (el resto en None).
+    """
+    return Producto(**dict(zip(columnas, fila)))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class ProductoBatch:
+    """
+    Conjunto de productos almacenado por columnas: ids, cantidades, precios y versiones en arrays compactos y los
+    textos en listas.
+    Se recorre y se indexa como una lista (cada elemento se entrega como Producto, creado en el momento).
+
+    Args:
+        productos (iterable): Productos o tuplas con los valores de COLUMNAS_PRODUCTOS iniciales.
+    """
+
+    __slots__ = ("ids", "nombres", "descripciones", "categorias", "cantidades", "precios", "versiones")
+
+    def __init__(self, productos=()):
+        self.ids = array("q")
+        self.nombres = []
+        self.descripciones = []
+        self.categorias = []
+        self.cantidades = array("q")
+        self.precios = array("d")
+        self.versiones = array("q")
+        self.extender(productos)
+
+    def agregar(self, producto_id, nombre, descripcion, categoria, cantidad, precio, version):
+        """
+        Agrega un producto a partir de sus valores.
+        """
+        self.ids.append(producto_id)
+        self.nombres.append(nombre)
+        self.descripciones.append(descripcion)
+        self.categorias.append(categoria)
+        self.cantidades.append(cantidad)
+        self.precios.append(precio)
+        self.versiones.append(version)
+
+    def extender(self, filas):
+        """
+        Agrega productos a partir de objetos Producto o de tuplas en el orden de COLUMNAS_PRODUCTOS.
+        """
+        for fila in filas:
+            if isinstance(fila, Producto):
+                fila = fila.a_tupla()
+            self.agregar(*fila)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, indice):
+        return Producto(self.ids[indice], self.nombres[indice], self.descripciones[indice],
+                        self.categorias[indice], self.cantidades[indice], self.precios[indice],
+                        self.versiones[indice])
+
+    def __iter__(self):
+        return map(Producto, self.ids, self.nombres, self.descripciones,
+                   self.categorias, self.cantidades, self.precios, self.versiones)
+
+    def __repr__(self):
+        return f"ProductoBatch({len(self)} productos)"
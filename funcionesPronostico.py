@@ -0,0 +1,286 @@
+"""
+Módulo: funcionesPronostico.py
+Descripción: Este módulo pronostica cuándo se agotará cada producto a partir de su historial de movimientos de stock,
+en lugar de usar un umbral fijo igual para todos (ver menu_reporte_bajo_stock).
+
+Los egresos se registran solos: cada ajuste negativo de cantidad (db_actualizar_producto, db_incrementar_cantidad,
+db_ajustar_stock_lote, etc.) queda en 'movimientos' y un trigger lo suma al consumo del día en 'consumo_diario'.
+Por cada producto y ventana de DB_VENTANAS_CONSUMO días se mantiene la suma de los egresos diarios y de sus
+cuadrados ('consumo_acumulado'); al avanzar una ventana solo se restan los días que salen de ella, de modo que el
+reporte nunca vuelve a recorrer el historial ni los productos sin movimiento.
+
+Para cada producto con consumo:
+    - consumo diario: el mayor promedio entre las ventanas (la ventana corta detecta los productos que se
+      aceleraron; la larga suaviza los picos).
+    - desvío diario: variabilidad del consumo en la ventana más larga.
+    - punto de reposición: consumo diario * PRONOSTICO_DIAS_REPOSICION
+                           + PRONOSTICO_FACTOR_SEGURIDAD * desvío diario * raíz(PRONOSTICO_DIAS_REPOSICION).
+    - días restantes: cantidad / consumo diario.
+Los días se cuentan en UTC, como las fechas de 'movimientos'.
+
+También puede ejecutarse directamente desde la terminal:
+
+    python funcionesPronostico.py --dias 14
+    python funcionesPronostico.py --recalcular
+"""
+
+import argparse
+import math
+import sqlite3
+import time
+
+import funcionesDataBase
+from funcionesDataBase import db_conexion, db_crear_tabla_productos
+from funcionesMetricas import metricas_medir
+
+# Horizonte por defecto del reporte: productos que se agotarían dentro de esta cantidad de días.
+PRONOSTICO_DIAS = 14
+
+# Días que tarda en llegar la mercadería desde que se pide.
+PRONOSTICO_DIAS_REPOSICION = 7
+
+# Múltiplo del desvío que se agrega como stock de seguridad (1.65 cubre ~95% de los días con consumo normal).
+PRONOSTICO_FACTOR_SEGURIDAD = 1.65
+
+QUERY_PRONOSTICO = """
+    SELECT p.id, p.nombre, p.categoria, p.cantidad,
+           MAX(a.unidades * 1.0 / a.dias) AS consumo,
+           TOTAL(a.unidades) FILTER (WHERE a.dias = v.dias),
+           TOTAL(a.cuadrados) FILTER (WHERE a.dias = v.dias),
+           v.dias
+    FROM consumo_acumulado a
+    JOIN (SELECT MAX(dias) AS dias FROM consumo_ventanas) v
+    JOIN productos p ON p.id = a.producto_id
+    {filtro}
+    GROUP BY a.producto_id
+    {condicion}
+"""
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _pronostico_avanzar_ventanas(conexion, hoy=None):
+    """
+    Mueve el inicio de cada ventana hasta hoy y resta de 'consumo_acumulado' los días que quedaron afuera
+    (solo esos días: la consulta usa el índice sobre consumo_diario.dia). También descarta de 'consumo_diario'
+    los días anteriores a todas las ventanas.
+
+    Se ejecuta con BEGIN IMMEDIATE (y vuelve a leer las ventanas) para que dos procesos no resten dos veces
+    los mismos días.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a utilizar.
+        hoy (str): Fecha "AAAA-MM-DD" a usar como día actual (por defecto, la fecha UTC actual).
+
+    Returns:
+        int: Cantidad de acumulados (producto y ventana) actualizados.
+    """
+    consulta = "SELECT dias, inicio, date(COALESCE(?, 'now'), '-' || (dias - 1) || ' days') FROM consumo_ventanas"
+    cursor = conexion.cursor()
+    # En el caso habitual (ventanas ya avanzadas hoy) no se toma el bloqueo de escritura.
+    if all(nuevo_inicio <= inicio for _, inicio, nuevo_inicio in cursor.execute(consulta, (hoy,)).fetchall()):
+        return 0
+    cursor.execute("BEGIN IMMEDIATE")
+    cursor.execute(consulta, (hoy,))
+    actualizados = 0
+    for dias, inicio, nuevo_inicio in cursor.fetchall():
+        if nuevo_inicio <= inicio:
+            continue
+        cursor.execute("""
+            UPDATE consumo_acumulado AS a
+            SET unidades = a.unidades - s.unidades, cuadrados = a.cuadrados - s.cuadrados
+            FROM (
+                SELECT producto_id, SUM(unidades) AS unidades, SUM(unidades * unidades) AS cuadrados
+                FROM consumo_diario
+                WHERE dia >= ? AND dia < ?
+                GROUP BY producto_id
+            ) AS s
+            WHERE a.producto_id = s.producto_id AND a.dias = ?
+        """, (inicio, nuevo_inicio, dias))
+        actualizados += cursor.rowcount
+        cursor.execute("""
+            DELETE FROM consumo_acumulado
+            WHERE dias = ? AND unidades <= 0
+            AND producto_id IN (SELECT producto_id FROM consumo_diario WHERE dia >= ? AND dia < ?)
+        """, (dias, inicio, nuevo_inicio))
+        cursor.execute("UPDATE consumo_ventanas SET inicio = ? WHERE dias = ?", (nuevo_inicio, dias))
+    cursor.execute("DELETE FROM consumo_diario WHERE dia < (SELECT MIN(inicio) FROM consumo_ventanas)")
+    conexion.commit()
+    return actualizados
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _pronostico_fila(fila):
+    """
+    Calcula el consumo, el desvío, el punto de reposición y los días restantes de una fila de QUERY_PRONOSTICO.
+
+    Returns:
+        dict: Claves id, nombre, categoria, cantidad, consumo_diario, desvio_diario, punto_reposicion,
+              dias_restantes (None si no hay consumo) y reponer (cantidad <= punto_reposicion).
+    """
+    producto_id, nombre, categoria, cantidad, consumo, unidades, cuadrados, dias = fila
+    consumo = consumo or 0.0
+    media = unidades / dias
+    desvio = math.sqrt(max(cuadrados / dias - media * media, 0.0))
+    punto = (consumo * PRONOSTICO_DIAS_REPOSICION
+             + PRONOSTICO_FACTOR_SEGURIDAD * desvio * math.sqrt(PRONOSTICO_DIAS_REPOSICION))
+    return {
+        "id": producto_id,
+        "nombre": nombre,
+        "categoria": categoria,
+        "cantidad": cantidad,
+        "consumo_diario": round(consumo, 3),
+        "desvio_diario": round(desvio, 3),
+        "punto_reposicion": math.ceil(punto),
+        "dias_restantes": round(cantidad / consumo, 1) if consumo > 0 else None,
+        "reponer": cantidad <= punto,
+    }
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def pronostico_productos_a_agotarse(dias=PRONOSTICO_DIAS, hoy=None, limite=None):
+    """
+    Lista los productos que, al ritmo de consumo actual, se agotarían dentro de los próximos días.
+    Solo se leen los acumulados de los productos con consumo en alguna ventana (no toda la tabla 'productos').
+
+    Args:
+        dias (int): Horizonte del pronóstico en días.
+        hoy (str): Fecha "AAAA-MM-DD" a usar como día actual (por defecto, la fecha UTC actual).
+        limite (int): Cantidad máxima de productos a retornar (por defecto, todos).
+
+    Returns:
+        list: Diccionarios de _pronostico_fila(), del que se agota primero al último.
+              Lista vacía si ocurre un error.
+    """
+    consulta = QUERY_PRONOSTICO.format(filtro="", condicion="""
+        HAVING consumo > 0 AND p.cantidad <= consumo * ?
+        ORDER BY p.cantidad / consumo, p.id
+        LIMIT ?
+    """)
+    try:
+        with db_conexion() as conexion:
+            _pronostico_avanzar_ventanas(conexion, hoy)
+            cursor = conexion.execute(consulta, (dias, -1 if limite is None else limite))
+            return [_pronostico_fila(fila) for fila in cursor]
+    except sqlite3.Error as e:
+        print(f"Error al calcular el pronóstico: {e}")
+        return []
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def pronostico_producto(producto_id, hoy=None):
+    """
+    Obtiene el consumo y el punto de reposición de un producto.
+
+    Args:
+        producto_id (int): ID del producto.
+        hoy (str): Fecha "AAAA-MM-DD" a usar como día actual (por defecto, la fecha UTC actual).
+
+    Returns:
+        dict: Diccionario de _pronostico_fila() (con consumo 0 si el producto no tuvo egresos en las ventanas),
+              o None si el producto no existe o si ocurre un error.
+    """
+    try:
+        with db_conexion() as conexion:
+            _pronostico_avanzar_ventanas(conexion, hoy)
+            fila = conexion.execute(QUERY_PRONOSTICO.format(filtro="WHERE a.producto_id = ?", condicion=""),
+                                    (producto_id,)).fetchone()
+            if fila is None:
+                producto = conexion.execute("SELECT id, nombre, categoria, cantidad FROM productos WHERE id = ?",
+                                            (producto_id,)).fetchone()
+                if producto is None:
+                    return None
+                fila = (*producto, 0.0, 0.0, 0.0, 1)
+            return _pronostico_fila(fila)
+    except sqlite3.Error as e:
+        print(f"Error al calcular el pronóstico: {e}")
+        return None
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def pronostico_recalcular(hoy=None):
+    """
+    Reconstruye las ventanas y los acumulados de consumo desde 'movimientos' (recorrido completo).
+    No hace falta en el uso normal; sirve después de cambiar DB_VENTANAS_CONSUMO o para verificar los
+    acumulados incrementales.
+
+    Args:
+        hoy (str): Fecha "AAAA-MM-DD" a usar como día actual (por defecto, la fecha UTC actual).
+
+    Returns:
+        bool: True si se reconstruyó, False si ocurrió un error.
+    """
+    try:
+        with db_conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("DELETE FROM consumo_ventanas")
+            cursor.executemany("INSERT INTO consumo_ventanas (dias, inicio) VALUES (?, date(COALESCE(?, 'now'), ?))",
+                               [(dias, hoy, f"-{dias - 1} days") for dias in funcionesDataBase.DB_VENTANAS_CONSUMO])
+            cursor.execute("DELETE FROM consumo_acumulado")
+            cursor.execute("DELETE FROM consumo_diario")
+            # El trigger consumo_diario_alta vuelve a completar consumo_acumulado.
+            cursor.execute("""
+                INSERT INTO consumo_diario (producto_id, dia, unidades)
+                SELECT m.producto_id, substr(m.fecha, 1, 10), -SUM(m.variacion)
+                FROM movimientos m
+                JOIN productos p ON p.id = m.producto_id
+                WHERE m.tipo = 'ajuste' AND m.variacion < 0
+                AND substr(m.fecha, 1, 10) >= (SELECT MIN(inicio) FROM consumo_ventanas)
+                GROUP BY m.producto_id, substr(m.fecha, 1, 10)
+            """)
+            conexion.commit()
+            return True
+    except sqlite3.Error as e:
+        print(f"Error al recalcular el consumo: {e}")
+        return False
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def pronostico_mostrar_reporte(filas, dias=PRONOSTICO_DIAS):
+    """
+    Muestra en consola el reporte de productos a agotarse.
+
+    Args:
+        filas (list): Resultado de pronostico_productos_a_agotarse().
+        dias (int): Horizonte usado para el reporte.
+    """
+    if not filas:
+        print(f"Ningún producto se agotaría en los próximos {dias} días al ritmo de consumo actual.")
+        return
+    print(f"Productos que se agotarían en los próximos {dias} días:")
+    print(f"{'ID':>8} {'Nombre':<30} {'Stock':>8} {'Consumo/día':>12} {'Días':>7} {'Reposición':>11}")
+    for fila in filas:
+        marca = " *" if fila["reponer"] else ""
+        print(f"{fila['id']:>8} {fila['nombre'][:30]:<30} {fila['cantidad']:>8} {fila['consumo_diario']:>12.2f} "
+              f"{fila['dias_restantes']:>7.1f} {fila['punto_reposicion']:>11}{marca}")
+    if any(fila["reponer"] for fila in filas):
+        print("(*) stock igual o menor al punto de reposición: conviene pedir ahora.")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para ejecutar el pronóstico desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Pronóstico de reposición a partir de los movimientos de stock.")
+    parser.add_argument("--dias", type=int, default=PRONOSTICO_DIAS, help="Horizonte del pronóstico en días.")
+    parser.add_argument("--limite", type=int, help="Cantidad máxima de productos a mostrar.")
+    parser.add_argument("--recalcular", action="store_true",
+                        help="Reconstruye los acumulados de consumo desde los movimientos antes del reporte.")
+    args = parser.parse_args()
+
+    db_crear_tabla_productos()
+    if args.recalcular and not pronostico_recalcular():
+        return 1
+    inicio = time.perf_counter()
+    filas = pronostico_productos_a_agotarse(args.dias, limite=args.limite)
+    pronostico_mostrar_reporte(filas, args.dias)
+    print(f"Tiempo: {time.perf_counter() - inicio:.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
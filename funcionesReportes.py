@@ -0,0 +1,154 @@
+"""
+Módulo: funcionesReportes.py
+Descripción: Este módulo calcula reportes agregados del inventario (valor del stock por categoría, productos de mayor
+valor y cantidad de productos con bajo stock por categoría). Los cálculos se hacen en SQLite con GROUP BY / ORDER BY
+sobre índices que cubren las columnas necesarias, de modo que nunca se traen todos los productos a Python.
+Los resultados se guardan en una caché que se vacía con cada escritura hecha desde este proceso (ver
+db_cache_registrar); el TTL acota cuánto puede tardar en verse un cambio hecho por otro proceso.
+"""
+
+import sqlite3
+
+import funcionesDataBase
+from funcionesCache import CacheLRU, SIN_VALOR
+from funcionesDataBase import db_cache_registrar, db_conexion, db_get_umbral_bajo_stock
+from funcionesMetricas import metricas_medir
+from funcionesProducto import Producto
+
+# Caché de reportes: pocos elementos (uno por reporte y parámetros).
+REPORTES_CACHE_TAMANIO = 64
+REPORTES_CACHE_TTL = 30
+
+_cache_reportes = CacheLRU(REPORTES_CACHE_TAMANIO, REPORTES_CACHE_TTL)
+db_cache_registrar(_cache_reportes)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _reporte_cacheado(nombre, parametros, calcular):
+    """
+    Retorna el resultado de un reporte desde la caché o lo calcula y lo guarda.
+
+    Args:
+        nombre (str): Nombre del reporte.
+        parametros (tuple): Parámetros que lo identifican.
+        calcular (callable): Función que recibe un cursor y retorna el resultado.
+
+    Returns:
+        list: Resultado del reporte (lista vacía si ocurre un error).
+    """
+    clave = (funcionesDataBase.DB_PATH, nombre, parametros)
+    if funcionesDataBase.DB_USAR_CACHE:
+        resultado = _cache_reportes.obtener(clave)
+        if resultado is not SIN_VALOR:
+            return list(resultado)
+        generacion = _cache_reportes.generacion()
+    try:
+        with db_conexion() as conexion:
+            resultado = calcular(conexion.cursor())
+    except sqlite3.Error as e:
+        print(f"Error al calcular el reporte: {e}")
+        return []
+    if funcionesDataBase.DB_USAR_CACHE:
+        _cache_reportes.guardar(clave, tuple(resultado), generacion)
+    return resultado
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def reporte_valor_por_categoria():
+    """
+    Calcula el valor del stock (cantidad * precio) de cada categoría.
+    Se resuelve recorriendo solo el índice idx_productos_categoria_valor, que ya está ordenado por categoría.
+
+    Returns:
+        list: Diccionarios {"categoria", "productos", "unidades", "valor"}, ordenados por categoría.
+    """
+    def calcular(cursor):
+        cursor.execute("""
+            SELECT categoria, COUNT(*), SUM(cantidad), TOTAL(cantidad * precio)
+            FROM productos
+            GROUP BY categoria
+            ORDER BY categoria
+        """)
+        return [{"categoria": categoria, "productos": productos, "unidades": unidades, "valor": round(valor, 2)}
+                for categoria, productos, unidades, valor in cursor]
+
+    return _reporte_cacheado("valor_por_categoria", (), calcular)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def reporte_top_productos_por_valor(limite=10):
+    """
+    Obtiene los productos con mayor valor de stock (cantidad * precio).
+    El índice de expresión idx_productos_valor permite leer solo las primeras filas, sin ordenar la tabla.
+
+    Args:
+        limite (int): Cantidad de productos a retornar.
+
+    Returns:
+        list: Tuplas (Producto, valor), de mayor a menor valor.
+    """
+    def calcular(cursor):
+        cursor.execute(f"""
+            SELECT {funcionesDataBase.SQL_COLUMNAS_PRODUCTOS}, cantidad * precio
+            FROM productos
+            ORDER BY cantidad * precio DESC
+            LIMIT ?
+        """, (limite,))
+        return [(Producto(*fila[:-1]), round(fila[-1], 2)) for fila in cursor]
+
+    return _reporte_cacheado("top_por_valor", (limite,), calcular)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def reporte_bajo_stock_por_categoria(minimo_stock=None):
+    """
+    Cuenta, por categoría, los productos cuya cantidad es menor al stock mínimo.
+    Con el umbral configurado se agrupa la tabla precalculada productos_bajo_stock; con otro valor,
+    solo el rango necesario del índice sobre cantidad.
+
+    Args:
+        minimo_stock (int): Cantidad mínima de stock (por defecto, el umbral configurado).
+
+    Returns:
+        list: Diccionarios {"categoria", "productos", "unidades"}, de la categoría con más productos a la de menos.
+    """
+    if minimo_stock is None:
+        minimo_stock = db_get_umbral_bajo_stock()
+
+    def calcular(cursor):
+        cursor.execute("SELECT valor FROM configuracion WHERE clave = 'umbral_bajo_stock'")
+        fila = cursor.fetchone()
+        if fila is not None and fila[0] == minimo_stock:
+            cursor.execute("""
+                SELECT p.categoria, COUNT(*), SUM(p.cantidad)
+                FROM productos_bajo_stock b
+                JOIN productos p ON p.id = b.producto_id
+                GROUP BY p.categoria
+                ORDER BY COUNT(*) DESC, p.categoria
+            """)
+        else:
+            cursor.execute("""
+                SELECT categoria, COUNT(*), SUM(cantidad)
+                FROM productos
+                WHERE cantidad < ?
+                GROUP BY categoria
+                ORDER BY COUNT(*) DESC, categoria
+            """, (minimo_stock,))
+        return [{"categoria": categoria, "productos": productos, "unidades": unidades}
+                for categoria, productos, unidades in cursor]
+
+    return _reporte_cacheado("bajo_stock_por_categoria", (minimo_stock,), calcular)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def reporte_cache_estadisticas():
+    """
+    Retorna los contadores de la caché de reportes.
+
+    Returns:
+        dict: Aciertos, fallos, descartes y vencimientos.
+    """
+    return _cache_reportes.estadisticas()
@@ -0,0 +1,313 @@
+"""
+Módulo: funcionesRespaldo.py
+Descripción: Este módulo crea respaldos de la base de datos mientras el programa está en uso y los restaura.
+Copiar inventario.db con el sistema de archivos mientras otro proceso escribe puede dejar una copia corrupta (el
+archivo y su WAL se copian en momentos distintos); aquí se usa la API de respaldo en línea de SQLite, que copia las
+páginas de la base de a bloques y libera el bloqueo de lectura entre bloque y bloque para no frenar a los escritores.
+
+Métodos:
+    - backup: API de respaldo en línea, de a RESPALDO_PAGINAS_POR_PASO páginas. Si otra conexión escribe durante la
+              copia, SQLite la reinicia para que el resultado sea consistente (se informa en "reinicios"); tras
+              RESPALDO_REINICIOS_MAXIMOS reinicios se copia el resto en un único paso, para que un escritor
+              constante no impida terminar (con WAL ese paso tampoco bloquea a los escritores).
+    - vacuum: VACUUM INTO, que escribe una copia compacta (sin páginas libres) leyendo una única instantánea de la
+              base. Tarda más que backup, pero el archivo resultante es más chico.
+El respaldo se escribe primero en un archivo temporal, se verifica con PRAGMA integrity_check y recién entonces
+reemplaza al destino: un respaldo fallido nunca pisa al anterior.
+
+Uso:
+    python funcionesRespaldo.py crear respaldos/inventario_20240101.db --compactar
+    python funcionesRespaldo.py restaurar respaldos/inventario_20240101.db
+    python funcionesRespaldo.py verificar respaldos/inventario_20240101.db
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import funcionesDataBase
+from funcionesCambios import cambios_reiniciar, cambios_ultima_secuencia
+from funcionesDataBase import db_cache_limpiar, db_cerrar_conexiones, db_crear_tabla_productos
+from funcionesMetricas import metricas_medir
+
+# Páginas copiadas en cada paso del respaldo en línea (con páginas de 4 KiB, 4 MiB por paso).
+RESPALDO_PAGINAS_POR_PASO = 1024
+# Segundos de pausa entre pasos, para dar lugar a los escritores cuando la base no usa WAL.
+RESPALDO_PAUSA = 0.0
+# Reinicios tolerados antes de copiar todo en un único paso.
+RESPALDO_REINICIOS_MAXIMOS = 3
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class _RespaldoReiniciado(Exception):
+    """
+    Interrumpe la copia por pasos cuando las escrituras concurrentes la reiniciaron demasiadas veces.
+    """
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _respaldo_conectar(ruta, solo_lectura=False):
+    """
+    Abre una conexión propia (fuera del pool) a una base de datos.
+
+    Args:
+        ruta (str): Archivo de la base de datos.
+        solo_lectura (bool): Abrir en modo solo lectura (falla si el archivo no existe).
+
+    Returns:
+        sqlite3.Connection: Conexión abierta.
+    """
+    if solo_lectura:
+        # as_uri() codifica los caracteres con significado en una URI ('?', '#', '%'), que pueden estar en la ruta.
+        uri = Path(os.path.abspath(ruta)).as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True, timeout=funcionesDataBase.DB_BUSY_TIMEOUT)
+    return sqlite3.connect(ruta, timeout=funcionesDataBase.DB_BUSY_TIMEOUT)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _respaldo_copiar(origen, destino, paginas_por_paso, pausa):
+    """
+    Copia una base en otra con la API de respaldo en línea.
+
+    Args:
+        origen (sqlite3.Connection): Base a copiar.
+        destino (sqlite3.Connection): Base que se reemplaza por la copia.
+        paginas_por_paso (int): Páginas copiadas en cada paso.
+        pausa (float): Segundos de espera entre pasos.
+
+    Returns:
+        dict: paginas (total copiado), pasos y reinicios (veces que la copia volvió a empezar por escrituras
+              concurrentes en el origen).
+    """
+    progreso = {"paginas": 0, "pasos": 0, "reinicios": 0, "restantes": None}
+
+    def registrar(estado, restantes, total):
+        if progreso["restantes"] is not None and restantes > progreso["restantes"]:
+            progreso["reinicios"] += 1
+            if progreso["reinicios"] > RESPALDO_REINICIOS_MAXIMOS:
+                raise _RespaldoReiniciado()
+        progreso.update(paginas=total, restantes=restantes, pasos=progreso["pasos"] + 1)
+        # El bloqueo de lectura del origen ya se liberó: los escritores pueden avanzar durante la pausa.
+        if pausa and restantes:
+            time.sleep(pausa)
+
+    try:
+        origen.backup(destino, pages=paginas_por_paso, progress=registrar)
+    except _RespaldoReiniciado:
+        origen.backup(destino)
+        progreso["pasos"] += 1
+        progreso["paginas"] = destino.execute("PRAGMA page_count").fetchone()[0]
+    del progreso["restantes"]
+    return progreso
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def respaldo_verificar(ruta, rapida=False):
+    """
+    Verifica la integridad de un archivo de base de datos.
+
+    Args:
+        ruta (str): Archivo a verificar.
+        rapida (bool): Usa PRAGMA quick_check (no verifica el contenido de los índices) en lugar de integrity_check.
+
+    Returns:
+        tuple: (ok, problemas, segundos). problemas es la lista de mensajes de SQLite (vacía si ok es True).
+    """
+    inicio = time.perf_counter()
+    conexion = _respaldo_conectar(ruta, solo_lectura=True)
+    try:
+        mensajes = [fila[0] for fila in conexion.execute("PRAGMA quick_check" if rapida else "PRAGMA integrity_check")]
+    finally:
+        conexion.close()
+    problemas = [] if mensajes == ["ok"] else mensajes
+    return not problemas, problemas, time.perf_counter() - inicio
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def respaldo_crear(ruta, compactar=False, verificar=True, paginas_por_paso=RESPALDO_PAGINAS_POR_PASO,
+                   pausa=RESPALDO_PAUSA):
+    """
+    Crea un respaldo de la base de datos actual (DB_PATH) sin detener a los demás procesos.
+
+    Args:
+        ruta (str): Archivo de destino. Si existe, se reemplaza solo cuando el nuevo respaldo está completo y verificado.
+        compactar (bool): Usa VACUUM INTO en lugar de la API de respaldo en línea.
+        verificar (bool): Ejecuta PRAGMA integrity_check sobre la copia antes de reemplazar el destino.
+        paginas_por_paso (int): Páginas copiadas en cada paso (solo sin compactar).
+        pausa (float): Segundos de espera entre pasos (solo sin compactar).
+
+    Returns:
+        dict: Resumen con metodo, paginas, pasos, reinicios, bytes, segundos_copia, segundos_verificacion y segundos.
+
+    Raises:
+        RuntimeError: Si la verificación de la copia falla (el destino no se modifica).
+    """
+    if os.path.abspath(ruta) == os.path.abspath(funcionesDataBase.DB_PATH):
+        raise ValueError("El respaldo no puede escribirse sobre la base de datos en uso.")
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    temporal = ruta + ".tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+
+    inicio = time.perf_counter()
+    origen = _respaldo_conectar(funcionesDataBase.DB_PATH, solo_lectura=True)
+    try:
+        if compactar:
+            origen.execute("VACUUM INTO ?", (temporal,))
+            destino = _respaldo_conectar(temporal)
+            paginas = destino.execute("PRAGMA page_count").fetchone()[0]
+            destino.close()
+            resumen = {"metodo": "vacuum", "paginas": paginas, "pasos": 1, "reinicios": 0}
+        else:
+            destino = _respaldo_conectar(temporal)
+            try:
+                resumen = {"metodo": "backup", **_respaldo_copiar(origen, destino, paginas_por_paso, pausa)}
+                # La copia es un archivo independiente: sin WAL, para poder moverlo o copiarlo tal cual.
+                destino.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                destino.close()
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    finally:
+        origen.close()
+    resumen["segundos_copia"] = time.perf_counter() - inicio
+
+    resumen["segundos_verificacion"] = 0.0
+    if verificar:
+        ok, problemas, resumen["segundos_verificacion"] = respaldo_verificar(temporal)
+        if not ok:
+            os.remove(temporal)
+            raise RuntimeError(f"La copia no pasó la verificación de integridad: {'; '.join(problemas[:5])}")
+
+    os.replace(temporal, ruta)
+    resumen["bytes"] = os.path.getsize(ruta)
+    resumen["segundos"] = time.perf_counter() - inicio
+    return resumen
+
+
+#---------------------------------------------------------------------------------------------------------------------
+@metricas_medir()
+def respaldo_restaurar(ruta, verificar=True, paginas_por_paso=RESPALDO_PAGINAS_POR_PASO):
+    """
+    Reemplaza el contenido de la base de datos actual (DB_PATH) por el de un respaldo.
+    La copia se hace con la API de respaldo en línea sobre la base abierta, de modo que los demás procesos no quedan
+    con un archivo a medio escribir: esperan a que termine y luego ven el contenido restaurado.
+    Si el respaldo es de una versión anterior del esquema, se aplican las migraciones pendientes. Los consumidores
+    del registro de cambios (funcionesCambios) reciben "reiniciar" en su próxima lectura.
+
+    Args:
+        ruta (str): Archivo de respaldo.
+        verificar (bool): Verifica la integridad del respaldo antes de restaurarlo y de la base al terminar.
+        paginas_por_paso (int): Páginas copiadas en cada paso.
+
+    Returns:
+        dict: Resumen con paginas, pasos, bytes, segundos_verificacion, segundos_copia y segundos.
+
+    Raises:
+        FileNotFoundError: Si el respaldo no existe.
+        RuntimeError: Si el respaldo (o la base restaurada) no pasa la verificación de integridad.
+    """
+    if not os.path.isfile(ruta):
+        raise FileNotFoundError(f"No se encontró el respaldo '{ruta}'.")
+    inicio = time.perf_counter()
+    resumen = {"segundos_verificacion": 0.0}
+    if verificar:
+        ok, problemas, resumen["segundos_verificacion"] = respaldo_verificar(ruta)
+        if not ok:
+            raise RuntimeError(f"El respaldo no pasó la verificación de integridad: {'; '.join(problemas[:5])}")
+
+    inicio_copia = time.perf_counter()
+    # Las conexiones del pool se vuelven a abrir sobre la base restaurada.
+    db_cerrar_conexiones()
+    origen = _respaldo_conectar(ruta, solo_lectura=True)
+    destino = _respaldo_conectar(funcionesDataBase.DB_PATH)
+    try:
+        ultima_secuencia = cambios_ultima_secuencia(destino)
+        resumen.update(_respaldo_copiar(origen, destino, paginas_por_paso, 0.0))
+    finally:
+        origen.close()
+        destino.close()
+    db_cache_limpiar()
+    db_crear_tabla_productos()
+    # El registro de cambios restaurado es el del respaldo: la secuencia retrocedería y los consumidores no sabrían
+    # que los productos cambiaron. Se adelanta por encima de la anterior y se les indica volver a copiar la tabla.
+    cambios_reiniciar(ultima_secuencia)
+    resumen["segundos_copia"] = time.perf_counter() - inicio_copia
+
+    if verificar:
+        ok, problemas, segundos = respaldo_verificar(funcionesDataBase.DB_PATH)
+        resumen["segundos_verificacion"] += segundos
+        if not ok:
+            raise RuntimeError(f"La base restaurada no pasó la verificación de integridad: {'; '.join(problemas[:5])}")
+
+    resumen["bytes"] = os.path.getsize(funcionesDataBase.DB_PATH)
+    resumen["segundos"] = time.perf_counter() - inicio
+    return resumen
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def respaldo_mostrar_resumen(resumen):
+    """
+    Muestra en consola el resultado de un respaldo o una restauración.
+    """
+    metodo = f" ({resumen['metodo']})" if "metodo" in resumen else ""
+    reinicios = f", {resumen['reinicios']} reinicios" if resumen.get("reinicios") else ""
+    print(f"Páginas copiadas{metodo}: {resumen['paginas']} en {resumen['pasos']} pasos{reinicios}")
+    print(f"Tamaño: {resumen['bytes'] / 1048576:.2f} MiB")
+    print(f"Tiempos: copia {resumen['segundos_copia']:.3f} s, verificación {resumen['segundos_verificacion']:.3f} s, "
+          f"total {resumen['segundos']:.3f} s")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para respaldar, restaurar o verificar desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Respaldo en línea y restauración de la base de datos.")
+    parser.add_argument("--db", help="Base de datos (por defecto, inventario.db en el directorio actual).")
+    subparsers = parser.add_subparsers(dest="accion", required=True)
+    sub = subparsers.add_parser("crear", help="Crea un respaldo.")
+    sub.add_argument("archivo")
+    sub.add_argument("--compactar", action="store_true", help="Usa VACUUM INTO (copia compacta).")
+    sub.add_argument("--paginas", type=int, default=RESPALDO_PAGINAS_POR_PASO, help="Páginas por paso.")
+    sub.add_argument("--pausa", type=float, default=RESPALDO_PAUSA, help="Segundos de pausa entre pasos.")
+    sub.add_argument("--sin-verificar", action="store_true", dest="sin_verificar")
+    sub = subparsers.add_parser("restaurar", help="Restaura un respaldo sobre la base de datos.")
+    sub.add_argument("archivo")
+    sub.add_argument("--sin-verificar", action="store_true", dest="sin_verificar")
+    sub = subparsers.add_parser("verificar", help="Verifica la integridad de un archivo de base de datos.")
+    sub.add_argument("archivo")
+    args = parser.parse_args()
+
+    if args.db:
+        funcionesDataBase.DB_PATH = args.db
+    try:
+        if args.accion == "verificar":
+            ok, problemas, segundos = respaldo_verificar(args.archivo)
+            print(f"'{args.archivo}': {'íntegro' if ok else 'con errores'} ({segundos:.3f} s)")
+            for problema in problemas:
+                print(f"  {problema}")
+            return 0 if ok else 1
+        if args.accion == "crear":
+            resumen = respaldo_crear(args.archivo, args.compactar, not args.sin_verificar, args.paginas, args.pausa)
+            print(f"Respaldo creado en '{args.archivo}'.")
+        else:
+            resumen = respaldo_restaurar(args.archivo, not args.sin_verificar)
+            print(f"Base '{funcionesDataBase.DB_PATH}' restaurada desde '{args.archivo}'.")
+    except (OSError, RuntimeError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        db_cerrar_conexiones()
+    respaldo_mostrar_resumen(resumen)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,10 +3,353 @@ Módulo: funcionesValidacion.py
 Descripción: Este módulo contiene funciones para validar datos ingresados por el usuario.
 Incluye validaciones para asegurar que los datos como el nombre, descripción, categoría, cantidad y precio sean correctos y estén en el formato adecuado.
 Además, incluye una opción para verificar si un producto ya existe en la base de datos antes de permitir su inserción.
+
+Las reglas están implementadas en validadores puros (sin input() ni print()), en dos versiones con los mismos
+códigos de error:
+    - Por columnas (validacion_columna_*): reciben la lista de valores de un campo y retornan los valores
+      normalizados junto con una máscara de errores (un bytearray con un código por fila, 0 si la fila es válida).
+      El importador valida así cada bloque de filas con validacion_columnas_productos().
+    - Por valor (validacion_valor_*): validan un único valor. Las usan las funciones interactivas y
+      validacion_registro_producto() (la API y la línea de comandos), donde armar columnas de un elemento
+      costaría más que validar directamente.
 """
 
+import math
+import operator
+from array import array
+from itertools import repeat
+
 from funcionesDataBase import db_producto_existe  # Importa función para verificar existencia.
 
+# Códigos de las máscaras de errores.
+VALIDACION_OK = 0
+VALIDACION_NULO = 1    # Dato nulo en un campo obligatorio.
+VALIDACION_TIPO = 2    # El valor no se puede convertir al tipo del campo.
+VALIDACION_RANGO = 3   # El valor se convirtió pero no es mayor a 0 (o no entra en 64 bits, o no es finito).
+
+# Campos validados, en el orden en que se informa el primer error de una fila.
+VALIDACION_CAMPOS = ("nombre", "categoria", "cantidad", "precio")
+
+# Mensajes de error de los validadores puros, por campo y código ({valor} es el valor original).
+VALIDACION_MENSAJES = {
+    ("nombre", VALIDACION_NULO): "nombre: no se admite dato nulo",
+    ("categoria", VALIDACION_NULO): "categoria: no se admite dato nulo",
+    ("cantidad", VALIDACION_TIPO): "cantidad: tipo de dato no válido ({valor!r})",
+    ("cantidad", VALIDACION_RANGO): "cantidad: debe ser un número entero mayor a 0",
+    ("precio", VALIDACION_TIPO): "precio: tipo de dato no válido ({valor!r})",
+    ("precio", VALIDACION_RANGO): "precio: debe ser un número mayor a 0",
+}
+
+# Tablas para bytes.translate: convierten "es mayor a 0" (1/0) en código de error y cualquier código en 1/0.
+_TABLA_RANGO = bytes([VALIDACION_RANGO, VALIDACION_OK]) + bytes(254)
+_TABLA_INVALIDO = bytes([0]) + bytes([1]) * 255
+
+# Mayor cantidad admitida: la de un entero con signo de 64 bits (el tipo de las columnas array("q") y de SQLite).
+_VALIDACION_ENTERO_MAXIMO = 2 ** 63 - 1
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _validacion_indices(mascara, valor):
+    """
+    Generador con las posiciones de la máscara que contienen el valor indicado (la búsqueda la hace bytearray.find,
+    así que solo se recorren en Python las filas encontradas).
+    """
+    indice = mascara.find(valor)
+    while indice != -1:
+        yield indice
+        indice = mascara.find(valor, indice + 1)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _validacion_convertir(tipo, conversion, valores):
+    """
+    Convierte una columna a números con conversion(str(valor).strip()) y arma su máscara de errores.
+
+    La conversión la hace array.extend() sobre un map() (sin bucle en Python). Si un valor no se puede convertir,
+    extend() se interrumpe con los valores anteriores ya agregados: la fila fallida se marca y la conversión
+    continúa desde la siguiente, así que solo las filas con error cuestan una excepción.
+
+    Args:
+        tipo (str): Código de tipo del array ("q" para enteros, "d" para reales).
+        conversion (callable): int o float.
+        valores (list): Valores de la columna.
+
+    Returns:
+        tuple: (array con 0 en las filas con error, bytearray con el código de error de cada fila).
+    """
+    convertidos = array(tipo)
+    fallidos = {}
+    pendientes = map(conversion, map(str.strip, map(str, valores)))
+    while True:
+        try:
+            convertidos.extend(pendientes)
+            break
+        except ValueError:
+            fallidos[len(convertidos)] = VALIDACION_TIPO
+        except OverflowError:  # El entero no entra en 64 bits.
+            fallidos[len(convertidos)] = VALIDACION_RANGO
+        convertidos.append(0)
+
+    if tipo == "q":
+        en_rango = map((0).__lt__, convertidos)
+    else:
+        # float() acepta "inf", "nan" y "1e400" (infinito): un real además debe ser finito.
+        en_rango = map(operator.and_, map((0.0).__lt__, convertidos), map(math.isfinite, convertidos))
+    errores = bytearray(en_rango).translate(_TABLA_RANGO)
+    for indice, codigo in fallidos.items():
+        errores[indice] = codigo
+    return convertidos, errores
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_columna_texto(valores):
+    """
+    Valida una columna de texto obligatoria (nombre o categoría).
+    - Los valores se convierten a texto y se quitan los espacios en los extremos.
+    - No se admite dato nulo (None, cadena vacía o solo espacios).
+
+    Args:
+        valores (list): Valores de la columna.
+
+    Returns:
+        tuple: (textos, errores). textos es la lista de valores normalizados y errores un bytearray
+               con VALIDACION_NULO en las filas vacías.
+    """
+    try:
+        textos = list(map(str.strip, valores))
+    except TypeError:  # Hay valores que no son texto.
+        textos = [str(valor or "").strip() for valor in valores]
+    return textos, bytearray(map(operator.not_, textos))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_columna_descripcion(valores):
+    """
+    Normaliza una columna de descripciones. Se admite dato nulo, por lo que no genera errores.
+
+    Args:
+        valores (list): Valores de la columna.
+
+    Returns:
+        list: Descripciones normalizadas (cadena vacía para los valores nulos).
+    """
+    try:
+        return list(map(str.strip, valores))
+    except TypeError:
+        return [str(valor or "").strip() for valor in valores]
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_columna_cantidad(valores):
+    """
+    Valida una columna de cantidades.
+    - No se admite dato nulo.
+    - La cantidad debe ser un número entero mayor a 0.
+
+    Args:
+        valores (list): Valores de la columna (texto o números).
+
+    Returns:
+        tuple: (cantidades, errores). cantidades es un array('q') con 0 en las filas con error y errores un
+               bytearray con VALIDACION_TIPO o VALIDACION_RANGO en esas filas.
+    """
+    return _validacion_convertir("q", int, valores)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_columna_precio(valores):
+    """
+    Valida una columna de precios.
+    - No se admite dato nulo.
+    - El precio debe ser un número entero o float finito mayor a 0.
+
+    Args:
+        valores (list): Valores de la columna (texto o números).
+
+    Returns:
+        tuple: (precios, errores). precios es un array('d') con 0.0 en las filas con error y errores un
+               bytearray con VALIDACION_TIPO o VALIDACION_RANGO en esas filas.
+    """
+    return _validacion_convertir("d", float, valores)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_valor_texto(valor):
+    """
+    Valida un texto obligatorio (nombre o categoría), con las reglas de validacion_columna_texto().
+
+    Args:
+        valor: Valor a validar.
+
+    Returns:
+        tuple: (texto normalizado, VALIDACION_OK o VALIDACION_NULO).
+    """
+    texto = valor.strip() if isinstance(valor, str) else str(valor or "").strip()
+    return texto, VALIDACION_OK if texto else VALIDACION_NULO
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_valor_descripcion(valor):
+    """
+    Normaliza una descripción, con las reglas de validacion_columna_descripcion() (se admite dato nulo).
+
+    Args:
+        valor: Valor a normalizar.
+
+    Returns:
+        str: Descripción normalizada (cadena vacía para un valor nulo).
+    """
+    return valor.strip() if isinstance(valor, str) else str(valor or "").strip()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def _validacion_valor_numero(conversion, valor, maximo=None):
+    """
+    Convierte un valor con conversion(str(valor).strip()) y verifica que sea mayor a 0 (y no supere 'maximo').
+    Los reales además deben ser finitos. Retorna (número, código), con 0 como número si no se pudo convertir.
+    """
+    try:
+        numero = conversion(str(valor).strip())
+    except ValueError:
+        return 0, VALIDACION_TIPO
+    except OverflowError:
+        return 0, VALIDACION_RANGO
+    if maximo is not None and numero > maximo:
+        return 0, VALIDACION_RANGO
+    if isinstance(numero, float) and not math.isfinite(numero):
+        return 0, VALIDACION_RANGO
+    return numero, VALIDACION_OK if numero > 0 else VALIDACION_RANGO
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_valor_cantidad(valor):
+    """
+    Valida una cantidad, con las reglas de validacion_columna_cantidad() (entero mayor a 0 que entre en 64 bits).
+
+    Args:
+        valor: Valor a validar (texto o número).
+
+    Returns:
+        tuple: (cantidad, código), con código VALIDACION_OK, VALIDACION_TIPO o VALIDACION_RANGO.
+    """
+    return _validacion_valor_numero(int, valor, _VALIDACION_ENTERO_MAXIMO)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_valor_precio(valor):
+    """
+    Valida un precio, con las reglas de validacion_columna_precio() (número finito mayor a 0).
+
+    Args:
+        valor: Valor a validar (texto o número).
+
+    Returns:
+        tuple: (precio, código), con código VALIDACION_OK, VALIDACION_TIPO o VALIDACION_RANGO.
+
+    """
+    return _validacion_valor_numero(float, valor)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_registros_a_columnas(registros):
+    """
+    Convierte una lista de registros (diccionarios) en columnas, una lista de valores por campo.
+    Los campos ausentes en un registro se toman como None.
+
+    Args:
+        registros (list): Lista de diccionarios con las claves nombre, descripcion, categoria, cantidad y precio.
+
+    Returns:
+        dict: {campo: lista de valores}.
+    """
+    campos = ("nombre", "descripcion", "categoria", "cantidad", "precio")
+    return {campo: list(map(dict.get, registros, repeat(campo))) for campo in campos}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_columnas_productos(columnas):
+    """
+    Valida un lote de productos organizado por columnas, sin solicitar datos al usuario.
+    Aplica las mismas reglas que las funciones interactivas:
+    - nombre y categoria: no se admite dato nulo.
+    - descripcion: se admite dato nulo.
+    - cantidad: número entero mayor a 0.
+    - precio: número entero o float mayor a 0.
+
+    Args:
+        columnas (dict): {campo: lista de valores}, con la misma cantidad de filas en cada campo.
+                         La columna descripcion es opcional.
+
+    Returns:
+        dict: Valores normalizados por campo (nombre, descripcion, categoria, cantidad, precio), "errores"
+              ({campo: bytearray con el código de error de cada fila}), "invalidos" (bytearray con 1 en las
+              filas que tienen algún error) y "validos" (cantidad de filas sin errores).
+    """
+    cantidad_filas = len(columnas["nombre"])
+    resultado = {"errores": {}}
+    resultado["nombre"], resultado["errores"]["nombre"] = validacion_columna_texto(columnas["nombre"])
+    resultado["descripcion"] = validacion_columna_descripcion(columnas.get("descripcion") or [None] * cantidad_filas)
+    resultado["categoria"], resultado["errores"]["categoria"] = validacion_columna_texto(columnas["categoria"])
+    resultado["cantidad"], resultado["errores"]["cantidad"] = validacion_columna_cantidad(columnas["cantidad"])
+    resultado["precio"], resultado["errores"]["precio"] = validacion_columna_precio(columnas["precio"])
+
+    # Las máscaras se combinan como enteros grandes (un OR de todas las filas a la vez).
+    combinadas = 0
+    for errores in resultado["errores"].values():
+        combinadas |= int.from_bytes(errores, "little")
+    invalidos = bytearray(combinadas.to_bytes(cantidad_filas, "little")).translate(_TABLA_INVALIDO)
+    resultado["invalidos"] = invalidos
+    resultado["validos"] = invalidos.count(0)
+    return resultado
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_error_fila(columnas, resultado, indice):
+    """
+    Retorna el mensaje del primer error de una fila (en el orden de VALIDACION_CAMPOS).
+
+    Args:
+        columnas (dict): Columnas originales pasadas a validacion_columnas_productos().
+        resultado (dict): Resultado de validacion_columnas_productos().
+        indice (int): Número de fila (desde 0).
+
+    Returns:
+        str: Mensaje de error, o None si la fila es válida.
+    """
+    for campo in VALIDACION_CAMPOS:
+        codigo = resultado["errores"][campo][indice]
+        if codigo != VALIDACION_OK:
+            return VALIDACION_MENSAJES[campo, codigo].format(valor=columnas[campo][indice])
+    return None
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_lote_productos(registros):
+    """
+    Valida una lista de registros por columnas y retorna un resultado por registro.
+
+    Conviene para lotes chicos o medianos. Con lotes muy grandes, armar un diccionario y una tupla por fila cuesta
+    más que la validación (el recolector de ciclos recorre el lote completo varias veces mientras crece): para esos
+    casos conviene validacion_columnas_productos(), como hace el importador de a bloques.
+
+    Args:
+        registros (list): Lista de diccionarios con las claves nombre, descripcion, categoria, cantidad y precio.
+
+    Returns:
+        list: Una tupla (producto, error) por registro, con el mismo formato que validacion_registro_producto().
+    """
+    columnas = validacion_registros_a_columnas(registros)
+    resultado = validacion_columnas_productos(columnas)
+    filas = zip(resultado["nombre"], resultado["descripcion"], resultado["categoria"],
+                resultado["cantidad"], resultado["precio"])
+    validados = [({"nombre": nombre, "descripcion": descripcion, "categoria": categoria,
+                   "cantidad": cantidad, "precio": precio}, None)
+                 for nombre, descripcion, categoria, cantidad, precio in filas]
+    for indice in _validacion_indices(resultado["invalidos"], 1):
+        validados[indice] = (None, validacion_error_fila(columnas, resultado, indice))
+    return validados
+
+
 #---------------------------------------------------------------------------------------------------------------------
 def validacion_get_nombre(verificar_existencia=False):
     """
@@ -23,8 +366,8 @@ def validacion_get_nombre(verificar_existencia=False):
     """
     while True:
         try:
-            nombre = input("Nombre: ").strip()
-            if not nombre:
+            nombre, error = validacion_valor_texto(input("Nombre: "))
+            if error != VALIDACION_OK:
                 print("Error: No se admite dato nulo. Por favor, ingrese un nombre.")
                 continue
 
@@ -49,8 +392,7 @@ def validacion_get_descripcion():
         str: Descripción del producto.
     """
     try:
-        descripcion = input("Descripción: ").strip()
-        return descripcion
+        return validacion_valor_descripcion(input("Descripción: "))
     except Exception as e:
         print(f"Error inesperado: {e}")
         return ""  # En caso de error, se retorna una cadena vacía.
@@ -68,8 +410,8 @@ def validacion_get_categoria():
     """
     while True:
         try:
-            categoria = input("Categoría: ").strip()
-            if categoria:
+            categoria, error = validacion_valor_texto(input("Categoría: "))
+            if error == VALIDACION_OK:
                 return categoria
             else:
                 print("Error: No se admite dato nulo. Por favor, ingrese una categoría.")
@@ -92,13 +434,13 @@ def validacion_get_cantidad(mensaje="Cantidad: "):
     """
     while True:
         try:
-            cantidad = int(input(f"{mensaje} ").strip())
-            if cantidad > 0:
+            cantidad, error = validacion_valor_cantidad(input(f"{mensaje} "))
+            if error == VALIDACION_OK:
                 return cantidad
-            else:
+            elif error == VALIDACION_RANGO:
                 print("Error: La cantidad debe ser un número entero mayor a 0.")
-        except ValueError:
-            print("Error: Tipo de dato no válido. Por favor, ingrese un número entero.")
+            else:
+                print("Error: Tipo de dato no válido. Por favor, ingrese un número entero.")
         except Exception as e:
             print(f"Error inesperado: {e}")
 
@@ -115,13 +457,42 @@ def validacion_get_precio():
     """
     while True:
         try:
-            precio = float(input("Precio: ").strip())
-            if precio > 0:
+            precio, error = validacion_valor_precio(input("Precio: "))
+            if error == VALIDACION_OK:
                 return precio
-            else:
+            elif error == VALIDACION_RANGO:
                 print("Error: El precio debe ser un número mayor a 0.")
-        except ValueError:
-            print("Error: Tipo de dato no válido. Por favor, ingrese un número válido.")
+            else:
+                print("Error: Tipo de dato no válido. Por favor, ingrese un número válido.")
         except Exception as e:
             print(f"Error inesperado: {e}")
 
+
+#---------------------------------------------------------------------------------------------------------------------
+def validacion_registro_producto(registro):
+    """
+    Valida un producto recibido como diccionario (por ejemplo, el cuerpo de una petición de la API)
+    aplicando las mismas reglas que las funciones interactivas, sin solicitar datos al usuario.
+    - nombre y categoria: no se admite dato nulo.
+    - descripcion: se admite dato nulo.
+    - cantidad: número entero mayor a 0.
+    - precio: número entero o float mayor a 0.
+
+    Args:
+        registro (dict): Diccionario con las claves nombre, descripcion, categoria, cantidad y precio.
+
+    Returns:
+        tuple: (producto, error). producto es un diccionario con los valores normalizados
+               (o None si hay error) y error es un mensaje (o None si el registro es válido).
+    """
+    errores = {}
+    nombre, errores["nombre"] = validacion_valor_texto(registro.get("nombre"))
+    categoria, errores["categoria"] = validacion_valor_texto(registro.get("categoria"))
+    cantidad, errores["cantidad"] = validacion_valor_cantidad(registro.get("cantidad"))
+    precio, errores["precio"] = validacion_valor_precio(registro.get("precio"))
+    for campo in VALIDACION_CAMPOS:
+        if errores[campo] != VALIDACION_OK:
+            return None, VALIDACION_MENSAJES[campo, errores[campo]].format(valor=registro.get(campo))
+    producto = {"nombre": nombre, "descripcion": validacion_valor_descripcion(registro.get("descripcion")),
+                "categoria": categoria, "cantidad": cantidad, "precio": precio}
+    return producto, None
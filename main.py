@@ -5,9 +5,10 @@ Inicia el menú principal y permite al usuario interactuar con diversas funcione
 Las opciones del menú son manejadas a través de un bucle interactivo que se repite hasta que el usuario decide salir.
 """
 
-# Importamos las funciones necesarias del módulo `funcionesMenu`.
-from funcionesMenu import*
-from funcionesDataBase import db_crear_tabla_productos
+import sys
+
+# Los módulos del menú (y colorama) se importan dentro de main(): las invocaciones desde la línea de
+# comandos no los necesitan y así arrancan más rápido.
 
 
 #---------------------------------------------------------------------------------------------------------------------
@@ -23,6 +24,25 @@ def main():
 
         Maneja errores y asegura una experiencia de usuario fluida.
         """
+    # Importamos las funciones necesarias del módulo `funcionesMenu`.
+    from funcionesMenu import (
+        menu_actualizar_producto,
+        menu_aplicar_movimientos,
+        menu_buscar_producto,
+        menu_buscar_productos_texto,
+        menu_eliminar_producto,
+        menu_importar_productos,
+        menu_metricas_rendimiento,
+        menu_mostrar_opciones,
+        menu_mostrar_productos,
+        menu_pronostico_reposicion,
+        menu_registrar_producto,
+        menu_reporte_bajo_stock,
+        menu_reportes_valorizacion,
+        menu_respaldo_base_datos,
+    )
+    from funcionesDataBase import db_crear_tabla_productos, db_cerrar_conexiones
+
     try:
         # Inicializamos la base de datos y creamos la tabla si no existe.
         db_crear_tabla_productos()
@@ -51,6 +71,20 @@ def main():
                 elif opcion == "7":
                     print("Gracias por usar el sistema. ¡Hasta luego!")
                     break
+                elif opcion == "8":
+                    menu_importar_productos()
+                elif opcion == "9":
+                    menu_buscar_productos_texto()
+                elif opcion == "10":
+                    menu_aplicar_movimientos()
+                elif opcion == "11":
+                    menu_reportes_valorizacion()
+                elif opcion == "12":
+                    menu_metricas_rendimiento()
+                elif opcion == "13":
+                    menu_respaldo_base_datos()
+                elif opcion == "14":
+                    menu_pronostico_reposicion()
                 else:
                     print("Opción no válida. Por favor, elija una opción válida.")
 
@@ -66,9 +100,16 @@ def main():
     except Exception as e:
         #Manejamos errores globales al iniciar el programa.
         print(f"Error crítico al iniciar el programa: {e}")
+    finally:
+        # Cerramos las conexiones que quedaron abiertas en el pool.
+        db_cerrar_conexiones()
 
 # =============================================================================
 # INVOCAMOS LA FUNCIÓN PRINCIPAL
 # =============================================================================
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Con argumentos se usa la interfaz no interactiva (ver funcionesCli.py).
+        from funcionesCli import cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     main()  # Llamado de la función principal.
\ No newline at end of file
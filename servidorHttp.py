@@ -0,0 +1,308 @@
+"""
+Módulo: servidorHttp.py
+Descripción: Servidor HTTP local (solo biblioteca estándar) que expone el inventario como una API JSON, para que
+otros procesos lo consulten sin abrir inventario.db por su cuenta. Cada petición se atiende en su propio hilo y
+todas comparten el pool de conexiones de funcionesDataBase. Las respuestas GET incluyen un ETag: si el cliente
+envía If-None-Match con el mismo valor, se responde 304 sin cuerpo.
+
+Endpoints:
+    GET    /productos?despues_de=ID&limite=N   Página de productos (orden por id).
+    GET    /productos/ID                       Un producto.
+    POST   /productos[?upsert=1]               Alta (o alta/actualización) de un producto. Cuerpo JSON.
+    PATCH  /productos/ID                       {"cantidad": N[, "version": V]} o {"variacion": +/-N}.
+    DELETE /productos/ID                       Baja de un producto.
+    GET    /buscar?q=texto&limite=N            Búsqueda por nombre, descripción o categoría.
+    GET    /reportes/bajo-stock?minimo=N       Reporte de bajo stock.
+    GET    /cambios?desde=S&limite=N&espera=T  Cambios posteriores a la secuencia S. Si no hay, espera hasta T
+                                               segundos a que llegue alguno (long polling; sin ETag).
+
+Uso:
+    python servidorHttp.py --puerto 8080
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import funcionesDataBase
+from funcionesCambios import CAMBIOS_LIMITE, cambios_esperar
+from funcionesDataBase import (
+    DB_ENTERO_MAXIMO,
+    DB_ENTERO_MINIMO,
+    ErrorBaseDatos,
+    db_actualizar_producto,
+    db_actualizar_producto_version,
+    db_buscar_productos,
+    db_crear_tabla_productos,
+    db_eliminar_producto,
+    db_get_pagina_productos,
+    db_get_producto_by_id,
+    db_get_productos_by_condicion,
+    db_get_umbral_bajo_stock,
+    db_incrementar_cantidad,
+    db_insertar_producto,
+    db_upsert_producto,
+)
+from funcionesValidacion import validacion_registro_producto
+
+SERVIDOR_LIMITE_PAGINA = 100      # Productos por página por defecto.
+SERVIDOR_LIMITE_MAXIMO = 1000     # Tope de productos por página.
+SERVIDOR_ESPERA_MAXIMA = 30       # Tope en segundos de la espera de /cambios.
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class _ErrorHttp(Exception):
+    """
+    Error que se responde al cliente con el código de estado indicado.
+    """
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class ManejadorInventario(BaseHTTPRequestHandler):
+    """
+    Atiende las peticiones HTTP del inventario. Usa HTTP/1.1 para que los clientes puedan
+    reutilizar la conexión entre peticiones.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "InventarioHTTP/1.0"
+    # Encabezados y cuerpo se envían en escrituras separadas: sin TCP_NODELAY, Nagle + ACK retardado
+    # agregan ~40 ms a cada respuesta en conexiones keep-alive.
+    disable_nagle_algorithm = True
+    silencioso = False
+
+    # Utilidades ----------------------------------------------------------------------------------------------------
+    def log_message(self, format, *args):
+        if not self.silencioso:
+            super().log_message(format, *args)
+
+    def _responder(self, estado, datos=None, etag=False):
+        cuerpo = b"" if datos is None else json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        if etag:
+            valor = '"' + hashlib.sha1(cuerpo).hexdigest() + '"'
+            if valor in [v.strip() for v in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_response(304)
+                self.send_header("ETag", valor)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(estado)
+        if etag:
+            self.send_header("ETag", valor)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _leer_json(self):
+        longitud = int(self.headers.get("Content-Length") or 0)
+        try:
+            datos = json.loads(self.rfile.read(longitud) or b"{}")
+        except json.JSONDecodeError as e:
+            raise _ErrorHttp(400, f"JSON no válido: {e.msg}")
+        if not isinstance(datos, dict):
+            raise _ErrorHttp(400, "se esperaba un objeto JSON")
+        return datos
+
+    def _ruta(self):
+        partes = urlsplit(self.path)
+        segmentos = [s for s in partes.path.split("/") if s]
+        parametros = {clave: valores[-1] for clave, valores in parse_qs(partes.query).items()}
+        return segmentos, parametros
+
+    @staticmethod
+    def _entero(valor, nombre):
+        # Se aceptan enteros JSON y texto (URL): int() truncaría un real y convertiría true/false en 1/0.
+        if isinstance(valor, bool) or not isinstance(valor, (int, str)):
+            raise _ErrorHttp(400, f"'{nombre}' debe ser un número entero")
+        try:
+            numero = int(valor)
+        except ValueError:
+            raise _ErrorHttp(400, f"'{nombre}' debe ser un número entero")
+        if not DB_ENTERO_MINIMO <= numero <= DB_ENTERO_MAXIMO:
+            raise _ErrorHttp(400, f"'{nombre}' está fuera de rango (entero de 64 bits)")
+        return numero
+
+    @classmethod
+    def _limite(cls, parametros, defecto):
+        limite = cls._entero(parametros.get("limite", defecto), "limite")
+        if limite < 1:
+            raise _ErrorHttp(400, "'limite' debe ser mayor a 0")
+        return min(limite, SERVIDOR_LIMITE_MAXIMO)
+
+    def _despachar(self, metodo):
+        try:
+            segmentos, parametros = self._ruta()
+            getattr(self, f"_{metodo}")(segmentos, parametros)
+        except _ErrorHttp as e:
+            self._responder(e.estado, {"error": str(e)})
+        except ErrorBaseDatos as e:
+            self._responder(409 if e.tipo == "integridad" else 503, e.a_dict())
+        except sqlite3.Error as e:
+            self._responder(503, {"error": f"error de base de datos: {e}"})
+
+    def do_GET(self):
+        self._despachar("get")
+
+    def do_POST(self):
+        self._despachar("post")
+
+    def do_PATCH(self):
+        self._despachar("patch")
+
+    def do_DELETE(self):
+        self._despachar("delete")
+
+    # Endpoints -----------------------------------------------------------------------------------------------------
+    def _get(self, segmentos, parametros):
+        if segmentos == ["productos"]:
+            limite = self._limite(parametros, SERVIDOR_LIMITE_PAGINA)
+            despues_de = parametros.get("despues_de")
+            clave = None
+            if despues_de is not None:
+                producto_id = self._entero(despues_de, "despues_de")
+                clave = (producto_id, producto_id)
+            filas, _, ultima_clave = db_get_pagina_productos(limite, despues_de=clave)
+            siguiente = ultima_clave[1] if ultima_clave and len(filas) == limite else None
+            self._responder(200, {"productos": [producto.a_dict() for producto in filas], "siguiente": siguiente}, etag=True)
+        elif len(segmentos) == 2 and segmentos[0] == "productos":
+            producto = db_get_producto_by_id(self._entero(segmentos[1], "id"))
+            if producto is None:
+                raise _ErrorHttp(404, "producto inexistente")
+            self._responder(200, producto.a_dict(), etag=True)
+        elif segmentos == ["buscar"]:
+            limite = self._limite(parametros, 20)
+            filas = db_buscar_productos(parametros.get("q", ""), limite)
+            self._responder(200, {"productos": [producto.a_dict() for producto in filas]}, etag=True)
+        elif segmentos == ["reportes", "bajo-stock"]:
+            minimo = parametros.get("minimo")
+            minimo = db_get_umbral_bajo_stock() if minimo is None else self._entero(minimo, "minimo")
+            filas = db_get_productos_by_condicion(minimo)
+            self._responder(200, {"minimo": minimo, "productos": [producto.a_dict() for producto in filas]}, etag=True)
+        elif segmentos == ["cambios"]:
+            desde = self._entero(parametros.get("desde", 0), "desde")
+            limite = self._limite(parametros, CAMBIOS_LIMITE)
+            espera = min(max(self._entero(parametros.get("espera", 0), "espera"), 0), SERVIDOR_ESPERA_MAXIMA)
+            self._responder(200, cambios_esperar(desde, limite, espera))
+        else:
+            raise _ErrorHttp(404, "ruta inexistente")
+
+    def _post(self, segmentos, parametros):
+        if segmentos != ["productos"]:
+            raise _ErrorHttp(404, "ruta inexistente")
+        producto, error = validacion_registro_producto(self._leer_json())
+        if error:
+            raise _ErrorHttp(400, error)
+        if parametros.get("upsert") in ("1", "true"):
+            resultado, producto_id = db_upsert_producto(producto)
+            if resultado is None:
+                raise _ErrorHttp(503, "no se pudo guardar el producto")
+            self._responder(201 if resultado == "insertado" else 200, {"resultado": resultado, "id": producto_id})
+            return
+        mensaje = db_insertar_producto(producto)
+        if "ya existe" in mensaje:
+            raise _ErrorHttp(409, mensaje)
+        if mensaje.startswith("Error"):
+            raise _ErrorHttp(503, mensaje)
+        self._responder(201, {"mensaje": mensaje})
+
+    def _patch(self, segmentos, parametros):
+        if len(segmentos) != 2 or segmentos[0] != "productos":
+            raise _ErrorHttp(404, "ruta inexistente")
+        producto_id = self._entero(segmentos[1], "id")
+        datos = self._leer_json()
+        if "variacion" in datos:
+            resultado, cantidad = db_incrementar_cantidad(producto_id, self._entero(datos["variacion"], "variacion"))
+            if resultado == "inexistente":
+                raise _ErrorHttp(404, "producto inexistente")
+            if resultado == "insuficiente":
+                raise _ErrorHttp(409, f"stock insuficiente (actual {cantidad})")
+        elif "cantidad" in datos:
+            cantidad = self._entero(datos["cantidad"], "cantidad")
+            if cantidad < 0:
+                raise _ErrorHttp(400, "la cantidad no puede ser negativa")
+            if "version" in datos:
+                resultado, version = db_actualizar_producto_version(producto_id, cantidad,
+                                                                    self._entero(datos["version"], "version"))
+                if resultado == "inexistente":
+                    raise _ErrorHttp(404, "producto inexistente")
+                if resultado == "conflicto":
+                    raise _ErrorHttp(409, f"el producto fue modificado (versión actual {version})")
+            elif not db_actualizar_producto(producto_id, cantidad):
+                raise _ErrorHttp(404, "producto inexistente")
+        else:
+            raise _ErrorHttp(400, "se esperaba 'cantidad' o 'variacion'")
+        producto = db_get_producto_by_id(producto_id)
+        if producto is None:
+            # Otro cliente lo eliminó entre la actualización y la relectura.
+            raise _ErrorHttp(404, "producto inexistente")
+        self._responder(200, producto.a_dict())
+
+    def _delete(self, segmentos, parametros):
+        if len(segmentos) != 2 or segmentos[0] != "productos":
+            raise _ErrorHttp(404, "ruta inexistente")
+        if not db_eliminar_producto(self._entero(segmentos[1], "id")):
+            raise _ErrorHttp(404, "producto inexistente")
+        self._responder(204)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def servidor_crear(host="127.0.0.1", puerto=8080, conexiones=8, silencioso=False, backend=None):
+    """
+    Crea el servidor HTTP (sin iniciarlo) e inicializa la base de datos.
+
+    Args:
+        host (str): Dirección en la que escuchar.
+        puerto (int): Puerto en el que escuchar (0 elige uno libre).
+        conexiones (int): Tamaño del pool de conexiones compartido por los hilos.
+        silencioso (bool): Si es True, no se registra cada petición en consola.
+        backend (str): Backend de almacenamiento (ver DB_BACKENDS; por defecto, el configurado).
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever().
+    """
+    if backend:
+        funcionesDataBase.db_usar_backend(backend)
+    funcionesDataBase.DB_POOL_TAMANIO = conexiones
+    funcionesDataBase.DB_LANZAR_ERRORES = True
+    db_crear_tabla_productos()
+    ManejadorInventario.silencioso = silencioso
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorInventario)
+    servidor.daemon_threads = True
+    return servidor
+
+
+#---------------------------------------------------------------------------------------------------------------------
+def main():
+    """
+    Punto de entrada para iniciar el servidor desde la terminal.
+    """
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del inventario.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--conexiones", type=int, default=8, help="Tamaño del pool de conexiones.")
+    parser.add_argument("--silencioso", action="store_true", help="No registrar cada petición.")
+    parser.add_argument("--backend", choices=funcionesDataBase.DB_BACKENDS,
+                        help="Almacenamiento (por defecto, el archivo SQLite). 'memoria' y 'diccionario' no persisten.")
+    args = parser.parse_args()
+
+    servidor = servidor_crear(args.host, args.puerto, args.conexiones, args.silencioso, args.backend)
+    print(f"Servidor escuchando en http://{args.host}:{servidor.server_address[1]} (Ctrl+C para detener)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor detenido.")
+    finally:
+        servidor.server_close()
+        funcionesDataBase.db_cerrar_conexiones()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Módulo: tests/test_async.py
+Descripción: Pruebas de la fachada asíncrona (funcionesAsync) sobre una base temporal (db_usar_backend), sin tocar
+inventario.db. Las lecturas lentas se simulan reemplazando la función de la base por una que espera un evento.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesAsync  # noqa: E402
+import funcionesDataBase  # noqa: E402
+from funcionesAsync import InventarioAsync  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestInventarioAsync(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        funcionesDataBase.db_usar_backend("disco", os.path.join(directorio.name, "inventario.db"))
+        funcionesDataBase.db_crear_tabla_productos()
+        funcionesDataBase.db_insertar_producto({"nombre": "Yerba", "descripcion": "", "categoria": "Almacen",
+                                                "cantidad": 10, "precio": 2500})
+        self.iniciada = threading.Event()
+        self.liberar = threading.Event()
+        self.consultas = 0
+
+    def _lectura_lenta(self, producto_id):
+        # La primera consulta lee el producto y recién lo entrega cuando la prueba lo indica.
+        self.consultas += 1
+        producto = funcionesDataBase.db_get_producto_by_id(producto_id)
+        if self.consultas == 1:
+            self.iniciada.set()
+            self.liberar.wait(10)
+        return producto
+
+    async def _esperar_lectura_iniciada(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.iniciada.wait, 10)
+
+    async def test_lecturas_simultaneas_se_agrupan(self):
+        with mock.patch.object(funcionesAsync, "db_get_producto_by_id", side_effect=self._lectura_lenta,
+                               __name__="db_get_producto_by_id"):
+            async with InventarioAsync(lectores=2) as inventario:
+                primera = asyncio.create_task(inventario.get_producto(1))
+                await self._esperar_lectura_iniciada()
+                segunda = asyncio.create_task(inventario.get_producto(1))
+                await asyncio.sleep(0)
+                self.liberar.set()
+                resultados = await asyncio.gather(primera, segunda)
+        self.assertEqual([producto.cantidad for producto in resultados], [10, 10])
+        self.assertEqual((self.consultas, inventario.lecturas_agrupadas), (1, 1))
+
+    async def test_lectura_posterior_a_una_escritura(self):
+        with mock.patch.object(funcionesAsync, "db_get_producto_by_id", side_effect=self._lectura_lenta,
+                               __name__="db_get_producto_by_id"):
+            async with InventarioAsync(lectores=2) as inventario:
+                anterior = asyncio.create_task(inventario.get_producto(1))
+                await self._esperar_lectura_iniciada()
+                # La lectura en curso ya leyó la cantidad anterior: quien escribe y luego lee no debe recibirla.
+                self.assertTrue(await inventario.actualizar(1, 25))
+                posterior = asyncio.create_task(inventario.get_producto(1))
+                await asyncio.sleep(0)
+                self.liberar.set()
+                self.assertEqual((await posterior).cantidad, 25)
+                self.assertEqual((await anterior).cantidad, 10)
+        self.assertEqual((self.consultas, inventario.lecturas_agrupadas), (2, 0))
+
+    async def test_cada_corrutina_recibe_su_lista(self):
+        async with InventarioAsync() as inventario:
+            resultados = await asyncio.gather(inventario.buscar("yerba"), inventario.buscar("yerba"))
+        self.assertEqual([[producto.nombre for producto in lista] for lista in resultados], [["Yerba"], ["Yerba"]])
+        self.assertIsNot(resultados[0], resultados[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
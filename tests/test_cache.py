@@ -0,0 +1,45 @@
+"""
+Módulo: tests/test_cache.py
+Descripción: Pruebas de CacheLRU (funcionesCache).
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from funcionesCache import SIN_VALOR, CacheLRU  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestCacheLRU(unittest.TestCase):
+
+    def test_descarta_el_menos_usado(self):
+        cache = CacheLRU(tamanio=2)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        self.assertEqual(cache.obtener("a"), 1)
+        cache.guardar("c", 3)
+        self.assertIs(cache.obtener("b"), SIN_VALOR)
+        self.assertEqual((cache.obtener("a"), cache.obtener("c")), (1, 3))
+        self.assertEqual(cache.estadisticas()["descartes"], 1)
+
+    def test_no_guarda_lo_leido_antes_de_una_invalidacion(self):
+        cache = CacheLRU()
+        for invalidar in (lambda: cache.invalidar("a"), lambda: cache.invalidar("otra"), cache.limpiar):
+            generacion = cache.generacion()
+            invalidar()
+            cache.guardar("a", "desactualizado", generacion)
+            self.assertIs(cache.obtener("a"), SIN_VALOR)
+        generacion = cache.generacion()
+        cache.guardar("a", "vigente", generacion)
+        self.assertEqual(cache.obtener("a"), "vigente")
+        # Sin generación se guarda siempre (escrituras que ya conocen el valor actual).
+        cache.invalidar("a")
+        cache.guardar("a", "nuevo")
+        self.assertEqual(cache.obtener("a"), "nuevo")
+
+
+if __name__ == "__main__":
+    unittest.main()
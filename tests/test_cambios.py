@@ -0,0 +1,60 @@
+"""
+Módulo: tests/test_cambios.py
+Descripción: Pruebas del registro de cambios (funcionesCambios), en el mismo proceso y con una base temporal
+(db_usar_backend), sin tocar inventario.db.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesDataBase  # noqa: E402
+from funcionesCambios import cambios_desde  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestCambios(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        self.ruta_db = os.path.join(directorio.name, "inventario.db")
+        funcionesDataBase.db_usar_backend("disco", self.ruta_db)
+        funcionesDataBase.db_crear_tabla_productos()
+
+    def _ejecutar_desde_otro_proceso(self, sql, parametros=()):
+        # Sin pasar por la validación, como una escritura hecha con SQL directamente.
+        conexion = sqlite3.connect(self.ruta_db)
+        with conexion:
+            conexion.execute(sql, parametros)
+        conexion.close()
+
+    def test_precio_infinito_no_interrumpe_el_registro(self):
+        self._ejecutar_desde_otro_proceso("INSERT INTO productos (nombre, categoria, cantidad, precio) "
+                                          "VALUES ('Infinito', 'Prueba', 1, ?)", (float("inf"),))
+        self._ejecutar_desde_otro_proceso("UPDATE productos SET precio = ? WHERE id = 1", (float("-inf"),))
+        self._ejecutar_desde_otro_proceso("UPDATE productos SET precio = 2 WHERE id = 1")
+        cambios = cambios_desde(0)["cambios"]
+        self.assertEqual([cambio["operacion"] for cambio in cambios], ["insert", "update", "update"])
+        self.assertEqual([(cambio["anterior"] or {}).get("precio") for cambio in cambios], [None, None, None])
+        self.assertEqual([cambio["nuevo"]["precio"] for cambio in cambios], [None, None, 2.0])
+        # El resultado se puede volver a enviar como JSON estricto (por ejemplo, desde el servidor HTTP).
+        json.dumps(cambios, allow_nan=False)
+
+    def test_infinitos_registrados_por_triggers_anteriores(self):
+        self._ejecutar_desde_otro_proceso(
+            "INSERT INTO cambios (producto_id, operacion, nuevo) VALUES (1, 'insert', ?)",
+            ('{"id":1,"nombre":"Inf, \\"x\\":Inf","precio":Inf,"cantidad":-Inf}',))
+        nuevo = cambios_desde(0)["cambios"][0]["nuevo"]
+        self.assertEqual(nuevo, {"id": 1, "nombre": 'Inf, "x":Inf', "precio": None, "cantidad": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
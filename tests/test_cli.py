@@ -0,0 +1,86 @@
+"""
+Módulo: tests/test_cli.py
+Descripción: Pruebas de la interfaz de línea de comandos (funcionesCli). Cada prueba ejecuta main.py en un proceso
+aparte con una base temporal (INVENTARIO_DB), sin tocar inventario.db.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta_db = os.path.join(self.directorio.name, "inventario.db")
+
+    def _ejecutar(self, *argumentos):
+        entorno = dict(os.environ, INVENTARIO_DB=self.ruta_db)
+        entorno.pop("INVENTARIO_METRICAS", None)
+        return subprocess.run([sys.executable, os.path.join(RAIZ, "main.py"), *argumentos], cwd=self.directorio.name,
+                              env=entorno, capture_output=True, text=True, timeout=60)
+
+    def _main(self, *argumentos):
+        proceso = self._ejecutar(*argumentos)
+        return proceso.returncode, [json.loads(linea) for linea in proceso.stdout.splitlines() if linea.startswith("{")]
+
+    def test_enteros_fuera_de_rango(self):
+        self.assertEqual(self._main("add", "--nombre", "A", "--categoria", "C", "--cantidad", "5", "--precio", "1")[0], 0)
+        for argumentos in (["update", "1", "--cantidad", str(10 ** 30)], ["update", "1", "--variacion", str(-10 ** 30)],
+                           ["update", "1", "--cantidad", "1", "--version", str(2 ** 63)], ["get", str(2 ** 63)],
+                           ["changes", "--desde", str(10 ** 30)], ["update", "1", "--cantidad", "2.9"]):
+            proceso = self._ejecutar(*argumentos)
+            self.assertEqual(proceso.returncode, 2, argumentos)
+            self.assertNotIn("Traceback", proceso.stderr)
+        codigo, filas = self._main("update", "1", "--cantidad", str(2 ** 63 - 1))
+        self.assertEqual((codigo, filas[0]["ok"]), (0, True))
+        self.assertEqual(self._main("get", "1")[1][0]["cantidad"], 2 ** 63 - 1)
+
+    def _archivo(self, nombre, contenido):
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, "wb") as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def test_importar_archivo_que_no_es_utf8(self):
+        ruta = self._archivo("productos.csv", "nombre,descripcion,categoria,cantidad,precio\n"
+                                              "Café,,Almacen,3,10\n".encode("latin-1"))
+        for argumentos in (["import", ruta], ["import", ruta, "--movimientos"]):
+            proceso = self._ejecutar(*argumentos)
+            self.assertEqual(proceso.returncode, 1, argumentos)
+            self.assertNotIn("Traceback", proceso.stderr)
+            resultado = json.loads(proceso.stdout)
+            self.assertFalse(resultado["ok"])
+            self.assertIn("UTF-8", resultado["error"])
+        proceso = subprocess.run([sys.executable, os.path.join(RAIZ, "funcionesImportacion.py"), ruta],
+                                 cwd=self.directorio.name, env=dict(os.environ, INVENTARIO_DB=self.ruta_db),
+                                 capture_output=True, text=True, timeout=60)
+        self.assertEqual(proceso.returncode, 1)
+        self.assertNotIn("Traceback", proceso.stderr)
+        self.assertIn("UTF-8", proceso.stdout)
+
+    def test_importar_con_filas_rechazadas(self):
+        ruta = self._archivo("productos.csv", "nombre,descripcion,categoria,cantidad,precio\n"
+                                              "Yerba,,Almacen,3,10\nSin cantidad,,Almacen,,10\nTé,,Almacen,2,5\n"
+                                              .encode("utf-8"))
+        codigo, filas = self._main("import", ruta)
+        self.assertEqual(codigo, 1)
+        self.assertEqual((filas[0]["ok"], filas[0]["insertados"], filas[0]["rechazados"]), (False, 2, 1))
+        _, filas = self._main("list", "--columnas", "nombre")
+        self.assertEqual([fila["nombre"] for fila in filas], ["Yerba", "Té"])
+        ruta = self._archivo("nuevos.csv", "nombre,descripcion,categoria,cantidad,precio\nMate,,Almacen,1,1\n"
+                                           .encode("utf-8"))
+        codigo, filas = self._main("import", ruta)
+        self.assertEqual((codigo, filas[0]["ok"], filas[0]["insertados"]), (0, True, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
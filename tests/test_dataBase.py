@@ -0,0 +1,449 @@
+"""
+Módulo: tests/test_dataBase.py
+Descripción: Pruebas de funcionesDataBase. Las altas se prueban a través de main.py en un proceso aparte con una base
+temporal (INVENTARIO_DB); las demás, en el mismo proceso con db_usar_backend. Ninguna toca inventario.db.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import funcionesDataBase  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestAltaProductos(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta_db = os.path.join(self.directorio.name, "inventario.db")
+
+    def _main(self, *argumentos):
+        entorno = dict(os.environ, INVENTARIO_DB=self.ruta_db)
+        entorno.pop("INVENTARIO_METRICAS", None)
+        proceso = subprocess.run([sys.executable, os.path.join(RAIZ, "main.py"), *argumentos], cwd=self.directorio.name,
+                                 env=entorno, capture_output=True, text=True, timeout=60)
+        return proceso.returncode, [json.loads(linea) for linea in proceso.stdout.splitlines() if linea.startswith("{")]
+
+    def _agregar(self, nombre, *opciones):
+        return self._main("add", "--nombre", nombre, "--categoria", "Prueba", "--cantidad", "1", "--precio", "1",
+                          *opciones)
+
+    def _ids(self):
+        _, filas = self._main("list", "--columnas", "id,nombre")
+        return [(fila["id"], fila["nombre"]) for fila in filas]
+
+    def test_duplicados_rechazados_no_consumen_ids(self):
+        self.assertEqual(self._agregar("A")[0], 0)
+        for _ in range(3):
+            codigo, filas = self._agregar("A")
+            self.assertEqual(codigo, 1)
+            self.assertIn("ya existe", filas[0]["mensaje"])
+        self.assertEqual(self._agregar("B")[0], 0)
+        self.assertEqual(self._ids(), [(1, "A"), (2, "B")])
+
+    def test_upsert_actualizado_no_consume_ids(self):
+        resultados = [self._agregar(nombre, "--upsert")[1][0] for nombre in ("A", "A", "A", "B")]
+        self.assertEqual([(fila["resultado"], fila["id"]) for fila in resultados],
+                         [("insertado", 1), ("actualizado", 1), ("actualizado", 1), ("insertado", 2)])
+        self.assertEqual(self._ids(), [(1, "A"), (2, "B")])
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestBaseTemporal(unittest.TestCase):
+    """
+    Base para las pruebas en el mismo proceso: un archivo temporal con tres productos (ids 1 a 3, cantidad 10).
+    """
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        self.ruta_db = os.path.join(directorio.name, "inventario.db")
+        funcionesDataBase.db_usar_backend("disco", self.ruta_db)
+        funcionesDataBase.db_crear_tabla_productos()
+        for nombre in ("Yerba", "Azúcar", "Café"):
+            funcionesDataBase.db_insertar_producto({"nombre": nombre, "descripcion": "", "categoria": "Almacen",
+                                                    "cantidad": 10, "precio": 100})
+
+    def _ejecutar_desde_otro_proceso(self, sql, parametros=()):
+        # Una conexión propia no pasa por la caché del proceso, como la escritura de otro programa.
+        conexion = sqlite3.connect(self.ruta_db)
+        with conexion:
+            conexion.execute(sql, parametros)
+        conexion.close()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestPoolConexiones(TestBaseTemporal):
+
+    def _cantidad(self, producto_id):
+        conexion = sqlite3.connect(self.ruta_db)
+        self.addCleanup(conexion.close)
+        return conexion.execute("SELECT cantidad FROM productos WHERE id = ?", (producto_id,)).fetchone()[0]
+
+    def test_reutiliza_las_conexiones(self):
+        with funcionesDataBase.db_conexion() as conexion:
+            with funcionesDataBase.db_conexion() as anidada:
+                self.assertIs(anidada, conexion)
+            self.assertEqual(conexion.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        with funcionesDataBase.db_conexion() as siguiente:
+            self.assertIs(siguiente, conexion)
+
+    def test_deshace_lo_no_confirmado(self):
+        with funcionesDataBase.db_conexion() as conexion:
+            conexion.execute("UPDATE productos SET cantidad = 1 WHERE id = 1")
+        self.assertFalse(conexion.in_transaction)
+        with self.assertRaises(ZeroDivisionError):
+            with funcionesDataBase.db_conexion() as conexion:
+                conexion.execute("UPDATE productos SET cantidad = 2 WHERE id = 1")
+                1 / 0
+        self.assertFalse(conexion.in_transaction)
+        self.assertEqual(self._cantidad(1), 10)
+        # La conexión volvió al pool y sigue pudiendo escribir.
+        self.assertTrue(funcionesDataBase.db_actualizar_producto(1, 3))
+        self.assertEqual(self._cantidad(1), 3)
+
+    def test_pool_lleno(self):
+        configuracion = mock.patch.multiple(funcionesDataBase, DB_POOL_TAMANIO=1, DB_POOL_TIMEOUT=0.05)
+        configuracion.start()
+        self.addCleanup(configuracion.stop)
+        funcionesDataBase.db_cerrar_conexiones()
+        resultados = []
+
+        def tomar():
+            try:
+                with funcionesDataBase.db_conexion() as conexion:
+                    resultados.append(conexion)
+            except sqlite3.OperationalError as e:
+                resultados.append(str(e))
+
+        with funcionesDataBase.db_conexion() as conexion:
+            hilo = threading.Thread(target=tomar)
+            hilo.start()
+            hilo.join()
+        hilo = threading.Thread(target=tomar)
+        hilo.start()
+        hilo.join()
+        self.assertIn("No hay conexiones libres", resultados[0])
+        self.assertIs(resultados[1], conexion)
+
+    def test_cambio_de_base(self):
+        with funcionesDataBase.db_conexion() as conexion:
+            funcionesDataBase.db_usar_backend("disco", os.path.join(os.path.dirname(self.ruta_db), "otra.db"))
+        # Al devolverla, la conexión de la base anterior se cierra en lugar de volver al pool.
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conexion.execute("SELECT 1")
+        with funcionesDataBase.db_conexion() as nueva:
+            self.assertIsNot(nueva, conexion)
+            self.assertEqual(nueva.execute("SELECT name FROM sqlite_master WHERE name = 'productos'").fetchall(), [])
+
+    def test_sin_pool(self):
+        with mock.patch.object(funcionesDataBase, "DB_USAR_POOL", False):
+            with funcionesDataBase.db_conexion() as primera:
+                pass
+            with funcionesDataBase.db_conexion() as segunda:
+                self.assertIsNot(segunda, primera)
+                self.assertEqual(segunda.execute("SELECT COUNT(*) FROM productos").fetchone()[0], 3)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            primera.execute("SELECT 1")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestCacheEscrituras(TestBaseTemporal):
+
+    def _modificar(self, cantidad):
+        self._ejecutar_desde_otro_proceso("UPDATE productos SET cantidad = ?, version = version + 1 WHERE id = 1",
+                                          (cantidad,))
+
+    def test_conflicto_invalida_la_cache(self):
+        version = funcionesDataBase.db_get_producto_by_id(1).version
+        self._modificar(4)
+        resultado, actual = funcionesDataBase.db_actualizar_producto_version(1, 7, version)
+        self.assertEqual((resultado, actual), ("conflicto", version + 1))
+        producto = funcionesDataBase.db_get_producto_by_id(1)
+        self.assertEqual((producto.cantidad, producto.version), (4, actual))
+        self.assertEqual(funcionesDataBase.db_actualizar_producto_version(1, 7, actual), ("actualizado", actual + 1))
+
+    def test_inexistente_invalida_la_cache(self):
+        version = funcionesDataBase.db_get_producto_by_id(1).version
+        self._ejecutar_desde_otro_proceso("DELETE FROM productos WHERE id = 1")
+        self.assertEqual(funcionesDataBase.db_actualizar_producto_version(1, 7, version), ("inexistente", None))
+        self.assertIsNone(funcionesDataBase.db_get_producto_by_id(1))
+
+    def test_insuficiente_invalida_la_cache(self):
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 10)
+        self._modificar(2)
+        self.assertEqual(funcionesDataBase.db_incrementar_cantidad(1, -5), ("insuficiente", 2))
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 2)
+
+    def test_invalidacion_durante_la_lectura(self):
+        # Otro hilo actualiza el producto e invalida la caché después de que la lectura tomó su instantánea: lo leído
+        # ya está desactualizado y no debe quedar guardado.
+        fabrica = funcionesDataBase.producto_row_factory
+
+        def escribir_mientras_se_lee(cursor, fila):
+            self._modificar(3)
+            funcionesDataBase.db_cache_invalidar(1)
+            return fabrica(cursor, fila)
+
+        with mock.patch.object(funcionesDataBase, "producto_row_factory", escribir_mientras_se_lee):
+            self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 10)
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 3)
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestPaginacion(TestBaseTemporal):
+
+    def setUp(self):
+        super().setUp()
+        # Diez productos en total, con precios repetidos para que el id tenga que desempatar.
+        for numero, precio in enumerate((50, 100, 50, 200, 100, 50, 300), start=4):
+            funcionesDataBase.db_insertar_producto({"nombre": f"Producto {numero}", "categoria": "Almacen",
+                                                    "cantidad": 1, "precio": precio})
+
+    def _recorrer(self, tamanio_pagina, **opciones):
+        paginas, clave = [], None
+        while True:
+            productos, _, clave = funcionesDataBase.db_get_pagina_productos(tamanio_pagina, despues_de=clave,
+                                                                            **opciones)
+            if not productos:
+                return paginas
+            paginas.append([producto.id for producto in productos])
+
+    def test_paginas_hacia_adelante(self):
+        for tamanio_pagina in (1, 3, 5, 10, 11):
+            paginas = self._recorrer(tamanio_pagina)
+            self.assertEqual(sum(paginas, []), list(range(1, 11)), tamanio_pagina)
+            self.assertTrue(all(len(pagina) == tamanio_pagina for pagina in paginas[:-1]))
+        # Después de la última fila no hay más páginas.
+        self.assertEqual(funcionesDataBase.db_get_pagina_productos(5, despues_de=(10, 10)), ([], None, None))
+
+    def test_orden_con_empates(self):
+        por_precio = sorted(funcionesDataBase.db_get_productos(), key=lambda producto: (producto.precio, producto.id))
+        esperado = [producto.id for producto in por_precio]
+        self.assertEqual(sum(self._recorrer(2, orden="precio"), []), esperado)
+        self.assertEqual(sum(self._recorrer(3, orden="precio", descendente=True), []), esperado[::-1])
+        self.assertEqual([producto.id for producto in funcionesDataBase.db_iter_productos(4, orden="precio")], esperado)
+
+    def test_pagina_anterior(self):
+        primera, _, ultima_clave = funcionesDataBase.db_get_pagina_productos(4, orden="precio")
+        segunda, primera_clave, _ = funcionesDataBase.db_get_pagina_productos(4, despues_de=ultima_clave,
+                                                                              orden="precio")
+        anterior, _, _ = funcionesDataBase.db_get_pagina_productos(4, antes_de=primera_clave, orden="precio")
+        self.assertEqual(anterior, primera)
+        self.assertNotIn(segunda[0], primera)
+        # Desde la primera página no se puede retroceder.
+        _, primera_clave, _ = funcionesDataBase.db_get_pagina_productos(4)
+        self.assertEqual(funcionesDataBase.db_get_pagina_productos(4, antes_de=primera_clave), ([], None, None))
+
+    def test_columnas_no_pedidas(self):
+        productos, _, _ = funcionesDataBase.db_get_pagina_productos(2, columnas=["nombre"])
+        self.assertEqual([(producto.id, producto.nombre, producto.precio) for producto in productos],
+                         [(None, "Yerba", None), (None, "Azúcar", None)])
+        with self.assertRaises(ValueError):
+            funcionesDataBase.db_get_pagina_productos(2, orden="descripcion")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestBusqueda(TestBaseTemporal):
+
+    def _buscar(self, texto):
+        return [producto.nombre for producto in funcionesDataBase.db_buscar_productos(texto)]
+
+    def test_prefijos_y_acentos(self):
+        funcionesDataBase.db_insertar_producto({"nombre": "Cafetera", "descripcion": "Para café molido",
+                                                "categoria": "Bazar", "cantidad": 1, "precio": 1})
+        self.assertEqual(sorted(self._buscar("caf")), ["Cafetera", "Café"])
+        self.assertEqual(sorted(self._buscar("CAFE")), ["Cafetera", "Café"])
+        self.assertEqual(self._buscar("caf baz"), ["Cafetera"])
+        self.assertEqual(self._buscar("azucar"), ["Azúcar"])
+        self.assertEqual(self._buscar("té"), [])
+        self.assertEqual(self._buscar("  ¿? "), [])
+        # El nombre pesa más que la descripción.
+        self.assertEqual(self._buscar("molido"), ["Cafetera"])
+        self.assertEqual(self._buscar("café")[0], "Café")
+
+    def test_triggers_mantienen_el_indice(self):
+        # Escrituras hechas con SQL directamente, sin pasar por las funciones db_*.
+        self._ejecutar_desde_otro_proceso("INSERT INTO productos (nombre, descripcion, categoria, cantidad, precio) "
+                                          "VALUES ('Mate', 'Calabaza', 'Bazar', 1, 1)")
+        self.assertEqual(self._buscar("calab"), ["Mate"])
+        self._ejecutar_desde_otro_proceso("UPDATE productos SET nombre = 'Yerba mate', descripcion = 'Suave' "
+                                          "WHERE id = 1")
+        self.assertEqual(sorted(self._buscar("mate")), ["Mate", "Yerba mate"])
+        self.assertEqual(self._buscar("suav"), ["Yerba mate"])
+        self._ejecutar_desde_otro_proceso("UPDATE productos SET cantidad = 0 WHERE id = 1")
+        self.assertEqual(self._buscar("yerba"), ["Yerba mate"])
+        self._ejecutar_desde_otro_proceso("DELETE FROM productos WHERE nombre = 'Mate'")
+        self.assertEqual(self._buscar("calab"), [])
+        self.assertEqual(self._buscar("mate"), ["Yerba mate"])
+
+    def test_base_existente_se_indexa(self):
+        # Una base creada por la versión original (solo la tabla productos) se indexa al migrarla.
+        ruta = os.path.join(os.path.dirname(self.ruta_db), "original.db")
+        conexion = sqlite3.connect(ruta)
+        with conexion:
+            conexion.execute("CREATE TABLE productos (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL, "
+                             "descripcion TEXT, categoria TEXT NOT NULL, cantidad INTEGER NOT NULL, "
+                             "precio REAL NOT NULL)")
+            conexion.execute("INSERT INTO productos (nombre, descripcion, categoria, cantidad, precio) "
+                             "VALUES ('Galletitas', 'Dulces', 'Almacen', 5, 10)")
+        conexion.close()
+        funcionesDataBase.db_usar_backend("disco", ruta)
+        funcionesDataBase.db_crear_tabla_productos()
+        self.assertEqual(self._buscar("dulc"), ["Galletitas"])
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestAjusteEnLote(TestBaseTemporal):
+
+    def _cantidades(self):
+        return [producto.cantidad for producto in funcionesDataBase.db_get_productos()]
+
+    def test_lote_aplicado(self):
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 10)
+        # Las variaciones de un mismo producto se suman: -15 y +10 dejan 5 unidades.
+        resumen = funcionesDataBase.db_ajustar_stock_lote([(1, -15), (2, 3), (1, 10), (3, 0)])
+        self.assertEqual((resumen["aplicado"], resumen["movimientos"], resumen["productos"], resumen["rechazados"]),
+                         (True, 4, 2, []))
+        self.assertEqual(self._cantidades(), [5, 13, 10])
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 5)
+        self.assertEqual([movimiento[2:5] for movimiento in funcionesDataBase.db_get_movimientos(1)],
+                         [("ajuste", -5, 5), ("alta", 10, 10)])
+
+    def test_lote_rechazado_no_modifica_nada(self):
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(2).cantidad, 10)
+        anteriores = funcionesDataBase.db_get_movimientos(2)
+        for movimientos, rechazado in (([(2, 5), (99, 1), (3, -1)], 99), ([(2, 5), (3, -11), (1, 1)], 3)):
+            resumen = funcionesDataBase.db_ajustar_stock_lote(movimientos)
+            self.assertFalse(resumen["aplicado"])
+            self.assertEqual([producto_id for producto_id, _ in resumen["rechazados"]], [rechazado])
+            self.assertEqual(self._cantidades(), [10, 10, 10])
+            self.assertEqual(funcionesDataBase.db_get_producto_by_id(2).cantidad, 10)
+            self.assertEqual(funcionesDataBase.db_get_movimientos(2), anteriores)
+        self.assertIn("stock insuficiente", resumen["rechazados"][0][1])
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestReintentos(TestBaseTemporal):
+
+    def setUp(self):
+        super().setUp()
+        # SQLite espera poco por su cuenta: el resto lo resuelven los reintentos. Las conexiones del pool se vuelven
+        # a abrir para que tomen el nuevo timeout.
+        configuracion = mock.patch.multiple(funcionesDataBase, DB_BUSY_TIMEOUT=0.01, DB_REINTENTOS=4)
+        configuracion.start()
+        self.addCleanup(configuracion.stop)
+        funcionesDataBase.db_cerrar_conexiones()
+        self.addCleanup(funcionesDataBase.db_cerrar_conexiones)
+        # Otro proceso toma el bloqueo de escritura.
+        self.bloqueo = sqlite3.connect(self.ruta_db, isolation_level=None)
+        self.addCleanup(self.bloqueo.close)
+        self.bloqueo.execute("BEGIN IMMEDIATE")
+        self.esperas = []
+
+    def _esperar(self, liberar_en=None):
+        # Reemplaza las esperas entre reintentos: las registra y libera el bloqueo en la espera indicada.
+        def esperar(segundos):
+            self.esperas.append(segundos)
+            if len(self.esperas) == liberar_en:
+                self.bloqueo.rollback()
+        return mock.patch.object(funcionesDataBase.time, "sleep", side_effect=esperar)
+
+    def test_reintenta_mientras_la_base_esta_bloqueada(self):
+        with self._esperar(liberar_en=2):
+            self.assertTrue(funcionesDataBase.db_actualizar_producto(1, 7))
+        self.assertEqual(len(self.esperas), 2)
+        for intento, segundos in enumerate(self.esperas):
+            self.assertLessEqual(segundos, funcionesDataBase.DB_REINTENTO_ESPERA_BASE * 2 ** intento)
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 7)
+
+    def test_bloqueo_despues_de_los_reintentos(self):
+        with self._esperar(), mock.patch.object(funcionesDataBase, "DB_LANZAR_ERRORES", True):
+            with self.assertRaises(funcionesDataBase.ErrorBaseDatos) as contexto:
+                funcionesDataBase.db_actualizar_producto(1, 7)
+        self.assertEqual(len(self.esperas), 4)
+        self.assertEqual((contexto.exception.tipo, contexto.exception.reintentos), ("bloqueo", 4))
+        self.assertEqual(contexto.exception.a_dict()["operacion"], "actualizar el producto")
+        # Sin DB_LANZAR_ERRORES, el error se informa y la función retorna su valor de fallo.
+        with self._esperar(), contextlib.redirect_stdout(io.StringIO()) as salida:
+            resumen = funcionesDataBase.db_ajustar_stock_lote([(1, 1), (2, 1)])
+        self.assertFalse(resumen["aplicado"])
+        self.assertIn("locked", salida.getvalue())
+        self.bloqueo.rollback()
+        self.assertEqual([producto.cantidad for producto in funcionesDataBase.db_get_productos()], [10, 10, 10])
+
+    def test_otros_errores_no_se_reintentan(self):
+        def fallar():
+            raise sqlite3.IntegrityError("UNIQUE constraint failed: productos.nombre")
+
+        with self._esperar(), self.assertRaises(funcionesDataBase.ErrorBaseDatos) as contexto:
+            funcionesDataBase._db_reintentar("agregar el producto", fallar)
+        self.assertEqual((contexto.exception.tipo, contexto.exception.reintentos, self.esperas), ("integridad", 0, []))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestImportacionSinHuecos(TestBaseTemporal):
+
+    def test_nombres_registrados_mientras_tanto_no_consumen_ids(self):
+        # El importador descarta antes los nombres que ya conoce; los que otro proceso registró después los omite
+        # la misma sentencia de alta, como en db_insertar_producto.
+        from funcionesImportacion import _importar_insertar_lote
+        lote = [(nombre, "", "Almacen", 1, 1.0) for nombre in ("Yerba", "Té", "Café", "Mate")]
+        with funcionesDataBase.db_conexion() as conexion:
+            insertados = _importar_insertar_lote(conexion, lote)
+        self.assertEqual(insertados, 2)
+        funcionesDataBase.db_insertar_producto({"nombre": "Sal", "categoria": "Almacen", "cantidad": 1, "precio": 1})
+        self.assertEqual([(producto.id, producto.nombre) for producto in funcionesDataBase.db_get_productos()][3:],
+                         [(4, "Té"), (5, "Mate"), (6, "Sal")])
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestBajoStock(TestBaseTemporal):
+
+    def _bajo_stock(self):
+        # Con el umbral configurado, el reporte se lee de la tabla precalculada productos_bajo_stock.
+        umbral = funcionesDataBase.db_get_umbral_bajo_stock()
+        return [producto.nombre for producto in funcionesDataBase.db_get_productos_by_condicion(umbral)]
+
+    def test_upsert_de_un_producto_con_bajo_stock(self):
+        producto = {"nombre": "Yerba", "descripcion": "", "categoria": "Almacen", "cantidad": 3, "precio": 100}
+        self.assertEqual(funcionesDataBase.db_upsert_producto(producto), ("actualizado", 1))
+        self.assertEqual(self._bajo_stock(), ["Yerba"])
+        # Ya figura en productos_bajo_stock: los triggers no deben intentar agregarlo de nuevo.
+        for cantidad in (2, 2, 1):
+            producto["cantidad"] = cantidad
+            self.assertEqual(funcionesDataBase.db_upsert_producto(producto), ("actualizado", 1))
+        self.assertEqual(self._bajo_stock(), ["Yerba"])
+        producto["cantidad"] = 50
+        self.assertEqual(funcionesDataBase.db_upsert_producto(producto), ("actualizado", 1))
+        self.assertEqual(self._bajo_stock(), [])
+
+    def test_on_conflict_do_update_externo(self):
+        # Dentro de un trigger rige la política de conflicto de la sentencia externa: un upsert hecho con SQL
+        # directamente sobre un producto con bajo stock tampoco debe fallar.
+        sql = ("INSERT INTO productos (nombre, categoria, cantidad, precio) VALUES (?, 'Almacen', ?, 1) "
+               "ON CONFLICT (nombre) DO UPDATE SET cantidad = excluded.cantidad")
+        for cantidad in (4, 3, 2):
+            self._ejecutar_desde_otro_proceso(sql, ("Café", cantidad))
+        self._ejecutar_desde_otro_proceso(sql, ("Té", 1))
+        self._ejecutar_desde_otro_proceso(sql, ("Té", 1))
+        self.assertEqual(sorted(self._bajo_stock()), ["Café", "Té"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Módulo: tests/test_diccionario.py
+Descripción: Pruebas del backend "diccionario" (funcionesDiccionario). La misma secuencia de operaciones db_* se
+ejecuta sobre una base SQLite temporal y sobre el almacén en diccionarios, y se comparan los resultados y los mensajes
+impresos. No se toca inventario.db.
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesDataBase  # noqa: E402
+from funcionesProducto import ProductoBatch  # noqa: E402
+
+# Claves del resumen de db_ajustar_stock_lote que dependen del tiempo.
+_CLAVES_DE_TIEMPO = ("segundos", "movimientos_por_segundo")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestParidadConSqlite(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta_db = os.path.join(directorio.name, "inventario.db")
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        self.addCleanup(funcionesDataBase.db_descartar_memoria, self.ruta_db)
+
+    def _ejecutar(self, backend, guion):
+        funcionesDataBase.db_usar_backend(backend, self.ruta_db)
+        funcionesDataBase.db_crear_tabla_productos()
+        resultados = []
+        for nombre, *argumentos in guion:
+            with contextlib.redirect_stdout(io.StringIO()) as salida:
+                resultado = getattr(funcionesDataBase, nombre)(*argumentos)
+            resultados.append((nombre, argumentos, self._normalizar(resultado), salida.getvalue()))
+        return resultados
+
+    def _normalizar(self, resultado):
+        if isinstance(resultado, dict):
+            return {clave: valor for clave, valor in resultado.items() if clave not in _CLAVES_DE_TIEMPO}
+        if isinstance(resultado, ProductoBatch):
+            return list(resultado)
+        if isinstance(resultado, list) and resultado and isinstance(resultado[0], tuple):
+            # Movimientos: la fecha depende del momento en que se registraron.
+            return [movimiento[:-1] for movimiento in resultado]
+        return resultado
+
+    def _comparar(self, guion):
+        sqlite = self._ejecutar("disco", guion)
+        diccionario = self._ejecutar("diccionario", guion)
+        for esperado, obtenido in zip(sqlite, diccionario):
+            self.assertEqual(obtenido, esperado)
+
+    def test_operaciones(self):
+        producto = {"nombre": "Yerba", "descripcion": "Suave", "categoria": "Almacen", "cantidad": 10, "precio": 2500}
+        self._comparar([
+            ("db_insertar_producto", producto),
+            ("db_insertar_producto", producto),
+            ("db_insertar_producto", dict(producto, nombre="Café", descripcion=None, cantidad=3)),
+            ("db_insertar_producto", dict(producto, nombre="Sin precio", precio=None)),
+            ("db_upsert_producto", dict(producto, cantidad=4)),
+            ("db_upsert_producto", dict(producto, nombre="Té", categoria="Bebidas", cantidad=1, precio=1.5)),
+            ("db_upsert_producto", dict(producto, nombre="Té", categoria="Bebidas", cantidad=1, precio=1.5)),
+            ("db_insertar_producto", dict(producto, nombre="Azúcar", cantidad=30, precio=900)),
+            ("db_producto_existe", "Té"),
+            ("db_producto_existe", "Mate"),
+            ("db_get_productos",),
+            ("db_get_producto_by_id", 2),
+            ("db_get_producto_by_id", 99),
+            ("db_get_pagina_productos", 2),
+            ("db_get_pagina_productos", 2, (2, 2)),
+            ("db_get_pagina_productos", 2, None, (3, 3)),
+            ("db_get_pagina_productos", 3, None, None, ["nombre", "precio"], "precio", True),
+            ("db_get_pagina_productos", 2, (1.5, 3), None, None, "precio"),
+            ("db_actualizar_producto", 1, 8),
+            ("db_actualizar_producto", 99, 8),
+            ("db_actualizar_producto_version", 1, 9, 1),
+            ("db_actualizar_producto_version", 1, 9, 3),
+            ("db_actualizar_producto_version", 99, 9, 1),
+            ("db_incrementar_cantidad", 2, -3),
+            ("db_incrementar_cantidad", 2, -1),
+            ("db_incrementar_cantidad", 99, 1),
+            ("db_ajustar_stock_lote", [(1, 5), (3, 2), (1, -1)]),
+            ("db_ajustar_stock_lote", [(1, 5), (99, 1), (2, -1)]),
+            ("db_get_umbral_bajo_stock",),
+            ("db_get_productos_by_condicion", funcionesDataBase.DB_UMBRAL_BAJO_STOCK),
+            ("db_get_productos_by_condicion", 4),
+            ("db_set_umbral_bajo_stock", 12),
+            ("db_get_productos_by_condicion", 12),
+            ("db_eliminar_producto", 3),
+            ("db_eliminar_producto", 3),
+            ("db_insertar_producto", dict(producto, nombre="Mate", cantidad=2)),
+            ("db_get_movimientos", 1),
+            ("db_get_movimientos", 3),
+            ("db_get_movimientos", 1, 2),
+            ("db_get_productos",),
+        ])
+
+    def test_busqueda(self):
+        productos = [("Café molido", "Tostado natural", "Almacen"), ("Cafetera", "Para café", "Bazar"),
+                     ("Té verde", "", "Bebidas"), ("Azúcar", "Común", "Almacen")]
+        guion = [("db_insertar_producto", {"nombre": nombre, "descripcion": descripcion, "categoria": categoria,
+                                           "cantidad": 1, "precio": 1})
+                 for nombre, descripcion, categoria in productos]
+        # El orden por relevancia es aproximado: se comparan los productos encontrados.
+        consultas = ["caf", "CAFE", "cafe almac", "azucar", "te", "para", "xyz", "  "]
+        guion += [("db_buscar_productos", consulta) for consulta in consultas]
+        sqlite = self._ejecutar("disco", guion)
+        diccionario = self._ejecutar("diccionario", guion)
+        for esperado, obtenido in zip(sqlite, diccionario):
+            if esperado[0] == "db_buscar_productos":
+                esperado, obtenido = sorted(p.id for p in esperado[2]), sorted(p.id for p in obtenido[2])
+            self.assertEqual(obtenido, esperado)
+
+    def test_operaciones_aleatorias(self):
+        aleatorio = random.Random(11)
+        guion = []
+        for _ in range(400):
+            producto_id = aleatorio.randint(1, 25)
+            operacion = aleatorio.randrange(7)
+            if operacion == 0:
+                guion.append(("db_insertar_producto", {"nombre": f"Producto {aleatorio.randint(1, 20)}",
+                                                       "categoria": aleatorio.choice(("A", "B")),
+                                                       "cantidad": aleatorio.randint(0, 20), "precio": 1}))
+            elif operacion == 1:
+                guion.append(("db_upsert_producto", {"nombre": f"Producto {aleatorio.randint(1, 20)}",
+                                                     "descripcion": "", "categoria": "C",
+                                                     "cantidad": aleatorio.randint(0, 20), "precio": 2}))
+            elif operacion == 2:
+                guion.append(("db_incrementar_cantidad", producto_id, aleatorio.randint(-10, 10)))
+            elif operacion == 3:
+                guion.append(("db_ajustar_stock_lote", [(aleatorio.randint(1, 25), aleatorio.randint(-5, 5))
+                                                        for _ in range(3)]))
+            elif operacion == 4:
+                guion.append(("db_eliminar_producto", producto_id))
+            elif operacion == 5:
+                guion.append(("db_get_pagina_productos", 4, (aleatorio.randint(0, 20), producto_id), None, None,
+                              "cantidad"))
+            else:
+                guion.append(("db_get_productos_by_condicion", aleatorio.randint(0, 15)))
+        guion += [("db_get_productos",)] + [("db_get_movimientos", producto_id) for producto_id in range(1, 26)]
+        self._comparar(guion)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Módulo: tests/test_exportacion.py
+Descripción: Pruebas de funcionesExportacion. Cada prueba exporta una base temporal (db_usar_backend) y vuelve a leer
+el archivo generado; no se toca inventario.db.
+"""
+
+import bz2
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesDataBase  # noqa: E402
+from funcionesExportacion import exportar_leer_columnar, exportar_productos  # noqa: E402
+from funcionesImportacion import importar_productos  # noqa: E402
+from funcionesProducto import COLUMNAS_PRODUCTOS  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestExportacion(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        funcionesDataBase.db_usar_backend("disco", os.path.join(self.directorio, "inventario.db"))
+        funcionesDataBase.db_crear_tabla_productos()
+        for numero in range(1, 8):
+            funcionesDataBase.db_insertar_producto({"nombre": f"Producto {numero}, \"ñ\"",
+                                                    "descripcion": "Línea\nnueva", "categoria": "Bebidas" if numero % 2 else "Almacen",
+                                                    "cantidad": numero, "precio": numero * 1.25})
+        # Una descripción nula, escrita con SQL directamente.
+        conexion = sqlite3.connect(funcionesDataBase.DB_PATH)
+        with conexion:
+            conexion.execute("UPDATE productos SET descripcion = NULL WHERE id = 2")
+        conexion.close()
+        self.filas = [producto.a_tupla() for producto in funcionesDataBase.db_get_productos()]
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def _leer_texto(self, ruta):
+        abrir = {".gz": gzip.open, ".bz2": bz2.open}.get(os.path.splitext(ruta)[1], open)
+        with abrir(ruta, "rt", encoding="utf-8", newline="") as archivo:
+            return archivo.read()
+
+    def test_csv(self):
+        for nombre in ("productos.csv", "productos.csv.gz"):
+            resumen = exportar_productos(self._ruta(nombre), tamanio_bloque=3)
+            self.assertEqual(resumen["filas"], 7)
+            filas = list(csv.reader(self._leer_texto(self._ruta(nombre)).splitlines(keepends=True)))
+            self.assertEqual(tuple(filas[0]), COLUMNAS_PRODUCTOS)
+            # En CSV todo es texto y None se escribe vacío.
+            esperado = [["" if valor is None else str(valor) for valor in fila] for fila in self.filas]
+            self.assertEqual(filas[1:], esperado, nombre)
+
+    def test_jsonl(self):
+        for nombre in ("productos.jsonl", "productos.jsonl.bz2"):
+            exportar_productos(self._ruta(nombre), tamanio_bloque=2)
+            filas = [json.loads(linea) for linea in self._leer_texto(self._ruta(nombre)).splitlines()]
+            self.assertEqual([tuple(fila[columna] for columna in COLUMNAS_PRODUCTOS) for fila in filas], self.filas)
+
+    def test_columnar(self):
+        # El formato columnar guarda los textos nulos como "".
+        esperado = [tuple("" if valor is None else valor for valor in fila) for fila in self.filas]
+        for nombre, tamanio_bloque, filas_por_bloque in (("productos.icol", 3, [3, 3, 1]),
+                                                         ("productos.icol.xz", 7, [7]), ("una_fila.icol", 1, [1] * 7)):
+            exportar_productos(self._ruta(nombre), tamanio_bloque=tamanio_bloque)
+            bloques = list(exportar_leer_columnar(self._ruta(nombre)))
+            self.assertEqual([len(bloque["id"]) for bloque in bloques], filas_por_bloque, nombre)
+            filas = [fila for bloque in bloques for fila in zip(*(bloque[columna] for columna in COLUMNAS_PRODUCTOS))]
+            self.assertEqual(filas, esperado, nombre)
+
+    def test_filtros_y_base_vacia(self):
+        ruta = self._ruta("filtrado.jsonl")
+        self.assertEqual(exportar_productos(ruta, categoria="Bebidas", cantidad_menor_a=5)["filas"], 2)
+        self.assertEqual([json.loads(linea)["id"] for linea in self._leer_texto(ruta).splitlines()], [1, 3])
+        for nombre in ("vacio.csv", "vacio.icol"):
+            self.assertEqual(exportar_productos(self._ruta(nombre), categoria="Ninguna")["filas"], 0)
+        self.assertEqual(self._leer_texto(self._ruta("vacio.csv")), ",".join(COLUMNAS_PRODUCTOS) + "\r\n")
+        self.assertEqual(list(exportar_leer_columnar(self._ruta("vacio.icol"))), [])
+
+    def test_exportar_e_importar(self):
+        # Un CSV exportado se puede importar en otra base (las columnas id y version se ignoran y la descripción
+        # nula se importa vacía).
+        ruta = self._ruta("productos.csv")
+        exportar_productos(ruta)
+        funcionesDataBase.db_usar_backend("disco", self._ruta("copia.db"))
+        funcionesDataBase.db_crear_tabla_productos()
+        resumen = importar_productos(ruta)
+        self.assertEqual((resumen["insertados"], resumen["rechazados"]), (7, 0))
+        copia = [producto.a_tupla() for producto in funcionesDataBase.db_get_productos()]
+        self.assertEqual([fila[1:6] for fila in copia],
+                         [(fila[1], fila[2] or "") + fila[3:6] for fila in self.filas])
+
+    def test_formato_desconocido(self):
+        with self.assertRaises(ValueError):
+            exportar_productos(self._ruta("productos.csv"), formato="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Módulo: tests/test_menu.py
+Descripción: Pruebas del menú interactivo. Las respuestas del usuario se simulan con mock y la base es un archivo
+temporal (db_usar_backend), sin tocar inventario.db.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesDataBase  # noqa: E402
+import funcionesMenu  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestMenuActualizarProducto(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        self.ruta_db = os.path.join(directorio.name, "inventario.db")
+        funcionesDataBase.db_usar_backend("disco", self.ruta_db)
+        funcionesDataBase.db_crear_tabla_productos()
+        funcionesDataBase.db_insertar_producto({"nombre": "Yerba", "descripcion": "", "categoria": "Almacen",
+                                                "cantidad": 10, "precio": 2500})
+
+    def _modificar_desde_otro_proceso(self, cantidad):
+        # Una conexión propia no pasa por la caché del proceso, como la escritura de otro usuario.
+        with sqlite3.connect(self.ruta_db) as conexion:
+            conexion.execute("UPDATE productos SET cantidad = ?, version = version + 1 WHERE id = 1", (cantidad,))
+        conexion.close()
+
+    def test_reintento_luego_de_un_conflicto(self):
+        cantidades = iter([20, 30])
+
+        def pedir_cantidad(mensaje):
+            cantidad = next(cantidades)
+            if cantidad == 20:
+                self._modificar_desde_otro_proceso(15)
+            return cantidad
+
+        with mock.patch("builtins.input", return_value="1"), \
+                mock.patch.object(funcionesMenu, "validacion_get_cantidad", side_effect=pedir_cantidad), \
+                mock.patch("builtins.print") as imprimir:
+            funcionesMenu.menu_actualizar_producto()
+        mensajes = [str(llamada.args[0]) for llamada in imprimir.call_args_list]
+        # Se muestra la cantidad que dejó el otro usuario (no la de la caché) y el segundo intento se aplica.
+        self.assertTrue(any("Cantidad actual 15" in mensaje for mensaje in mensajes), mensajes)
+        self.assertTrue(any("actualizado exitosamente" in mensaje for mensaje in mensajes), mensajes)
+        self.assertEqual(funcionesDataBase.db_get_producto_by_id(1).cantidad, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
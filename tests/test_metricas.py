@@ -0,0 +1,51 @@
+"""
+Módulo: tests/test_metricas.py
+Descripción: Pruebas de las métricas de rendimiento activadas desde la línea de comandos. Cada prueba ejecuta main.py
+en un proceso aparte con una base temporal (INVENTARIO_DB), sin tocar inventario.db.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestImportacionConMetricas(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta_db = os.path.join(self.directorio.name, "inventario.db")
+
+    def _main(self, *argumentos):
+        entorno = dict(os.environ, INVENTARIO_DB=self.ruta_db)
+        entorno.pop("INVENTARIO_METRICAS", None)
+        return subprocess.run([sys.executable, os.path.join(RAIZ, "main.py"), *argumentos], cwd=self.directorio.name,
+                              env=entorno, capture_output=True, text=True, timeout=60)
+
+    def test_importar_csv_con_metricas(self):
+        ruta_csv = os.path.join(self.directorio.name, "productos.csv")
+        with open(ruta_csv, "w", encoding="utf-8", newline="") as archivo:
+            archivo.write("nombre,descripcion,categoria,cantidad,precio\nYerba,,Almacen,10,2500\nCafe,Molido,Almacen,3,4100.5\n")
+        ruta_metricas = os.path.join(self.directorio.name, "metricas.json")
+
+        proceso = self._main("--metricas", ruta_metricas, "import", ruta_csv)
+
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+        resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+        self.assertEqual((resultado["ok"], resultado["insertados"], resultado["rechazados"]), (True, 2, 0))
+        with sqlite3.connect(self.ruta_db) as conexion:
+            nombres = [fila[0] for fila in conexion.execute("SELECT nombre FROM productos ORDER BY id")]
+        self.assertEqual(nombres, ["Yerba", "Cafe"])
+        with open(ruta_metricas, encoding="utf-8") as archivo:
+            self.assertTrue(json.load(archivo)["activas"])
+
+
+if __name__ == "__main__":
+    unittest.main()
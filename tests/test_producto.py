@@ -0,0 +1,86 @@
+"""
+Módulo: tests/test_producto.py
+Descripción: Pruebas de los tipos Producto y ProductoBatch (funcionesProducto).
+"""
+
+import os
+import sqlite3
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from funcionesProducto import (  # noqa: E402
+    COLUMNAS_PRODUCTOS,
+    Producto,
+    ProductoBatch,
+    producto_desde_columnas,
+    producto_row_factory,
+)
+
+_FILAS = [(1, "Yerba", "Suave", "Almacen", 10, 2500.0, 1), (2, "Té", None, "Almacen", 0, 1.5, 3),
+          (3, "Café", "", "Bebidas", 2 ** 63 - 1, 0.01, 1)]
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestProducto(unittest.TestCase):
+
+    def test_campos_y_conversiones(self):
+        producto = Producto(*_FILAS[0])
+        self.assertEqual((producto.nombre, producto.cantidad, producto.version), ("Yerba", 10, 1))
+        self.assertEqual(producto.a_tupla(), _FILAS[0])
+        self.assertEqual(producto.a_dict(("id", "precio")), {"id": 1, "precio": 2500.0})
+        self.assertEqual(list(producto.a_dict()), list(COLUMNAS_PRODUCTOS))
+        self.assertEqual(repr(producto), "Producto(id=1, nombre='Yerba', descripcion='Suave', categoria='Almacen', "
+                                         "cantidad=10, precio=2500.0, version=1)")
+        match producto:
+            case Producto(_, nombre, _, _, cantidad):
+                self.assertEqual((nombre, cantidad), ("Yerba", 10))
+
+    def test_slots_e_igualdad(self):
+        producto = Producto(*_FILAS[0])
+        with self.assertRaises(AttributeError):
+            producto.stock = 1
+        self.assertFalse(hasattr(producto, "__dict__"))
+        self.assertEqual(producto, Producto(*_FILAS[0]))
+        self.assertNotEqual(producto, Producto(*_FILAS[1]))
+        self.assertNotEqual(producto, _FILAS[0])
+        with self.assertRaises(TypeError):
+            hash(producto)
+
+    def test_columnas_parciales(self):
+        producto = producto_desde_columnas(["nombre", "precio"], ("Té", 1.5))
+        self.assertEqual(producto.a_tupla(), (None, "Té", None, None, None, 1.5, None))
+
+    def test_row_factory(self):
+        conexion = sqlite3.connect(":memory:")
+        self.addCleanup(conexion.close)
+        conexion.row_factory = producto_row_factory
+        self.assertEqual(conexion.execute("SELECT ?, ?, ?, ?, ?, ?, ?", _FILAS[1]).fetchone(), Producto(*_FILAS[1]))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestProductoBatch(unittest.TestCase):
+
+    def test_ida_y_vuelta(self):
+        lote = ProductoBatch(_FILAS[:2])
+        lote.extender([Producto(*_FILAS[2])])
+        self.assertEqual(len(lote), 3)
+        self.assertEqual([producto.a_tupla() for producto in lote], _FILAS)
+        self.assertEqual(lote[-1], Producto(*_FILAS[2]))
+        self.assertEqual(lote[1].descripcion, None)
+        self.assertEqual(repr(lote), "ProductoBatch(3 productos)")
+        with self.assertRaises(IndexError):
+            lote[3]
+
+    def test_columnas_compactas(self):
+        lote = ProductoBatch(_FILAS)
+        self.assertEqual((lote.ids.typecode, lote.cantidades.typecode, lote.precios.typecode), ("q", "q", "d"))
+        self.assertEqual(list(lote.cantidades), [10, 0, 2 ** 63 - 1])
+        self.assertIs(type(lote[0].precio), float)
+        with self.assertRaises(OverflowError):
+            ProductoBatch([(4, "Sal", "", "Almacen", 2 ** 63, 1.0, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
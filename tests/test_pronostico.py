@@ -0,0 +1,111 @@
+"""
+Módulo: tests/test_pronostico.py
+Descripción: Pruebas de funcionesPronostico. Los egresos se registran con fechas elegidas en una base temporal
+(db_usar_backend) y el día actual se indica con el parámetro hoy; no se toca inventario.db.
+"""
+
+import datetime
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesDataBase  # noqa: E402
+from funcionesPronostico import (  # noqa: E402
+    PRONOSTICO_DIAS_REPOSICION,
+    PRONOSTICO_FACTOR_SEGURIDAD,
+    pronostico_producto,
+    pronostico_productos_a_agotarse,
+    pronostico_recalcular,
+)
+
+_INICIO = datetime.date(2026, 1, 1)
+
+
+def _dia(numero):
+    return (_INICIO + datetime.timedelta(days=numero)).isoformat()
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestPronostico(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        self.ruta_db = os.path.join(directorio.name, "inventario.db")
+        funcionesDataBase.db_usar_backend("disco", self.ruta_db)
+        funcionesDataBase.db_crear_tabla_productos()
+        for nombre, cantidad in (("Yerba", 100), ("Azúcar", 40), ("Café", 500)):
+            funcionesDataBase.db_insertar_producto({"nombre": nombre, "categoria": "Almacen", "cantidad": cantidad,
+                                                    "precio": 1})
+        # Las ventanas empiezan a contar desde el primer día de las pruebas.
+        self.assertTrue(pronostico_recalcular(_dia(0)))
+
+    def _egresos(self, egresos):
+        # Registra egresos (producto_id, unidades, día) como lo harían los triggers de 'movimientos', con otra fecha.
+        conexion = sqlite3.connect(self.ruta_db)
+        with conexion:
+            conexion.executemany("INSERT INTO movimientos (producto_id, tipo, variacion, cantidad_resultante, fecha) "
+                                 "VALUES (?, 'ajuste', ?, 0, ? || 'T12:00:00.000')",
+                                 [(producto_id, -unidades, dia) for producto_id, unidades, dia in egresos])
+        conexion.close()
+
+    def test_consumo_de_las_ventanas(self):
+        # Yerba: 2 unidades por día durante 28 días y 6 por día en la última semana.
+        self._egresos([(1, 2 if numero < 21 else 6, _dia(numero)) for numero in range(28)])
+        fila = pronostico_producto(1, _dia(27))
+        consumos = [2] * 21 + [6] * 7
+        media = sum(consumos) / 28
+        desvio = math.sqrt(sum(c * c for c in consumos) / 28 - media * media)
+        self.assertEqual(fila["consumo_diario"], 6.0)
+        self.assertAlmostEqual(fila["desvio_diario"], round(desvio, 3))
+        self.assertEqual(fila["punto_reposicion"],
+                         math.ceil(6 * PRONOSTICO_DIAS_REPOSICION
+                                   + PRONOSTICO_FACTOR_SEGURIDAD * desvio * math.sqrt(PRONOSTICO_DIAS_REPOSICION)))
+        self.assertEqual(fila["dias_restantes"], round(100 / 6, 1))
+        self.assertEqual(pronostico_producto(2, _dia(27))["consumo_diario"], 0.0)
+        self.assertIsNone(pronostico_producto(99, _dia(27)))
+
+    def test_las_ventanas_avanzan(self):
+        self._egresos([(1, 4, _dia(numero)) for numero in range(7)] + [(2, 10, _dia(0))])
+        # Yerba se agota en 25 días (4 por día) y Azúcar en 28 (10 unidades en la ventana de 7 días).
+        self.assertEqual([fila["id"] for fila in pronostico_productos_a_agotarse(30, _dia(6))], [1, 2])
+        # Una semana sin egresos: la ventana de 7 días queda vacía y manda la de 28 (28 unidades en 28 días).
+        self.assertEqual(pronostico_producto(1, _dia(13))["consumo_diario"], 1.0)
+        self.assertEqual(pronostico_producto(2, _dia(13))["consumo_diario"], round(10 / 28, 3))
+        # Azúcar deja la ventana larga antes que Yerba, y después ninguno tiene consumo.
+        self.assertEqual([fila["id"] for fila in pronostico_productos_a_agotarse(1000, _dia(28))], [1])
+        self.assertEqual(pronostico_productos_a_agotarse(1000, _dia(34)), [])
+        self.assertEqual(pronostico_producto(1, _dia(34))["consumo_diario"], 0.0)
+        conexion = sqlite3.connect(self.ruta_db)
+        self.addCleanup(conexion.close)
+        self.assertEqual(conexion.execute("SELECT COUNT(*) FROM consumo_acumulado").fetchone()[0], 0)
+        self.assertEqual(conexion.execute("SELECT COUNT(*) FROM consumo_diario").fetchone()[0], 0)
+
+    def _pronostico(self, hoy):
+        return (pronostico_productos_a_agotarse(60, hoy),
+                [pronostico_producto(producto_id, hoy) for producto_id in (1, 2, 3)])
+
+    def test_acumulados_incrementales_y_recalculo(self):
+        # Día a día: se consulta el pronóstico (lo que avanza las ventanas) y se registran los egresos del día.
+        # A intervalos, lo acumulado en forma incremental debe coincidir con reconstruirlo desde 'movimientos'.
+        aleatorio = random.Random(5)
+        for numero in range(70):
+            hoy = _dia(numero)
+            incremental = self._pronostico(hoy)
+            if numero % 9 == 0:
+                self.assertTrue(pronostico_recalcular(hoy))
+                self.assertEqual(self._pronostico(hoy), incremental, hoy)
+            self._egresos([(producto_id, aleatorio.randint(1, 6), hoy) for producto_id in (1, 2, 3)
+                           if aleatorio.random() < (0.8 if numero < 40 else 0.1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
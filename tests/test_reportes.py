@@ -0,0 +1,91 @@
+"""
+Módulo: tests/test_reportes.py
+Descripción: Pruebas de funcionesReportes. Los totales calculados en SQL se comparan con los mismos cálculos hechos en
+Python sobre una base temporal (db_usar_backend); no se toca inventario.db.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import funcionesDataBase  # noqa: E402
+from funcionesReportes import (  # noqa: E402
+    reporte_bajo_stock_por_categoria,
+    reporte_top_productos_por_valor,
+    reporte_valor_por_categoria,
+)
+
+_CATEGORIAS = ("Almacen", "Bebidas", "Limpieza", "Bazar")
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestReportes(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        anterior = (funcionesDataBase.DB_BACKEND, funcionesDataBase.DB_PATH)
+        self.addCleanup(funcionesDataBase.db_usar_backend, *anterior)
+        funcionesDataBase.db_usar_backend("disco", os.path.join(directorio.name, "inventario.db"))
+        funcionesDataBase.db_crear_tabla_productos()
+        aleatorio = random.Random(3)
+        for numero in range(1, 61):
+            funcionesDataBase.db_insertar_producto({"nombre": f"Producto {numero}", "descripcion": "",
+                                                    "categoria": aleatorio.choice(_CATEGORIAS),
+                                                    "cantidad": aleatorio.randint(0, 30),
+                                                    "precio": aleatorio.randint(1, 50000) / 100})
+
+    def _por_categoria(self, condicion=lambda producto: True):
+        grupos = defaultdict(list)
+        for producto in funcionesDataBase.db_get_productos():
+            if condicion(producto):
+                grupos[producto.categoria].append(producto)
+        return grupos
+
+    def test_valor_por_categoria(self):
+        esperado = [{"categoria": categoria, "productos": len(productos),
+                     "unidades": sum(producto.cantidad for producto in productos),
+                     "valor": round(sum(producto.cantidad * producto.precio for producto in productos), 2)}
+                    for categoria, productos in sorted(self._por_categoria().items())]
+        self.assertEqual(reporte_valor_por_categoria(), esperado)
+        self.assertEqual(sum(fila["productos"] for fila in esperado), 60)
+
+    def test_top_productos_por_valor(self):
+        valores = sorted((producto.cantidad * producto.precio for producto in funcionesDataBase.db_get_productos()),
+                         reverse=True)
+        top = reporte_top_productos_por_valor(5)
+        self.assertEqual([valor for _, valor in top], [round(valor, 2) for valor in valores[:5]])
+        for producto, valor in top:
+            self.assertEqual(valor, round(producto.cantidad * producto.precio, 2))
+
+    def test_bajo_stock_por_categoria(self):
+        umbral = funcionesDataBase.db_get_umbral_bajo_stock()
+        # Con el umbral configurado (tabla precalculada) y con otros valores (índice sobre cantidad).
+        for minimo_stock in (None, umbral + 7, 1, 0):
+            limite = umbral if minimo_stock is None else minimo_stock
+            grupos = self._por_categoria(lambda producto: producto.cantidad < limite)
+            esperado = sorted(({"categoria": categoria, "productos": len(productos),
+                                "unidades": sum(producto.cantidad for producto in productos)}
+                               for categoria, productos in grupos.items()),
+                              key=lambda fila: (-fila["productos"], fila["categoria"]))
+            self.assertEqual(reporte_bajo_stock_por_categoria(minimo_stock), esperado, minimo_stock)
+
+    def test_escrituras_vacian_la_cache(self):
+        anterior = reporte_valor_por_categoria()
+        producto = funcionesDataBase.db_get_producto_by_id(1)
+        funcionesDataBase.db_actualizar_producto(1, producto.cantidad + 10)
+        fila = next(fila for fila in reporte_valor_por_categoria() if fila["categoria"] == producto.categoria)
+        previa = next(fila for fila in anterior if fila["categoria"] == producto.categoria)
+        self.assertEqual(fila["unidades"], previa["unidades"] + 10)
+        self.assertAlmostEqual(fila["valor"], previa["valor"] + 10 * producto.precio, places=2)
+        funcionesDataBase.db_eliminar_producto(1)
+        self.assertEqual(sum(fila["productos"] for fila in reporte_valor_por_categoria()), 59)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Módulo: tests/test_respaldo.py
+Descripción: Pruebas del respaldo y la restauración desde la línea de comandos. Cada prueba ejecuta main.py en un
+proceso aparte con una base temporal (INVENTARIO_DB), sin tocar inventario.db.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestRespaldo(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta_db = os.path.join(self.directorio.name, "inventario.db")
+
+    def _main(self, *argumentos):
+        entorno = dict(os.environ, INVENTARIO_DB=self.ruta_db)
+        entorno.pop("INVENTARIO_METRICAS", None)
+        proceso = subprocess.run([sys.executable, os.path.join(RAIZ, "main.py"), *argumentos], cwd=self.directorio.name,
+                                 env=entorno, capture_output=True, text=True, timeout=60)
+        return proceso.returncode, [json.loads(linea) for linea in proceso.stdout.splitlines() if linea.startswith("{")]
+
+    def _agregar(self, nombre):
+        codigo, _ = self._main("add", "--nombre", nombre, "--categoria", "Prueba", "--cantidad", "1", "--precio", "1")
+        self.assertEqual(codigo, 0)
+
+    def test_rutas_con_caracteres_de_uri(self):
+        self._agregar("Original")
+        for nombre in ("con?signo.db", "con#numeral.db", "con%25porcentaje.db"):
+            codigo, filas = self._main("backup", nombre)
+            self.assertEqual(codigo, 0, nombre)
+            self._agregar(f"Posterior {nombre}")
+            codigo, filas = self._main("restore", nombre)
+            self.assertEqual(codigo, 0, nombre)
+            codigo, filas = self._main("list", "--columnas", "nombre")
+            self.assertEqual([fila["nombre"] for fila in filas], ["Original"], nombre)
+
+    def test_restaurar_reinicia_registro_de_cambios(self):
+        self._agregar("Antes del respaldo")
+        self._main("backup", "respaldo.db")
+        self._agregar("Después del respaldo")
+        _, cambios = self._main("changes")
+        ultima = cambios[-1]["secuencia"]
+
+        codigo, _ = self._main("restore", "respaldo.db")
+        self.assertEqual(codigo, 0)
+        # Un consumidor al día (o atrasado) debe volver a copiar la tabla: no se le entregan cambios reutilizados.
+        for desde in (ultima, 0):
+            codigo, filas = self._main("changes", "--desde", str(desde))
+            self.assertEqual(codigo, 1)
+            self.assertTrue(filas[0]["reiniciar"])
+        # La secuencia no retrocede: los cambios nuevos quedan por encima de los ya entregados.
+        self._agregar("Después de restaurar")
+        codigo, filas = self._main("changes", "--desde", str(ultima + 1))
+        self.assertEqual(codigo, 0)
+        self.assertEqual([fila["operacion"] for fila in filas], ["insert"])
+        self.assertGreater(filas[0]["secuencia"], ultima)
+
+
+if __name__ == "__main__":
+    unittest.main()
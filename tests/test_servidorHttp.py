@@ -0,0 +1,93 @@
+"""
+Módulo: tests/test_servidorHttp.py
+Descripción: Pruebas de la API HTTP/JSON. El servidor se inicia en un hilo, en un puerto libre y con el backend
+"memoria", por lo que no se toca inventario.db.
+"""
+
+import json
+import os
+import sys
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import servidorHttp  # noqa: E402
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestServidorHttp(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor = servidorHttp.servidor_crear(puerto=0, conexiones=2, silencioso=True, backend="memoria")
+        cls.url = f"http://127.0.0.1:{cls.servidor.server_address[1]}"
+        threading.Thread(target=cls.servidor.serve_forever, daemon=True).start()
+        for numero in range(3):
+            cls._pedir("POST", "/productos", {"nombre": f"Producto {numero}", "descripcion": "", "categoria": "Prueba",
+                                              "cantidad": 5, "precio": 10})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    @classmethod
+    def _pedir(cls, metodo, ruta, datos=None):
+        cuerpo = None if datos is None else json.dumps(datos).encode("utf-8")
+        peticion = urllib.request.Request(cls.url + ruta, data=cuerpo, method=metodo)
+        try:
+            with urllib.request.urlopen(peticion, timeout=10) as respuesta:
+                return respuesta.status, json.loads(respuesta.read() or b"null")
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b"null")
+
+    def test_limite_menor_a_uno(self):
+        for ruta in ("/productos?limite=-1", "/productos?limite=0", "/buscar?q=producto&limite=-1",
+                     "/cambios?limite=-1", "/cambios?limite=0"):
+            estado, datos = self._pedir("GET", ruta)
+            self.assertEqual(estado, 400, ruta)
+            self.assertIn("limite", datos["error"])
+
+    def test_limite_valido(self):
+        estado, datos = self._pedir("GET", "/productos?limite=2")
+        self.assertEqual(estado, 200)
+        self.assertEqual(len(datos["productos"]), 2)
+        self.assertIsNotNone(datos["siguiente"])
+
+    def test_patch_producto_eliminado_antes_de_releer(self):
+        # Simula una baja concurrente entre la actualización y la relectura del producto.
+        with mock.patch.object(servidorHttp, "db_get_producto_by_id", return_value=None):
+            estado, datos = self._pedir("PATCH", "/productos/1", {"variacion": 1})
+        self.assertEqual(estado, 404)
+        self.assertEqual(datos["error"], "producto inexistente")
+
+    def test_enteros_no_validos(self):
+        # Reales, booleanos y enteros que no entran en 64 bits se rechazan antes de llegar a SQLite.
+        _, anterior = self._pedir("GET", "/productos/3")
+        casos = [({"cantidad": 2.9}, "cantidad"), ({"cantidad": True}, "cantidad"), ({"cantidad": "x"}, "cantidad"),
+                 ({"cantidad": 10 ** 30}, "cantidad"), ({"variacion": 10 ** 30}, "variacion"),
+                 ({"variacion": -10 ** 30}, "variacion"), ({"variacion": 1.5}, "variacion"),
+                 ({"cantidad": 1, "version": 10 ** 30}, "version")]
+        for datos, campo in casos:
+            estado, respuesta = self._pedir("PATCH", "/productos/3", datos)
+            self.assertEqual(estado, 400, datos)
+            self.assertIn(campo, respuesta["error"])
+        for ruta in ("/productos/99999999999999999999", "/productos?despues_de=99999999999999999999",
+                     "/cambios?desde=-99999999999999999999"):
+            estado, _ = self._pedir("GET", ruta)
+            self.assertEqual(estado, 400, ruta)
+        self.assertEqual(self._pedir("GET", "/productos/3"), (200, anterior))
+
+    def test_entero_en_el_limite(self):
+        estado, producto = self._pedir("PATCH", "/productos/2", {"cantidad": 2 ** 63 - 1})
+        self.assertEqual((estado, producto["cantidad"]), (200, 2 ** 63 - 1))
+        estado, producto = self._pedir("PATCH", "/productos/2", {"cantidad": "5"})
+        self.assertEqual((estado, producto["cantidad"]), (200, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Módulo: tests/test_validacion.py
+Descripción: Pruebas de funcionesValidacion. Los validadores por valor (registros individuales) y por columnas (lotes)
+implementan las mismas reglas: se comparan sobre una muestra de valores válidos e inválidos de cada campo.
+"""
+
+import gc
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from funcionesValidacion import validacion_lote_productos, validacion_registro_producto  # noqa: E402
+
+# Valores de prueba por campo: válidos, nulos, de otro tipo, fuera de rango y con espacios.
+_VALORES = {
+    "nombre": ["Yerba", "  Café  ", "", "   ", None, 0, 15, "0"],
+    "descripcion": ["", "  Molido ", None, 0, 3.5],
+    "categoria": ["Almacen", " Bebidas", "", None, 7],
+    "cantidad": ["10", " 3 ", 5, "0", "-5", "2.5", "abc", "", None, 2 ** 63 - 1, 2 ** 63, "99999999999999999999",
+                 -2 ** 64, True],
+    "precio": ["2500", " 1.5 ", 0.01, 3, "0", "-1.5", "nan", "inf", "-inf", " Infinity ", float("inf"), "gratis", "",
+               None, "1e400", "1_000"],
+}
+
+
+#---------------------------------------------------------------------------------------------------------------------
+class TestValidacion(unittest.TestCase):
+
+    def _registros(self, cantidad, semilla=7):
+        aleatorio = random.Random(semilla)
+        return [{campo: aleatorio.choice(valores) for campo, valores in _VALORES.items()} for _ in range(cantidad)]
+
+    def test_registro_y_lote_coinciden(self):
+        registros = self._registros(5000)
+        # Además de la muestra aleatoria, cada valor de cada campo sobre un registro válido.
+        base = {"nombre": "Yerba", "descripcion": "", "categoria": "Almacen", "cantidad": "1", "precio": "1"}
+        registros += [dict(base, **{campo: valor}) for campo, valores in _VALORES.items() for valor in valores]
+        registros.append({"nombre": "Sin precio"})
+        self.assertEqual([validacion_registro_producto(registro) for registro in registros],
+                         validacion_lote_productos(registros))
+
+    def test_tipos_de_los_valores_validos(self):
+        producto, error = validacion_registro_producto({"nombre": " A ", "categoria": "C", "cantidad": " 7",
+                                                        "precio": "2"})
+        self.assertIsNone(error)
+        self.assertEqual(producto, {"nombre": "A", "descripcion": "", "categoria": "C", "cantidad": 7, "precio": 2.0})
+        self.assertIs(type(producto["cantidad"]), int)
+        self.assertIs(type(producto["precio"]), float)
+
+    def test_mensajes(self):
+        casos = [
+            ({"nombre": "", "categoria": "", "cantidad": "x", "precio": "x"}, "nombre: no se admite dato nulo"),
+            ({"nombre": "A", "categoria": " ", "cantidad": "x", "precio": "x"}, "categoria: no se admite dato nulo"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "x", "precio": "x"}, "cantidad: tipo de dato no válido ('x')"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "0", "precio": "x"},
+             "cantidad: debe ser un número entero mayor a 0"),
+            ({"nombre": "A", "categoria": "C", "cantidad": 2 ** 63, "precio": "1"},
+             "cantidad: debe ser un número entero mayor a 0"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "1", "precio": None}, "precio: tipo de dato no válido (None)"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "1", "precio": "nan"}, "precio: debe ser un número mayor a 0"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "1", "precio": "inf"}, "precio: debe ser un número mayor a 0"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "1", "precio": 1e400}, "precio: debe ser un número mayor a 0"),
+            ({"nombre": "A", "categoria": "C", "cantidad": "1", "precio": "1e400"},
+             "precio: debe ser un número mayor a 0"),
+        ]
+        for registro, mensaje in casos:
+            self.assertEqual(validacion_registro_producto(registro), (None, mensaje))
+            self.assertEqual(validacion_lote_productos([registro]), [(None, mensaje)])
+
+    def test_no_desactiva_el_recolector(self):
+        # El recolector es global del proceso: validar (por ejemplo, desde varios hilos del servidor) no debe
+        # desactivarlo, ni siquiera mientras se arma el resultado.
+        registros = self._registros(2000)
+        with mock.patch("gc.disable", side_effect=AssertionError("la validación desactivó el recolector")):
+            validacion_lote_productos(registros)
+            validacion_registro_producto(registros[0])
+        self.assertTrue(gc.isenabled())
+
+
+if __name__ == "__main__":
+    unittest.main()